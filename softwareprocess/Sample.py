@@ -8,6 +8,15 @@
 """
 
 import math
+
+# The ways p can evaluate the t-distribution.
+engines = ('simpson', 'incremental', 'beta', 'table')
+# The normalization constant of the t-distribution, by degrees of freedom, shared by every Sample.
+constants = {}
+# For large t, rounding can carry an integration just past the whole area. Results no further than this above 1.0 are
+# clamped to 1.0, rather than rejected.
+roundingTolerance = 1e-12
+
 class Sample(object):
 
 # outward facing methods
@@ -20,12 +29,20 @@ class Sample(object):
         if((n < 2) or (n >= 30)):
             raise ValueError(functionName + "invalid n")
         self.n = n
+        self.evaluations = 0
+        self.constant = None
 
     def getN(self):
         return self.n
 
+    def getEvaluations(self):
+        """
+        getEvaluations returns the number of times the integrated function has been evaluated by this sample.
+        """
+        return self.evaluations
+
     
-    def p(self, t=None, tails=1):
+    def p(self, t=None, tails=1, engine='simpson'):
         functionName = "Sample.p: "
         if(t == None):
             raise ValueError(functionName + "missing t")
@@ -38,32 +55,131 @@ class Sample(object):
             raise ValueError(functionName + "invalid tails")
         if((tails != 1) & (tails != 2)):
             raise ValueError(functionName + "invalid tails")
-        
-        constant = self.calculateConstant(self.n)
-        integration = self.integrate(0, t, self.n, self.f)
+
+        if(engine not in engines):
+            raise ValueError(functionName + "invalid engine")
+
+        if(engine == 'beta'):
+            constant = 0.5
+            integration = self.integrateBeta(t, self.n)
+        elif(engine == 'table'):
+            constant = 0.5
+            integration = self.integrateTable(t, self.n)
+        elif(engine == 'incremental'):
+            constant = self.getConstant()
+            integration = self.integrateIncremental(0, t, self.n, self.f)
+        else:
+            constant = self.getConstant()
+            integration = self.integrate(0, t, self.n, self.f)
         if(tails == 1):
             result = constant * integration + 0.5
         else:
             result = constant * integration * 2
             
         if(result > 1.0):
-            raise ValueError(functionName + "result > 1.0")
+            if(result - 1.0 > roundingTolerance):
+                raise ValueError(functionName + "result > 1.0")
+            result = 1.0
         
         return result
+
+    def p_many(self, ts=None, tails=1, engine='simpson'):
+        """
+        p_many evaluates p for a whole sequence of t values at once, validating tails and engine only once. The
+        integrating engines sort the t values and integrate each gap between neighbours once, accumulating the
+        integrals, so the total cost is that of integrating up to the largest t.
+        :param ts: A sequence (or NumPy array) of floats .GE. 0.0.
+        :param tails: integer, 1 or 2.
+        :param engine: One of engines.
+        :return: A list holding p(t, tails, engine) for each t, in the order given.
+        """
+        functionName = "Sample.p_many: "
+        if(ts is None):
+            raise ValueError(functionName + "missing ts")
+        ts = list(ts)
+        for t in ts:
+            if(not(isinstance(t, float))):
+                raise ValueError(functionName + "invalid t")
+            if(t < 0.0):
+                raise ValueError(functionName + "invalid t")
+
+        if(not(isinstance(tails, int))):
+            raise ValueError(functionName + "invalid tails")
+        if((tails != 1) & (tails != 2)):
+            raise ValueError(functionName + "invalid tails")
+
+        if(engine not in engines):
+            raise ValueError(functionName + "invalid engine")
+
+        if(engine == 'beta'):
+            constant = 0.5
+            integrations = [self.integrateBeta(t, self.n) for t in ts]
+        elif(engine == 'table'):
+            constant = 0.5
+            integrations = [self.integrateTable(t, self.n) for t in ts]
+        else:
+            constant = self.getConstant()
+            if(engine == 'incremental'):
+                integrate = self.integrateIncremental
+            else:
+                integrate = self.integrate
+            integrals = {}
+            lowBound = 0.0
+            total = 0.0
+            for t in sorted(set(ts)):
+                if(t > lowBound):
+                    total += integrate(lowBound, t, self.n, self.f)
+                    lowBound = t
+                integrals[t] = total
+            integrations = [integrals[t] for t in ts]
+
+        if(tails == 1):
+            results = [constant * integration + 0.5 for integration in integrations]
+        else:
+            results = [constant * integration * 2 for integration in integrations]
+
+        for index, result in enumerate(results):
+            if(result > 1.0):
+                if(result - 1.0 > roundingTolerance):
+                    raise ValueError(functionName + "result > 1.0")
+                results[index] = 1.0
+        return results
         
 # internal methods
+    def getConstant(self):
+        """
+        getConstant returns the normalization constant for this sample's n, calculating it at most once per sample.
+        """
+        if(self.constant == None):
+            self.constant = self.calculateConstant(self.n)
+        return self.constant
+
     def gamma(self, x):
+        """
+        gamma returns the gamma function of x. Integers and halves of odd integers, the only values the t-distribution
+        needs, are calculated exactly with the recurrence gamma(x) = (x - 1) gamma(x - 1), applied iteratively.
+        :param x: numeric .GT. 0 mandatory validated
+        :return: numeric, gamma(x). An integer when x is an integer.
+        """
+        result = 1
+        while(x > 1):
+            x -= 1
+            result *= x
         if(x == 1):
-            return 1
+            return result
         if(x == 0.5):
-            return math.sqrt(math.pi)
-        return (x - 1) * self.gamma(x - 1)
-    
+            return result * math.sqrt(math.pi)
+        return result * math.gamma(x)
+
     def calculateConstant(self, n):
+        if(n in constants):
+            return constants[n]
         n = float(n)
         numerator = self.gamma((n + 1.0) / 2.0)
         denominator = self.gamma(n / 2.0) * math.sqrt(n * math.pi)
         result = numerator / denominator
+        if(n == int(n) and 2 <= n < 30):
+            constants[int(n)] = result
         return result
     
     def f(self, u, n):
@@ -92,6 +208,52 @@ class Sample(object):
             s *= 2
         return simpsonNew
 
+    def integrateIncremental(self, lowBound, highBound, n, f):
+        """
+        integrateIncremental returns the same integral as integrate, refining on the same partitions with the same
+        convergence test. Each refinement only evaluates f at the new midpoints: Simpson's rule on 2s partitions is
+        (4 T(2s) - T(s)) / 3, where the trapezoid sum T(2s) reuses every evaluation made for T(s).
+        :param lowBound: The lower bound of the integration. Typically 0.
+        :param highBound: t, the upper bound of the integration. >= 0.
+        :param n: The number of degrees of freedom the distribution has.
+        :param f: The function to integrate over, with u and n.
+        :return: The area under f between lowBound and highBound, approximated with Simpson's rule.
+        """
+        epsilon = 0.0001
+        width = float(highBound - lowBound)
+        trapezoid = (width / 2) * (f(lowBound, n) + f(highBound, n))
+        self.evaluations += 2
+        trapezoid = self.refineTrapezoid(lowBound, width, n, f, 1, trapezoid)
+        simpsonOld = 0.0
+        simpsonNew = epsilon
+        s = 2
+        while abs(simpsonNew - simpsonOld) / simpsonNew > epsilon:
+            simpsonOld = simpsonNew
+            refined = self.refineTrapezoid(lowBound, width, n, f, s, trapezoid)
+            simpsonNew = (4 * refined - trapezoid) / 3
+            trapezoid = refined
+            s *= 2
+        return simpsonNew
+
+    def refineTrapezoid(self, lowBound, width, n, f, s, trapezoid):
+        """
+        refineTrapezoid halves the partitions of a trapezoid sum, evaluating f only at the midpoints of the old ones.
+        :param lowBound:    numeric mandatory validated
+        :param width:       numeric .GE. 0, the width of the whole integration, mandatory validated
+        :param n:           numeric .GE. 2 and .LT. 30 mandatory validated
+        :param f:           function(self, float, integer) -> float mandatory validated
+        :param s:           integer .GE. 1, the number of partitions of trapezoid, mandatory validated
+        :param trapezoid:   float, the trapezoid sum of f on s partitions
+        :return: float, the trapezoid sum of f on 2s partitions
+        """
+        w = width / s
+        start = lowBound + w / 2
+        total = 0.0
+        for i in range(0, s):
+            total += f(start + w * i, n)
+        self.evaluations += s
+        return trapezoid / 2 + (w / 2) * total
+
     def calculateSimpson(self, lowBound, highBound, n, f, s):
         """
         calculateSimpson returns the integral of f with n degrees of freedom from lowBound to highBound, broken
@@ -107,6 +269,7 @@ class Sample(object):
         total = 0.0
         for i in range(0, s+1):
             total += self.getCoefficient(i, s) * f(lowBound + w * i, n)
+        self.evaluations += s + 1
 
         return (w / 3) * total
 
@@ -135,3 +298,85 @@ class Sample(object):
         
             
         
+
+    def integrateBeta(self, t, n):
+        """
+        integrateBeta returns the area under the t-distribution with n degrees of freedom between -t and t, in closed
+        form. Since the area outside [-t, t] is the regularized incomplete beta function I_x(n/2, 1/2) with
+        x = n / (n + t^2), no numeric integration is needed.
+        :param t: The bound of the area. >= 0.
+        :param n: The number of degrees of freedom the distribution has.
+        :return: float, the probability that a t-distributed value lies between -t and t.
+        """
+        n = float(n)
+        return 1.0 - self.incompleteBeta(n / (n + t * t), n / 2.0, 0.5)
+
+    def integrateTable(self, t, n):
+        """
+        integrateTable returns the same area as integrateBeta, interpolated from the precomputed table in
+        SampleTable.py, within the sampled bound SampleTable.loadTable().errorBound(n). The table is loaded on first
+        use. Values of t beyond the table fall back to integrateBeta.
+        :param t: The bound of the area. >= 0.
+        :param n: The number of degrees of freedom the distribution has.
+        :return: float, the probability that a t-distributed value lies between -t and t.
+        """
+        import SampleTable
+        constant = 2 * self.getConstant()
+        f = self.f
+        area = SampleTable.loadTable().area(n, t, lambda u: constant * f(u, n))
+        if(area == None):
+            return self.integrateBeta(t, n)
+        return area
+
+    def incompleteBeta(self, x, a, b):
+        """
+        incompleteBeta returns the regularized incomplete beta function I_x(a, b).
+        :param x: numeric .GE. 0 .LE. 1 mandatory validated
+        :param a: numeric .GT. 0 mandatory validated
+        :param b: numeric .GT. 0 mandatory validated
+        :return: float, I_x(a, b), evaluated with a continued fraction.
+        """
+        if x <= 0.0:
+            return 0.0
+        if x >= 1.0:
+            return 1.0
+        front = math.exp(math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) +
+                         a * math.log(x) + b * math.log(1.0 - x))
+        # The continued fraction converges quickly only below (a + 1) / (a + b + 2), so use the symmetry
+        # I_x(a, b) = 1 - I_(1-x)(b, a) above it.
+        if x < (a + 1.0) / (a + b + 2.0):
+            return front * self.calculateBetaContinuedFraction(x, a, b) / a
+        return 1.0 - front * self.calculateBetaContinuedFraction(1.0 - x, b, a) / b
+
+    def calculateBetaContinuedFraction(self, x, a, b):
+        """
+        calculateBetaContinuedFraction evaluates the continued fraction for I_x(a, b) with the modified Lentz method.
+        :param x: numeric .GT. 0 .LT. (a + 1) / (a + b + 2) mandatory validated
+        :param a: numeric .GT. 0 mandatory validated
+        :param b: numeric .GT. 0 mandatory validated
+        :return: float, the value of the continued fraction.
+        """
+        epsilon = 1e-15
+        tiny = 1e-300
+        c = 1.0
+        d = 1.0 - (a + b) * x / (a + 1.0)
+        if abs(d) < tiny:
+            d = tiny
+        d = 1.0 / d
+        result = d
+        for m in range(1, 201):
+            # Each step applies an even term, then an odd term, of the continued fraction.
+            for term in (m * (b - m) * x / ((a + 2 * m - 1.0) * (a + 2 * m)),
+                         -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1.0))):
+                d = 1.0 + term * d
+                if abs(d) < tiny:
+                    d = tiny
+                c = 1.0 + term / c
+                if abs(c) < tiny:
+                    c = tiny
+                d = 1.0 / d
+                delta = c * d
+                result *= delta
+            if abs(delta - 1.0) < epsilon:
+                break
+        return result
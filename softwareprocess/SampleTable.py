@@ -0,0 +1,171 @@
+"""
+    SampleTable.py contains a precomputed table of the t-distribution,
+    used by the 'table' engine of Sample.p. The table holds, for every
+    n Sample accepts, the central area on a dense grid of t values. It
+    is built once into a compact binary file, memory-mapped, and read
+    with cubic Hermite interpolation. By default, the file is kept in
+    the user's own cache directory.
+"""
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+
+import Sample
+
+# The file layout: a header, one error bound per n, then the areas for each n, all little-endian. The header holds
+# the parameters of the table and the SHA-256 digest of everything after it.
+magic = 'TTB2'
+headerFormat = '<4siiid32s'
+valueFormat = '<d'
+lowN = 2
+highN = 30
+step = 1.0 / 32
+points = 32 * 32 + 1
+tableName = 'sample-table-2.bin'
+
+# Tables already mapped, by path.
+openTables = {}
+
+
+def configuredPath():
+    """
+    configuredPath determines where the table file lives.
+    :return: The value of the SOFTWAREPROCESS_SAMPLE_TABLE environment variable, if set. Otherwise, tableName in the
+    softwareprocess directory of the user's cache directory, $XDG_CACHE_HOME or ~/.cache.
+    """
+    path = os.environ.get('SOFTWAREPROCESS_SAMPLE_TABLE')
+    if path:
+        return path
+    cacheDirectory = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cacheDirectory, 'softwareprocess', tableName)
+
+
+def calculateErrorBound(n):
+    """
+    calculateErrorBound estimates the interpolation error of the table for n degrees of freedom. The error of cubic
+    Hermite interpolation on a step h is at most h^4 / 384 max|A''''|, where the central area A(t) has
+    A'''' = 2 c f''', so the bound follows from the largest third derivative of f. That maximum is sampled rather
+    than proven: f''' is taken with a 5-point stencil, 16 times more finely than the table. f''' is largest near the
+    peak and falls off steadily in the tails, so only t .LE. 8 is sampled.
+    :param n: integer .GE. 2 .LT. 30, the number of degrees of freedom.
+    :return: float, the sampled bound on the difference between an interpolated area and the exact area.
+    """
+    sample = Sample.Sample(n)
+    f = sample.f
+    h = step / 16
+    largest = 0.0
+    for i in range(0, int(8 / h) + 1):
+        u = i * h
+        third = (f(u + 2 * h, n) - 2 * f(u + h, n) + 2 * f(u - h, n) - f(u - 2 * h, n)) / (2 * h ** 3)
+        largest = max(largest, abs(third))
+    # Twice the raw bound, to absorb the error of the sampled maximum and of the stored areas.
+    return 2 * (step ** 4 / 384) * 2 * sample.getConstant() * largest
+
+
+def buildTable(path):
+    """
+    buildTable writes the table file. The areas are calculated in closed form by the beta engine, and the file is
+    written to a temporary name first, so other processes never see a partial table. Missing directories are
+    created, accessible only by the user.
+    :param path: The path of the table file.
+    :return: None
+    """
+    values = []
+    bounds = []
+    for n in range(lowN, highN):
+        sample = Sample.Sample(n)
+        bounds.append(calculateErrorBound(n))
+        values.extend(sample.integrateBeta(i * step, n) for i in range(0, points))
+    payload = struct.pack('<%dd' % len(bounds), *bounds) + struct.pack('<%dd' % len(values), *values)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    if not os.path.isdir(directory):
+        os.makedirs(directory, 0700)
+    handle, temporaryPath = tempfile.mkstemp(dir=directory)
+    with os.fdopen(handle, 'wb') as tableFile:
+        tableFile.write(struct.pack(headerFormat, magic, lowN, highN, points, step, hashlib.sha256(payload).digest()))
+        tableFile.write(payload)
+    os.rename(temporaryPath, path)
+
+
+def loadTable(path=None):
+    """
+    loadTable maps the table file, building it first if it does not exist.
+    :param path: The path of the table file (optional, default configuredPath()).
+    :return: The SampleTable for the file, shared by every caller in the process.
+    """
+    if path is None:
+        path = configuredPath()
+    table = openTables.get(path)
+    if table is None:
+        if not os.path.exists(path):
+            buildTable(path)
+        table = SampleTable(path)
+        openTables[path] = table
+    return table
+
+
+class SampleTable(object):
+    """
+    SampleTable reads a table file built by buildTable. Values are read from the memory map on demand, so the file
+    is shared between processes and costs little to open.
+    """
+
+    def __init__(self, path):
+        """
+        :param path: The path of the table file. Raises ValueError if the file was not built with this module's
+        parameters, or its contents do not match the digest in its header.
+        """
+        functionName = "SampleTable.__init__: "
+        with open(path, 'rb') as tableFile:
+            self.map = mmap.mmap(tableFile.fileno(), 0, access=mmap.ACCESS_READ)
+        headerSize = struct.calcsize(headerFormat)
+        if len(self.map) < headerSize:
+            self.map.close()
+            raise ValueError(functionName + "invalid table")
+        fileMagic, self.lowN, self.highN, self.points, self.step, digest = struct.unpack_from(headerFormat, self.map)
+        self.boundsOffset = headerSize
+        self.valuesOffset = headerSize + 8 * (self.highN - self.lowN)
+        if (fileMagic != magic or (self.lowN, self.highN, self.points, self.step) != (lowN, highN, points, step) or
+                len(self.map) != self.valuesOffset + 8 * (self.highN - self.lowN) * self.points or
+                hashlib.sha256(self.map[headerSize:]).digest() != digest):
+            self.map.close()
+            raise ValueError(functionName + "invalid table")
+        self.maximumT = (self.points - 1) * self.step
+
+    def errorBound(self, n):
+        """
+        errorBound gives the sampled bound of calculateErrorBound on the difference between area and the exact area,
+        for n degrees of freedom.
+        """
+        return struct.unpack_from(valueFormat, self.map, self.boundsOffset + 8 * (n - self.lowN))[0]
+
+    def area(self, n, t, slope):
+        """
+        area interpolates the area under the t-distribution between -t and t.
+        :param n: integer .GE. lowN .LT. highN, the number of degrees of freedom.
+        :param t: float .GE. 0.
+        :param slope: function(t) -> float, the derivative of the area, 2 c f(t, n).
+        :return: float, the interpolated area, or None if t is beyond the table.
+        """
+        position = t / self.step
+        index = int(position)
+        if index >= self.points - 1:
+            if t == self.maximumT:
+                index = self.points - 2
+            else:
+                return None
+        offset = self.valuesOffset + 8 * ((n - self.lowN) * self.points + index)
+        low, high = struct.unpack_from('<2d', self.map, offset)
+        t0 = index * self.step
+        t1 = t0 + self.step
+        s = position - index
+        s2 = s * s
+        s3 = s2 * s
+        return ((2 * s3 - 3 * s2 + 1) * low + (s3 - 2 * s2 + s) * self.step * slope(t0) +
+                (3 * s2 - 2 * s3) * high + (s3 - s2) * self.step * slope(t1))
+
+    def close(self):
+        self.map.close()
@@ -0,0 +1,258 @@
+"""
+    benchmark.py contains the end-to-end benchmark suite, run as
+
+        python -m softwareprocess.benchmark [--iterations N] [--batch-size N] [--seed N]
+                                            [--output FILE] [--baseline FILE] [--tolerance FRACTION]
+
+    Every benchmark runs an operation over a reproducible synthetic mix
+    of requests, including invalid ones, and reports its throughput,
+    latency percentiles and allocations per operation. Results are
+    written as JSON, and can be compared against a stored baseline.
+"""
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import timeit
+
+import dispatch
+from convertString2Dictionary import convertString2Dictionary
+from Sample import Sample
+
+defaultIterations = 2000
+defaultBatchSize = 100
+defaultSeed = 2017
+# The fraction a benchmark's throughput may fall below its baseline before it counts as a regression.
+defaultTolerance = 0.2
+# The fraction of generated requests that are invalid.
+invalidFraction = 0.1
+stars = ['Betelgeuse', 'Sirius', 'Vega', 'Polaris', 'Rigel', 'Canopus', 'Arcturus', 'Capella', 'Deneb']
+
+
+def degreeString(generator, low, high):
+    """
+    degreeString generates a random degree string between low and high degrees.
+    """
+    minutes = generator.randint(int(low * 600), int(high * 600) - 1)
+    return '%dd%.1f' % (minutes // 600, (minutes % 600) / 10.0)
+
+
+def adjustRequest(generator):
+    request = {'op': 'adjust', 'observation': degreeString(generator, 1, 89), 'height': str(generator.randint(0, 50)),
+               'temperature': str(generator.randint(-20, 120)), 'pressure': str(generator.randint(100, 1100)),
+               'horizon': generator.choice(['natural', 'artificial'])}
+    if generator.random() < invalidFraction:
+        request[generator.choice(['observation', 'height', 'horizon'])] = 'invalid'
+    return request
+
+
+def predictRequest(generator):
+    request = {'op': 'predict', 'body': generator.choice(stars),
+               'date': '%d-%02d-%02d' % (generator.randint(2001, 2030), generator.randint(1, 12),
+                                         generator.randint(1, 28)),
+               'time': '%02d:%02d:%02d' % (generator.randint(0, 23), generator.randint(0, 59), generator.randint(0, 59))}
+    if generator.random() < invalidFraction:
+        request[generator.choice(['body', 'date', 'time'])] = 'invalid'
+    return request
+
+
+def correctRequest(generator):
+    request = {'op': 'correct', 'lat': degreeString(generator, -60, 60), 'long': degreeString(generator, 0, 359),
+               'altitude': degreeString(generator, 1, 89), 'assumedLat': degreeString(generator, -60, 60),
+               'assumedLong': degreeString(generator, 0, 359)}
+    if generator.random() < invalidFraction:
+        request[generator.choice(['lat', 'long', 'altitude'])] = 'invalid'
+    return request
+
+
+def encodedString(generator):
+    pairs = ['key%d%%3D%s' % (index, generator.choice(['value', 'abc123', 'Betelgeuse']))
+             for index in range(generator.randint(1, 4))]
+    if generator.random() < invalidFraction:
+        pairs.append(generator.choice(['bad_key%3Dvalue', 'key0%3Dvalue', 'key%3D']))
+    return '%2C%20'.join(pairs)
+
+
+def tValue(generator):
+    return generator.uniform(0.0, 6.0)
+
+
+def sampleP(engine, many=False):
+    """
+    sampleP adapts Sample.p, or Sample.p_many if many is True, to take a single (sample, t) argument.
+    """
+    if many:
+        return lambda argument: argument[0].p_many(argument[1], 1, engine)
+    return lambda argument: argument[0].p(argument[1], 1, engine)
+
+
+def freshCopy(argument):
+    """
+    freshCopy copies the requests in an argument, so that running a benchmark leaves its inputs unchanged.
+    """
+    if isinstance(argument, dict):
+        return dict(argument)
+    if isinstance(argument, list):
+        return [freshCopy(item) for item in argument]
+    return argument
+
+
+def runCalls(function, arguments):
+    """
+    runCalls times function over every argument, with garbage collection disabled.
+    :return: A tuple (latencies, allocations), holding the seconds taken by each call, and the net number of
+    container objects allocated by all of them.
+    """
+    timer = timeit.default_timer
+    latencies = []
+    gcEnabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        allocations = -gc.get_count()[0]
+        for argument in arguments:
+            start = timer()
+            function(argument)
+            latencies.append(timer() - start)
+        allocations += gc.get_count()[0]
+    finally:
+        if gcEnabled:
+            gc.enable()
+    return latencies, allocations
+
+
+def percentile(sortedValues, fraction):
+    return sortedValues[min(len(sortedValues) - 1, int(fraction * len(sortedValues)))]
+
+
+def summarize(latencies, allocations, operationsPerCall):
+    """
+    summarize reduces the measurements of runCalls to the reported statistics.
+    :param operationsPerCall: The number of operations each call performed.
+    :return: A dictionary holding 'operations', 'seconds', 'throughput' (operations per second), 'latency' (the 50th,
+    90th and 99th percentile and maximum of each call, in microseconds) and 'allocations' (per operation).
+    """
+    operations = len(latencies) * operationsPerCall
+    seconds = sum(latencies)
+    ordered = sorted(latencies)
+    return {
+        'operations': operations,
+        'seconds': seconds,
+        'throughput': operations / seconds if seconds > 0 else float('inf'),
+        'latency': {name: percentile(ordered, fraction) * 1e6
+                    for name, fraction in [('p50', 0.5), ('p90', 0.9), ('p99', 0.99), ('max', 1.0)]},
+        'allocations': float(allocations) / operations,
+    }
+
+
+def benchmarks(iterations, batchSize, seed):
+    """
+    benchmarks builds the suite. Inputs are generated up front.
+    :return: A list of (name, function, arguments, operationsPerCall) tuples. Since operations update the requests
+    they are given, arguments should be copied with freshCopy before every run.
+    """
+    generator = random.Random(seed)
+    suite = []
+    for op, makeRequest in [('adjust', adjustRequest), ('predict', predictRequest), ('correct', correctRequest)]:
+        requests = [makeRequest(generator) for _ in range(iterations)]
+        suite.append((op + '.scalar', dispatch.dispatch, requests, 1))
+        batches = [requests[start:start + batchSize] for start in range(0, iterations - batchSize + 1, batchSize)]
+        suite.append((op + '.batch', dispatch.dispatch_batch, batches, batchSize))
+
+    strings = [encodedString(generator) for _ in range(iterations)]
+    suite.append(('convertString2Dictionary.scalar', convertString2Dictionary, strings, 1))
+
+    samples = [Sample(n) for n in range(2, 30)]
+    ts = [(generator.choice(samples), tValue(generator)) for _ in range(iterations)]
+    for engine in ['simpson', 'beta']:
+        suite.append(('Sample.p.' + engine, sampleP(engine), ts, 1))
+    tBatches = [(sample, [tValue(generator) for _ in range(batchSize)])
+                for sample in samples for _ in range(max(1, iterations // (batchSize * len(samples))))]
+    suite.append(('Sample.p_many.simpson', sampleP('simpson', True), tBatches, batchSize))
+    return suite
+
+
+def runBenchmarks(iterations=defaultIterations, batchSize=defaultBatchSize, seed=defaultSeed, names=None):
+    """
+    runBenchmarks runs the suite, after running every benchmark once over a tenth of its inputs to warm up.
+    :param names: A collection of benchmark names to run (optional, default every benchmark).
+    :return: A dictionary holding the environment and the summary of each benchmark under 'results'.
+    """
+    results = {}
+    for name, function, arguments, operationsPerCall in benchmarks(iterations, batchSize, seed):
+        if names is not None and name not in names:
+            continue
+        runCalls(function, freshCopy(arguments[:max(1, len(arguments) // 10)]))
+        results[name] = summarize(*runCalls(function, freshCopy(arguments)), operationsPerCall=operationsPerCall)
+    return {'python': platform.python_version(), 'implementation': platform.python_implementation(),
+            'iterations': iterations, 'batchSize': batchSize, 'seed': seed, 'results': results}
+
+
+def compareResults(current, baseline, tolerance=defaultTolerance):
+    """
+    compareResults finds the benchmarks whose throughput regressed against a baseline.
+    :param current: The output of runBenchmarks.
+    :param baseline: An earlier output of runBenchmarks.
+    :param tolerance: The fraction throughput may fall below the baseline.
+    :return: A list of (name, baselineThroughput, currentThroughput) tuples, sorted by name, for every benchmark in
+    both runs whose throughput is lower than the baseline's by more than tolerance.
+    """
+    regressions = []
+    for name in sorted(current['results']):
+        if name not in baseline['results']:
+            continue
+        expected = baseline['results'][name]['throughput']
+        actual = current['results'][name]['throughput']
+        if actual < expected * (1 - tolerance):
+            regressions.append((name, expected, actual))
+    return regressions
+
+
+def formatResults(results):
+    """
+    formatResults produces a table of the results, one benchmark per line.
+    """
+    lines = ['%-34s %14s %10s %10s %10s %10s' % ('benchmark', 'ops/s', 'p50 us', 'p99 us', 'max us', 'allocs/op')]
+    for name in sorted(results['results']):
+        result = results['results'][name]
+        lines.append('%-34s %14.0f %10.1f %10.1f %10.1f %10.2f' % (
+            name, result['throughput'], result['latency']['p50'], result['latency']['p99'], result['latency']['max'],
+            result['allocations']))
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m softwareprocess.benchmark',
+                                     description='Benchmark every dispatch operation.')
+    parser.add_argument('--iterations', type=int, default=defaultIterations,
+                        help='number of requests per benchmark (default: %(default)s)')
+    parser.add_argument('--batch-size', type=int, default=defaultBatchSize,
+                        help='number of requests per batch (default: %(default)s)')
+    parser.add_argument('--seed', type=int, default=defaultSeed, help='seed of the synthetic mix (default: %(default)s)')
+    parser.add_argument('--output', help='file to write the results to, as JSON')
+    parser.add_argument('--baseline', help='results of an earlier run to compare against')
+    parser.add_argument('--tolerance', type=float, default=defaultTolerance,
+                        help='fraction of throughput that may be lost against the baseline (default: %(default)s)')
+    arguments = parser.parse_args(argv)
+    if arguments.iterations < 1 or arguments.batch_size < 1 or arguments.batch_size > arguments.iterations:
+        parser.error('--iterations and --batch-size must be at least 1, and --batch-size at most --iterations')
+
+    results = runBenchmarks(arguments.iterations, arguments.batch_size, arguments.seed)
+    print(formatResults(results))
+    if arguments.output is not None:
+        with open(arguments.output, 'w') as outputFile:
+            json.dump(results, outputFile, indent=2, sort_keys=True)
+    if arguments.baseline is None:
+        return 0
+    with open(arguments.baseline, 'r') as baselineFile:
+        baseline = json.load(baselineFile)
+    regressions = compareResults(results, baseline, arguments.tolerance)
+    for name, expected, actual in regressions:
+        print('REGRESSION %s: %.0f ops/s, baseline %.0f ops/s' % (name, actual, expected))
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
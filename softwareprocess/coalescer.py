@@ -0,0 +1,182 @@
+"""
+    coalescer.py contains Coalescer, which gathers single requests made
+    by many threads, such as the connections of server.DispatchServer,
+    into batches, so that they can be run through a batched engine such
+    as dispatch.dispatch_batch. Each request waits at most maxDelay
+    seconds for others to join its batch, and a batch is started as soon
+    as it holds maxBatch requests.
+
+    Coalescing is opt-in, and server.py only uses it when given
+    --coalesce-delay. On CPython 2.7, handing each request between
+    threads costs more than batching saves for the built-in operations:
+    32 threads sending correct requests ran at about 46k requests/s
+    through dispatch, but 11-19k requests/s through a Coalescer. It pays
+    off for engines whose batches are much cheaper than single calls.
+"""
+import threading
+import time
+
+import dispatch
+import operations.instrumentation as instrumentation
+
+defaultMaxDelay = 0.002
+defaultMaxBatch = 64
+
+
+class Waiter(object):
+    """
+    Waiter is a request waiting for its batch to be run.
+    """
+    __slots__ = ('values', 'arrival', 'event', 'result', 'error')
+
+    def __init__(self, values, arrival):
+        self.values = values
+        self.arrival = arrival
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class Coalescer(object):
+    """
+    Coalescer runs requests passed to dispatch in batches. The batching thread is started on first use, and runs
+    until close is called. Coalescer can be used as a context manager.
+    """
+
+    def __init__(self, engine=dispatch, maxDelay=defaultMaxDelay, maxBatch=defaultMaxBatch):
+        """
+        :param engine: Anything with a dispatch_batch function, such as the dispatch module or a
+        resultCache.ResultCache (optional, default the dispatch module).
+        :param maxDelay: Numeric .GE. 0, the most seconds a request waits for others to join its batch.
+        :param maxBatch: Integer .GE. 1, the largest number of requests in a batch.
+        """
+        functionName = "Coalescer.__init__: "
+        if isinstance(maxDelay, bool) or not isinstance(maxDelay, (int, float)) or maxDelay < 0:
+            raise ValueError(functionName + "invalid maxDelay")
+        if isinstance(maxBatch, bool) or not isinstance(maxBatch, int) or maxBatch < 1:
+            raise ValueError(functionName + "invalid maxBatch")
+        self.engine = engine
+        self.maxDelay = maxDelay
+        self.maxBatch = maxBatch
+        self.condition = threading.Condition()
+        self.pending = []
+        self.thread = None
+        self.closed = False
+        self.batches = 0
+        self.requests = 0
+
+    def dispatch(self, values=None):
+        """
+        dispatch returns what dispatch.dispatch would for values, once the batch holding it has been run.
+        :param values: A request, as passed to dispatch.dispatch.
+        :return: The response.
+        """
+        waiter = Waiter(values, time.time())
+        with self.condition:
+            self.pending.append(waiter)
+            if self.thread is None:
+                self.start()
+            elif len(self.pending) == 1 or len(self.pending) >= self.maxBatch:
+                self.condition.notify()
+        waiter.event.wait()
+        if waiter.error is not None:
+            raise waiter.error
+        return waiter.result
+
+    def dispatch_batch(self, valuesList=None):
+        """
+        dispatch_batch passes requests that are already batched straight to the engine.
+        :param valuesList: An iterable of requests.
+        :return: A list of responses, in input order.
+        """
+        return self.engine.dispatch_batch(valuesList)
+
+    def start(self):
+        # Called holding the condition.
+        self.thread = threading.Thread(target=self.run, name='Coalescer')
+        self.thread.daemon = True
+        self.thread.start()
+
+    def run(self):
+        """
+        run is the batching thread. It returns once close is called and no requests are pending.
+        """
+        while True:
+            with self.condition:
+                while not self.pending and not self.closed:
+                    self.condition.wait()
+                if not self.pending:
+                    return
+                deadline = self.pending[0].arrival + self.maxDelay
+                while len(self.pending) < self.maxBatch and not self.closed:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        break
+                    self.condition.wait(remaining)
+                batch = self.pending[:self.maxBatch]
+                del self.pending[:self.maxBatch]
+            self.runBatch(batch)
+
+    def runBatch(self, batch):
+        """
+        runBatch runs a batch through the engine, and wakes every request in it. If the batch raises, every request
+        is restored and run through the engine on its own, so that an error is only raised in the caller whose request
+        caused it.
+        :param batch: A list of Waiters.
+        :return: None
+        """
+        if instrumentation.enabled:
+            instrumentation.record('coalescer', 'wait', time.time() - batch[0].arrival)
+        originals = [dict(waiter.values) if isinstance(waiter.values, dict) else None for waiter in batch]
+        try:
+            results = self.engine.dispatch_batch([waiter.values for waiter in batch])
+            for waiter, result in zip(batch, results):
+                waiter.result = result
+        except Exception:
+            for waiter, original in zip(batch, originals):
+                if original is not None:
+                    waiter.values.clear()
+                    waiter.values.update(original)
+                try:
+                    waiter.result = self.engine.dispatch_batch([waiter.values])[0]
+                except Exception as error:
+                    waiter.error = error
+        with self.condition:
+            self.batches += 1
+            self.requests += len(batch)
+        for waiter in batch:
+            waiter.event.set()
+
+    def stats(self):
+        """
+        stats reports how requests have been batched.
+        :return: A dictionary holding 'batches', 'requests' and 'meanBatchSize'.
+        """
+        with self.condition:
+            return {'batches': self.batches, 'requests': self.requests,
+                    'meanBatchSize': float(self.requests) / self.batches if self.batches else 0.0}
+
+    def close(self):
+        """
+        close runs every pending request, and stops the batching thread. The Coalescer can still be used afterwards,
+        which starts a new thread.
+        """
+        with self.condition:
+            thread = self.thread
+            self.closed = True
+            self.condition.notify_all()
+        if thread is not None:
+            thread.join()
+        with self.condition:
+            self.closed = False
+            self.thread = None
+            # Requests arriving after the thread stopped looking for them.
+            if self.pending:
+                self.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exceptionType, exceptionValue, traceback):
+        self.close()
+        return False
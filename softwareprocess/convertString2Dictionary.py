@@ -9,7 +9,8 @@
     @author: Mitchell Price
 """
 from __future__ import print_function
-import urllib
+
+from querystring import parseEncodedPairs
 
 
 def convertString2Dictionary(inputString = ""):
@@ -22,41 +23,11 @@ def convertString2Dictionary(inputString = ""):
     """
 
     errorDict = {'error': 'true'} # Returned in the event of an error.
-    outDict = {}                 # Holds successful key-value pairs.
-
-    # Separate the input string on commas and strip whitespace between elements.
-    keyValuePairsList = [str.strip() for str in urllib.unquote(inputString).split(',')]
 
-    # We must have at least one key-value pair.
-    if len(keyValuePairsList) == 0:
+    # Percent-decode, then split into comma separated key-value pairs, validating each and rejecting duplicates.
+    outDict = parseEncodedPairs(inputString, isValidKey, isValidValue)
+    if outDict is None:
         return errorDict
-
-    for keyValuePair in keyValuePairsList:
-        # Split each instance of "key = value" into a list based on spaces.
-        keyValueList = [str.strip() for str in keyValuePair.split('=')]
-
-        # In order to be valid, this must be a list of the form [key, value].
-        # It must therefore have a length of 2.
-        if len(keyValueList) != 2:
-            return errorDict
-
-        # Validate the key.
-        key = keyValueList[0]
-        if not isValidKey(key):
-            return errorDict
-
-        # Validate the value.
-        value = keyValueList[1]
-        if not isValidValue(value):
-            return errorDict
-
-        # No duplicate keys are allowed.
-        if key in outDict:
-            return errorDict
-
-        # The key / value pair seems valid! We can add it to our dictionary.
-        outDict[key] = value
-
     return outDict
 
 
@@ -1,7 +1,95 @@
-import operations.adjust as adjust
-import operations.correct as correct
-import operations.locate as locate
-import operations.predict as predict
+import operations.instrumentation as instrumentation
+
+# Operations are looked up in a registry. Each operation registers a scalar implementation, which takes and returns one
+# request, and optionally a batched implementation, which takes and returns a list of requests, and a vectorized
+# implementation, which works on columns of parsed values. Operations registered by module name are only imported
+# when first used, so a cold start only pays for the operations it serves.
+
+class Operation(object):
+    """
+    Operation is a registry entry. Each implementation is either a function, or, if module is given, the name of a
+    function in that module, which is resolved on first use.
+    """
+    __slots__ = ('module', 'implementations')
+
+    def __init__(self, module, scalar, batch, vector):
+        self.module = module
+        self.implementations = {'scalar': scalar, 'batch': batch, 'vector': vector}
+
+    def implementation(self, kind):
+        implementation = self.implementations[kind]
+        if isinstance(implementation, basestring):
+            if isinstance(self.module, basestring):
+                # Imported relative to this module, as the eager imports used to be.
+                self.module = __import__(self.module, globals(), {}, ['__name__'])
+            implementation = getattr(self.module, implementation)
+            self.implementations[kind] = implementation
+        return implementation
+
+
+# The registered operations, by op.
+registry = {}
+
+
+def register(op, scalar, batch=None, vector=None, module=None):
+    """
+    register adds an operation to the registry, replacing any operation already registered as op.
+    :param op: The string requests use to select the operation.
+    :param scalar: function(dict) -> dict, the operation itself.
+    :param batch: function(list) -> list, updating every request in the list exactly as scalar would (optional).
+    :param vector: A function working on columns of parsed values, such as correct.correct_many (optional). It is not
+    used by dispatch, but is available to callers through implementation.
+    :param module: The name of a module, such as 'operations.adjust' (optional). If given, scalar, batch and vector
+    are the names of functions in that module, and the module is imported when one is first needed.
+    :return: None
+    """
+    functionName = "register: "
+    if not isinstance(op, basestring):
+        raise ValueError(functionName + "invalid op")
+    for function in (scalar, batch, vector):
+        if function is None:
+            continue
+        if module is None and not callable(function):
+            raise ValueError(functionName + "invalid implementation for " + op)
+        if module is not None and not isinstance(function, basestring):
+            raise ValueError(functionName + "invalid implementation for " + op)
+    if scalar is None:
+        raise ValueError(functionName + "missing scalar implementation for " + op)
+    registry[op] = Operation(module, scalar, batch, vector)
+
+
+def unregister(op):
+    """
+    unregister removes an operation from the registry.
+    :param op: The string requests use to select the operation.
+    :return: True if op was registered.
+    """
+    return registry.pop(op, None) is not None
+
+
+def implementation(op, kind='scalar'):
+    """
+    implementation looks up a registered implementation, importing its module if needed.
+    :param op: The string requests use to select the operation.
+    :param kind: One of 'scalar', 'batch' or 'vector'.
+    :return: The implementation, or None if op is not registered or has no implementation of that kind.
+    """
+    operation = registry.get(op) if isinstance(op, basestring) else None
+    if operation is None:
+        return None
+    return operation.implementation(kind)
+
+
+register('adjust', 'adjust', 'adjustBatch', 'calculateAltitudes', module='operations.adjust')
+register('predict', 'predict', 'predictBatch', module='operations.predict')
+register('correct', 'correct', 'correctBatch', 'correct_many', module='operations.correct')
+register('locate', 'locate', module='operations.locate')
+register('pipeline', 'pipeline', 'pipelineBatch', module='operations.pipeline')
+
+
+# The error dispatch_batch answers a request with when its operation raises.
+failedError = 'internal error'
+
 
 def dispatch(values=None):
 
@@ -15,14 +103,88 @@ def dispatch(values=None):
         return values
 
     #Perform designated function
-    if(values['op'] == 'adjust'):
-        return adjust.adjust(values)    #<-------------- replace this with your implementation
-    elif(values['op'] == 'predict'):
-        return predict.predict(values)    #This calculation is stubbed out
-    elif(values['op'] == 'correct'):
-        return correct.correct(values)    #This calculation is stubbed out
-    elif(values['op'] == 'locate'):
-        return locate.locate(values)    #This calculation is stubbed out
-    else:
+    operation = implementation(values['op'])
+    if(operation == None):
         values['error'] = 'op is not a legal operation'
+        if instrumentation.enabled:
+            instrumentation.countError('unknown', values['error'])
+        return values
+    if not instrumentation.enabled:
+        return operation(values)
+    # Only errors set by the operation are counted, not one the request arrived with.
+    previousError = values.get('error')
+    start = instrumentation.timer()
+    result = operation(values)
+    instrumentation.record(values['op'], 'total', instrumentation.timer() - start)
+    if isinstance(result, dict) and result.get('error', previousError) != previousError:
+        instrumentation.countError(values['op'], result['error'])
+    return result
+
+def dispatch_batch(valuesList=None):
+    """
+    dispatch_batch performs dispatch over many requests at once. Requests are grouped by their op, and every group with
+    a batched implementation is run through it in a single call. All other requests are passed to dispatch. If a batch
+    raises, its requests are restored and passed to dispatch one at a time, so that a request which raises does not
+    affect the others.
+    :param valuesList: An iterable of requests, each of which is anything dispatch would accept.
+    :return: A list holding, for each request in input order, exactly what dispatch would have returned for it. A
+    request for which dispatch raises is answered with itself, unchanged but for 'error' set to failedError.
+    """
+    if(valuesList == None):
+        return []
+    valuesList = list(valuesList)
+    results = [None] * len(valuesList)
+
+    groups = {}
+    for index, values in enumerate(valuesList):
+        op = values.get('op') if isinstance(values, dict) else None
+        if isinstance(op, basestring) and op in registry and registry[op].implementations['batch'] is not None:
+            groups.setdefault(op, []).append(index)
+        elif isinstance(op, basestring) and op in registry:
+            results[index] = dispatchIsolated(values, dict(values))
+        else:
+            results[index] = dispatch(values)
+
+    for op, indices in groups.items():
+        instrumented = instrumentation.enabled
+        start = instrumented and instrumentation.timer()
+        group = [valuesList[index] for index in indices]
+        originals = [dict(values) for values in group]
+        try:
+            batchResults = implementation(op, 'batch')(group)
+        except Exception:
+            # dispatch counts the errors of the requests it runs.
+            batchResults = [dispatchIsolated(values, original, True) for values, original in zip(group, originals)]
+        else:
+            if instrumented:
+                for result, original in zip(batchResults, originals):
+                    if result.get('error', original.get('error')) != original.get('error'):
+                        instrumentation.countError(op, result['error'])
+        if instrumented:
+            instrumentation.record(op, 'batch', instrumentation.timer() - start)
+        for index, result in zip(indices, batchResults):
+            results[index] = result
+    return results
+
+
+def dispatchIsolated(values, original, restore=False):
+    """
+    dispatchIsolated passes a request to dispatch, answering it with failedError if its operation raises.
+    :param values: A request, which is a dictionary.
+    :param original: A copy of the request, taken before it was first passed to an operation.
+    :param restore: True to restore the request from original before it is passed to dispatch.
+    :return: What dispatch returned for the request, or the request, restored from original, with 'error' set to
+    failedError.
+    """
+    if restore:
+        values.clear()
+        values.update(original)
+    try:
+        return dispatch(values)
+    except Exception:
+        values.clear()
+        values.update(original)
+        values['error'] = failedError
+        if instrumentation.enabled:
+            instrumentation.countError(values['op'], failedError)
         return values
@@ -1,13 +1,30 @@
-import re
+import time
+
+# Everything below is initialized once, at cold start, and reused by every warm invocation.
+coldStartBegin = time.time()
 
 import dispatch as dispatch
+import operations.adjust as adjust
+import operations.correct as correct
+import operations.locate as locate
+import operations.pipeline as pipeline
+import operations.instrumentation as instrumentation
+import operations.predict as predict
+from querystring import parseQuerystring
+
+coldStartSeconds = time.time() - coldStartBegin
+invocationCount = 0
 
 
 def lambda_handler(event, context):
+    global invocationCount
+    invocationCount += 1
     try:
         if('querystring' in event):
-            eventParms = event['querystring'].strip('{}').replace(',',' ')
-            eventDict = dict(re.findall(r'(\S+)=(".*?"|\S+)', eventParms))
+            timer = instrumentation.enabled and instrumentation.StageTimer('querystring')
+            eventDict = parseQuerystring(event['querystring'])
+            if timer:
+                timer.lap('parse')
             returnValue = dispatch.dispatch(eventDict)
             return returnValue
         else:
@@ -16,6 +33,15 @@ def lambda_handler(event, context):
         return u"None\n"
 
 
+def getMetrics():
+    """
+    getMetrics reports how this container has been used so far.
+    :return: A dictionary holding 'coldStartSeconds', the time spent initializing the module, and 'invocations',
+    the number of times lambda_handler has been called since.
+    """
+    return {'coldStartSeconds': coldStartSeconds, 'invocations': invocationCount}
+
+
 '''
 
 {
@@ -24,5 +50,3 @@ def lambda_handler(event, context):
 
 
 '''
-
-
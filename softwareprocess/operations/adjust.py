@@ -10,7 +10,21 @@
 
 import math
 
-from util import degreeStringToDegrees, degreesToDegreeString
+import instrumentation
+import schema
+from angle import Angle
+from util import degreeStringToDegrees, degreesToDegreeString, degreesToDegreeStrings
+
+validateSighting = schema.compileSchema(
+    schema.absent('altitude', 'altitude cannot be given in input'),
+    schema.field('observation', schema.degreeValue('observation is invalid'),
+                 missingError='mandatory information is missing'),
+    schema.field('height', schema.floatValue('height is invalid', 0), default=0.0),
+    schema.field('temperature', schema.integerValue('temperature is invalid', -20, 120), default=72),
+    schema.field('pressure', schema.integerValue('pressure is invalid', 100, 1100), default=1010),
+    schema.field('horizon', schema.choiceValue('horizon is invalid', {'natural': True, 'artificial': False}),
+                 default=True),
+)
 
 
 def adjust(sighting):
@@ -28,19 +42,55 @@ def adjust(sighting):
         'altitude' - In the event of a success, the altitude corresponding to this sighting. Degrees/minutes string.
         'error' - In the event of an error, a string explaining the source of the error.
     """
-    if 'altitude' in sighting:
-        sighting['error'] = 'altitude cannot be given in input'
+    timer = instrumentation.enabled and instrumentation.StageTimer('adjust')
+    parsed, error = validateSighting(sighting)
+    if timer:
+        timer.lap('validate')
+    if error is not None:
+        sighting['error'] = error
         return sighting
-    try:
-        observation = extractObservation(sighting)
-        height = extractHeight(sighting)
-        temperature = extractTemperature(sighting)
-        pressure = extractPressure(sighting)
-        naturalHorizon = extractNaturalHorizon(sighting)
-    except ValueError:
-        return sighting
-    altitude = degreesToDegreeString(calculateAltitude(observation, height, temperature, pressure, naturalHorizon))
-    sighting['altitude'] = altitude
+    altitude = calculateAltitude(*parsed)
+    if timer:
+        timer.lap('calculate')
+    sighting['altitude'] = degreesToDegreeString(altitude)
+    if timer:
+        timer.lap('format')
+    return sighting
+
+
+def adjustBatch(sightings):
+    """
+    Batched implementation of the adjust operation. Every sighting is validated exactly as adjust would validate it,
+    then the altitudes of all valid sightings are calculated together.
+    :param sightings: A list of dictionaries, each containing the fields described in adjust.
+    :return: The same list, with each dictionary updated exactly as adjust would have updated it.
+    """
+    valid = []
+    for sighting in sightings:
+        parsed, error = validateSighting(sighting)
+        if error is not None:
+            sighting['error'] = error
+            continue
+        valid.append((sighting,) + parsed)
+
+    if not valid:
+        return sightings
+    validSightings, observations, heights, temperatures, pressures, naturalHorizons = zip(*valid)
+    altitudes = degreesToDegreeStrings(
+        calculateAltitudes(observations, heights, temperatures, pressures, naturalHorizons))
+    for sighting, altitude in zip(validSightings, altitudes):
+        sighting['altitude'] = altitude
+    return sightings
+
+
+def adjustSighting(sighting):
+    """
+    adjustSighting is the numeric form of adjust, which sets the altitude of an angle.Sighting.
+    :param sighting: An angle.Sighting, with observation (an Angle), height, temperature, pressure and naturalHorizon.
+    :return: The same Sighting, with altitude set.
+    """
+    sighting.altitude = Angle(calculateAltitude(sighting.observation.degrees, sighting.height, sighting.temperature,
+                                                sighting.pressure, sighting.naturalHorizon))
     return sighting
 
 
@@ -62,6 +112,33 @@ def calculateAltitude(observation, height, temperature, pressure, naturalHorizon
                  math.tan(math.radians(observation))
     return observation + dip + refraction
 
+
+def calculateAltitudes(observations, heights, temperatures, pressures, naturalHorizons):
+    """
+    calculateAltitudes is the columnar form of calculateAltitude. Each parameter is a sequence (a list, tuple, array
+    or numpy array) holding one column of the observations, and all columns must be of the same length.
+    :param observations: Numerics, the degrees of each observation.
+    :param heights: Numerics, the height at which each observation was taken.
+    :param temperatures: Integers, the temperature at which each observation was taken.
+    :param pressures: Integers, the pressure at which each observation was taken.
+    :param naturalHorizons: Booleans, True iff the horizon used for that observation was natural.
+    :return: A list of numerics, the altitude (in degrees) of each star, identical to calling calculateAltitude per row.
+    """
+    sqrt = math.sqrt
+    tan = math.tan
+    radians = math.radians
+    toCelsius = fahrenheitToCelsius
+    altitudes = []
+    append = altitudes.append
+    for observation, height, temperature, pressure, naturalHorizon in \
+            zip(observations, heights, temperatures, pressures, naturalHorizons):
+        dip = 0
+        if naturalHorizon:
+            dip = (-0.97 * sqrt(height)) / 60.0
+        refraction = (-0.00452 * pressure) / (273 + toCelsius(temperature)) / tan(radians(observation))
+        append(observation + dip + refraction)
+    return altitudes
+
 def fahrenheitToCelsius(temp):
     return (temp - 32.0) * 5.0/9.0
 
@@ -0,0 +1,81 @@
+"""
+    angle.py contains Angle and Sighting, compact value types which
+    let the operations exchange numeric values directly. Degree
+    strings are only parsed when a request comes in and only
+    produced when a response goes out.
+"""
+import math
+
+from util import degreeStringToDegrees, degreesToSignedDegreeString
+
+
+class Angle(object):
+    """
+    Angle holds an arc measurement in degrees, at full precision. An Angle parsed from a degree string remembers
+    that string, so passing it through unchanged reproduces the input exactly.
+    """
+    __slots__ = ('degrees', 'text')
+
+    def __init__(self, degrees, text=None):
+        """
+        :param degrees: Numeric, the measurement in degrees.
+        :param text: The degree string the measurement was parsed from (optional).
+        """
+        self.degrees = degrees
+        self.text = text
+
+    @classmethod
+    def fromDegreeString(cls, degreeString, validate=True):
+        """
+        fromDegreeString parses a degree string, as util.degreeStringToDegrees would.
+        :return: An Angle, or will raise a value error if the given string is not formatted properly.
+        """
+        return cls(degreeStringToDegrees(degreeString, validate), degreeString)
+
+    @property
+    def radians(self):
+        return math.radians(self.degrees)
+
+    def __float__(self):
+        return float(self.degrees)
+
+    def __str__(self):
+        if self.text is not None:
+            return self.text
+        return degreesToSignedDegreeString(self.degrees)
+
+    def __repr__(self):
+        return 'Angle(%r)' % (self.degrees,)
+
+    def __eq__(self, other):
+        return isinstance(other, Angle) and self.degrees == other.degrees
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.degrees)
+
+
+class Sighting(object):
+    """
+    Sighting holds the numeric state of a star sighting as it moves through the operations. Inputs are set when a
+    request is parsed, and each operation fills in its outputs:
+        adjust - reads observation, height, temperature, pressure, naturalHorizon; sets altitude.
+        predict - reads starId, date, time; sets lat and lon.
+        correct - reads lat, lon, altitude, assumedLat, assumedLon; sets distance and azimuth.
+    Angles are Angle instances, distance is in arc minutes, and unset fields are None.
+    """
+    __slots__ = ('observation', 'height', 'temperature', 'pressure', 'naturalHorizon',
+                 'starId', 'date', 'time', 'assumedLat', 'assumedLon',
+                 'altitude', 'lat', 'lon', 'distance', 'azimuth')
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields.pop(name, None))
+        if fields:
+            raise TypeError("Sighting: unknown fields " + ", ".join(sorted(fields)))
+
+    def __repr__(self):
+        fields = ['%s=%r' % (name, getattr(self, name)) for name in self.__slots__ if getattr(self, name) is not None]
+        return 'Sighting(%s)' % ', '.join(fields)
@@ -0,0 +1,134 @@
+"""
+    catalog.py contains StarCatalog, an immutable, preparsed catalog of
+    stars used by the 'predict' operation, along with loaders for
+    external CSV and JSON catalogs.
+"""
+import csv
+import json
+import math
+
+from util import degreeStringToDegrees
+
+
+class StarCatalog(object):
+    """
+    StarCatalog holds one column per star attribute, each indexed by star id. The degree strings are parsed once,
+    when the catalog is built, and kept alongside the numeric values so they can be returned as-is in output.
+    All columns are tuples, and the catalog cannot be modified once built.
+    """
+    __slots__ = ('names', 'shaStrings', 'declinationStrings', 'shaDegrees', 'declinationDegrees',
+                 'shaRadians', 'declinationRadians', '_ids')
+
+    def __init__(self, entries=()):
+        """
+        :param entries: An iterable of (name, sha, declination) tuples, where sha and declination are degree strings.
+        Names are case-insensitive, and must be unique.
+        """
+        functionName = "StarCatalog.__init__: "
+        names = []
+        shaStrings = []
+        declinationStrings = []
+        shaDegrees = []
+        declinationDegrees = []
+        ids = {}
+        for name, sha, declination in entries:
+            if not isinstance(name, basestring) or not isinstance(sha, basestring) or \
+                    not isinstance(declination, basestring):
+                raise ValueError(functionName + "invalid entry")
+            name = name.lower()
+            if name in ids:
+                raise ValueError(functionName + "duplicate star " + name)
+            try:
+                shaValue = degreeStringToDegrees(sha, False)
+                declinationValue = degreeStringToDegrees(declination, False)
+            except ValueError:
+                raise ValueError(functionName + "invalid entry for " + name)
+            ids[name] = len(names)
+            names.append(name)
+            shaStrings.append(sha)
+            declinationStrings.append(declination)
+            shaDegrees.append(shaValue)
+            declinationDegrees.append(declinationValue)
+
+        setAttribute = super(StarCatalog, self).__setattr__
+        setAttribute('names', tuple(names))
+        setAttribute('shaStrings', tuple(shaStrings))
+        setAttribute('declinationStrings', tuple(declinationStrings))
+        setAttribute('shaDegrees', tuple(shaDegrees))
+        setAttribute('declinationDegrees', tuple(declinationDegrees))
+        setAttribute('shaRadians', tuple(math.radians(value) for value in shaDegrees))
+        setAttribute('declinationRadians', tuple(math.radians(value) for value in declinationDegrees))
+        setAttribute('_ids', ids)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("StarCatalog is immutable")
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return isinstance(name, basestring) and name.lower() in self._ids
+
+    def starId(self, name):
+        """
+        starId looks up the id of a star, ignoring case.
+        :param name: The name of the star.
+        :return: The star's id, usable as an index into every column, or None if the star is not in the catalog.
+        """
+        return self._ids.get(name.lower())
+
+    def entry(self, starId):
+        """
+        entry produces the original degree strings for a star.
+        :param starId: The id of the star.
+        :return: A dictionary mapping 'sha' to the star's SHA, and 'declination' to the star's declination.
+        """
+        return {'sha': self.shaStrings[starId], 'declination': self.declinationStrings[starId]}
+
+    @classmethod
+    def fromDict(cls, starData):
+        """
+        fromDict builds a catalog from a dictionary in the form of predict.star_data.
+        :param starData: A dictionary mapping each star name to a dictionary holding its 'sha' and 'declination'.
+        :return: A StarCatalog containing the same stars.
+        """
+        try:
+            entries = [(name, starData[name]['sha'], starData[name]['declination']) for name in sorted(starData)]
+        except (KeyError, TypeError):
+            raise ValueError("StarCatalog.fromDict: invalid entry")
+        return cls(entries)
+
+
+def loadCatalog(path):
+    """
+    loadCatalog reads an external catalog file into a StarCatalog. The format is chosen by the file's extension:
+        .json - Either an object in the form of predict.star_data, or a list of objects with 'name', 'sha'
+                and 'declination' keys.
+        .csv - A header row containing 'name', 'sha' and 'declination' columns, followed by one row per star.
+    :param path: The path to the catalog file.
+    :return: A StarCatalog holding every star in the file. Raises ValueError if the file is not a valid catalog.
+    """
+    functionName = "loadCatalog: "
+    lowerPath = path.lower()
+    if lowerPath.endswith('.json'):
+        with open(path, 'r') as catalogFile:
+            try:
+                starData = json.load(catalogFile)
+            except ValueError:
+                raise ValueError(functionName + "invalid json")
+        if isinstance(starData, dict):
+            return StarCatalog.fromDict(starData)
+        if not isinstance(starData, list):
+            raise ValueError(functionName + "invalid json")
+        rows = starData
+    elif lowerPath.endswith('.csv'):
+        with open(path, 'rb') as catalogFile:
+            rows = list(csv.DictReader(catalogFile))
+    else:
+        raise ValueError(functionName + "unknown catalog format")
+
+    try:
+        entries = [(row['name'].strip(), row['sha'].strip(), row['declination'].strip()) for row in rows]
+    except (KeyError, TypeError, AttributeError):
+        raise ValueError(functionName + "invalid entry")
+    return StarCatalog(entries)
@@ -8,7 +8,28 @@
     @author: Mitchell Price
 """
 import math
-from util import degreeStringToDegrees, degreesToDegreeString
+
+import instrumentation
+import schema
+from angle import Angle
+from util import parseDegreeString, degreesToDegreeString, degreesToDegreeStrings
+
+# Marks a field that is absent from a sighting, as opposed to one that is present but invalid.
+missingValue = object()
+
+# The error correct_many reports for a row whose correction cannot be calculated, such as one whose star lies at the
+# assumed position, leaving the azimuth undefined.
+undefinedError = 'correction is undefined'
+
+# The fields consumed by correct, in validation order, with their (lowBound, highBound, lowExclusive) limits.
+measurementNames = ("lat", "long", "altitude", "assumedLat", "assumedLong")
+measurementLimits = ((-90, 90, True), (0, 360, False), (0, 90, True), (-90, 90, True), (0, 360, False))
+
+validateSighting = schema.compileSchema(*[
+    schema.field(name, schema.degreeValue(name + ' is invalid', False, lowBound, highBound, lowExclusive),
+                 missingError='missing mandatory field ' + name)
+    for name, (lowBound, highBound, lowExclusive) in zip(measurementNames, measurementLimits)
+])
 
 
 def correct(sighting):
@@ -17,36 +38,147 @@ def correct(sighting):
     :param sighting: A dictionary containing data on a star sighting.
     :return: The unmodified sighting.
     """
-    try:
-        lat = extractMeasurement(sighting, "lat", -90, 90)
-        lon = extractMeasurement(sighting, "long", 0, 360, False)
-        altitude = extractMeasurement(sighting, "altitude", 0, 90)
-        assumedLat = extractMeasurement(sighting, "assumedLat", -90, 90)
-        assumedLon = extractMeasurement(sighting, "assumedLong", 0, 360, False)
-    except ValueError:
+    timer = instrumentation.enabled and instrumentation.StageTimer('correct')
+    parsed, error = validateSighting(sighting)
+    if timer:
+        timer.lap('validate')
+    if error is not None:
+        sighting['error'] = error
         return sighting
+    distance, azimuth = calculateCorrection(*parsed)
+    if timer:
+        timer.lap('calculate')
+    sighting["correctedDistance"] = str(int(distance))
+    sighting["correctedAzimuth"] = degreesToDegreeString(azimuth)
+    if timer:
+        timer.lap('format')
+    return sighting
+
+
+def correctBatch(sightings):
+    """
+    Batched implementation of the correct operation. The sightings are split into columns and run through correct_many.
+    :param sightings: A list of dictionaries, each containing data on a star sighting.
+    :return: The same list, with each dictionary updated exactly as correct would have updated it.
+    """
+    columns = [[sighting.get(name, missingValue) for sighting in sightings] for name in measurementNames]
+    distances, azimuths, errors = correct_many(*columns)
+    azimuthStrings = degreesToDegreeStrings([azimuth for azimuth in azimuths if azimuth is not None])
+    azimuthIndex = 0
+    for sighting, distance, error in zip(sightings, distances, errors):
+        if error is not None:
+            sighting['error'] = error
+            continue
+        sighting["correctedDistance"] = str(int(distance))
+        sighting["correctedAzimuth"] = azimuthStrings[azimuthIndex]
+        azimuthIndex += 1
+    return sightings
+
+def correct_many(lats, longs, altitudes, assumedLats, assumedLongs):
+    """
+    correct_many is the columnar form of correct. Each parameter is a sequence holding one column of raw field values,
+    with missingValue standing in for a field that is absent. All columns must be of the same length.
+    The intermediate distance is calculated once per row and shared by the distance and azimuth.
+    :return: A tuple (distances, azimuths, errors) of lists. For a valid row, distances holds the rounded corrected
+    distance in arc minutes, azimuths holds the corrected azimuth in degrees, and errors holds None. For an invalid row,
+    distances and azimuths hold None, and errors holds the message extractMeasurement would have set, or
+    undefinedError for a valid row whose correction cannot be calculated.
+    """
+    distances = []
+    azimuths = []
+    errors = []
+    for row in zip(lats, longs, altitudes, assumedLats, assumedLongs):
+        measurements = []
+        error = None
+        for value, name, (lowBound, highBound, lowExclusive) in zip(row, measurementNames, measurementLimits):
+            measurement, error = validateMeasurement(value, name, lowBound, highBound, lowExclusive)
+            if error is not None:
+                break
+            measurements.append(measurement)
+        if error is not None:
+            distances.append(None)
+            azimuths.append(None)
+            errors.append(error)
+            continue
+
+        try:
+            distance, azimuth = calculateCorrection(*measurements)
+        except (ValueError, ZeroDivisionError):
+            distances.append(None)
+            azimuths.append(None)
+            errors.append(undefinedError)
+            continue
+        distances.append(distance)
+        azimuths.append(azimuth)
+        errors.append(None)
+    return distances, azimuths, errors
 
-    sighting["correctedDistance"] = str(int(calculateCorrectedDistance(lat, assumedLat, altitude, lon, assumedLon)))
-    sighting["correctedAzimuth"] = calculateCorrectedAzimuth(lat, assumedLat, lon, assumedLon)
+def correctSighting(sighting):
+    """
+    correctSighting is the numeric form of correct, which sets the corrections of an angle.Sighting.
+    :param sighting: An angle.Sighting, with lat, lon, altitude, assumedLat and assumedLon.
+    :return: The same Sighting, with distance (in arc minutes) and azimuth set.
+    """
+    distance, azimuth = calculateCorrection(sighting.lat.degrees, sighting.lon.degrees, sighting.altitude.degrees,
+                                            sighting.assumedLat.degrees, sighting.assumedLon.degrees)
+    sighting.distance = distance
+    sighting.azimuth = Angle(azimuth)
     return sighting
 
+def calculateCorrection(lat, lon, altitude, assumedLat, assumedLon):
+    """
+    calculateCorrection calculates both the corrected distance and the corrected azimuth of a sighting,
+    sharing the intermediate distance between the two.
+    :param lat: Numeric, the latitude of the star in degrees.
+    :param lon: Numeric, the longitude (GHA) of the star in degrees.
+    :param altitude: Numeric, the altitude of the star in degrees.
+    :param assumedLat: Numeric, the assumed latitude in degrees.
+    :param assumedLon: Numeric, the assumed longitude in degrees.
+    :return: A tuple (distance, azimuth), the rounded corrected distance in arc minutes, and the corrected azimuth
+    in degrees. These match calculateCorrectedDistance and calculateCorrectedAzimuth.
+    """
+    sin = math.sin
+    cos = math.cos
+    latr = math.radians(lat)
+    assumedLatr = math.radians(assumedLat)
+    lha = math.radians(lon + assumedLon)
+    intermediate = (sin(latr) * sin(assumedLatr)) + (cos(latr) * cos(assumedLatr) * cos(lha))
+    correctedAltitude = math.asin(intermediate)
+    distance = round(math.degrees(math.radians(altitude) - correctedAltitude) * 60)
+    azimuth = math.degrees(math.acos(
+        (sin(latr) - (sin(assumedLatr) * intermediate)) /
+        (cos(assumedLatr) * cos(correctedAltitude))
+    ))
+    return distance, azimuth
+
 def extractMeasurement(sighting, name, lowBound, highBound, lowExclusive=True):
-    if name not in sighting:
-        sighting['error'] = 'missing mandatory field ' + name
-        raise ValueError()
-    elif not isinstance(sighting[name], basestring):
-        sighting['error'] = name + ' is invalid'
-        raise ValueError()
-    try:
-        measurement = degreeStringToDegrees(sighting[name], False)
-    except ValueError:
-        sighting['error'] = name + ' is invalid'
-        raise ValueError()
-    if (lowExclusive and measurement <= lowBound) or measurement < lowBound or measurement >= highBound:
-        sighting['error'] = name + ' is invalid'
+    measurement, error = validateMeasurement(sighting.get(name, missingValue), name, lowBound, highBound, lowExclusive)
+    if error is not None:
+        sighting['error'] = error
         raise ValueError()
     return measurement
 
+def validateMeasurement(value, name, lowBound, highBound, lowExclusive=True):
+    """
+    validateMeasurement parses a single degree string measurement without touching any sighting.
+    :param value: The raw value of the field, or missingValue if the field is absent.
+    :param name: The name of the field, used in the error message.
+    :param lowBound: The lowest allowed measurement.
+    :param highBound: The measurement must be strictly less than this value.
+    :param lowExclusive: Boolean (optional, default True). If true, lowBound itself is not allowed.
+    :return: A tuple (measurement, error). Exactly one of the two is None.
+    """
+    if value is missingValue:
+        return None, 'missing mandatory field ' + name
+    elif not isinstance(value, basestring):
+        return None, name + ' is invalid'
+    measurement, error = parseDegreeString(value, False)
+    if error is not None:
+        return None, name + ' is invalid'
+    if (lowExclusive and measurement <= lowBound) or measurement < lowBound or measurement >= highBound:
+        return None, name + ' is invalid'
+    return measurement, None
+
 def calculateCorrectedDistance(lat, assumedLat, altitude, lon, assumedLon):
     intermediate = calculateIntermediateDistance(lat, assumedLat, lon, assumedLon)
     correctedAltitude = math.asin(intermediate)
@@ -0,0 +1,173 @@
+"""
+    instrumentation.py collects per-operation, per-stage latency
+    histograms and counts of errors. It is disabled by default, or
+    enabled by setting SOFTWAREPROCESS_INSTRUMENTATION=1. While
+    disabled, instrumented code only reads the module's enabled flag.
+
+    Instrumented code follows this pattern:
+
+        timer = instrumentation.enabled and instrumentation.StageTimer('adjust')
+        ...
+        if timer: timer.lap('validate')
+"""
+import bisect
+import json
+import os
+import threading
+import timeit
+
+# The upper bounds, in seconds, of the histogram buckets. Every histogram also has a final, unbounded bucket.
+bucketBounds = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2,
+                0.1, 0.25, 0.5, 1.0)
+
+enabled = os.environ.get('SOFTWAREPROCESS_INSTRUMENTATION', '') not in ('', '0')
+timer = timeit.default_timer
+lock = threading.Lock()
+# Histograms by (op, stage), and error counts by (op, error).
+histograms = {}
+errors = {}
+
+
+class Histogram(object):
+    """
+    Histogram counts observations in bucketBounds, along with their number and sum.
+    """
+    __slots__ = ('buckets', 'count', 'sum')
+
+    def __init__(self):
+        self.buckets = [0] * (len(bucketBounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds):
+        self.buckets[bisect.bisect_left(bucketBounds, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+
+class StageTimer(object):
+    """
+    StageTimer times consecutive stages of a single request.
+    """
+    __slots__ = ('op', 'last')
+
+    def __init__(self, op):
+        self.op = op
+        self.last = timer()
+
+    def lap(self, stage):
+        """
+        lap records the time since the timer was created, or since the last lap, as stage.
+        """
+        now = timer()
+        record(self.op, stage, now - self.last)
+        self.last = now
+
+
+def enable():
+    global enabled
+    enabled = True
+
+
+def disable():
+    global enabled
+    enabled = False
+
+
+def record(op, stage, seconds):
+    """
+    record adds an observation to the histogram of op and stage.
+    :param op: The operation, such as 'adjust'.
+    :param stage: The stage, such as 'validate', 'calculate', 'format', 'parse' or 'total'.
+    :param seconds: The time the stage took.
+    :return: None
+    """
+    with lock:
+        histogram = histograms.get((op, stage))
+        if histogram is None:
+            histogram = histograms[(op, stage)] = Histogram()
+        histogram.observe(seconds)
+
+
+def countError(op, error):
+    """
+    countError counts a response holding an error.
+    :param op: The operation.
+    :param error: The message in the response's 'error' field.
+    :return: None
+    """
+    with lock:
+        errors[(op, error)] = errors.get((op, error), 0) + 1
+
+
+def snapshot():
+    """
+    snapshot copies the numbers collected so far.
+    :return: A dictionary holding:
+        'histograms' - op -> stage -> {'count', 'sum', 'buckets'}, where buckets is a list of [upperBound, count]
+                       pairs with cumulative counts, ending with the unbounded bucket, whose bound is None.
+        'errors' - op -> error -> count.
+    """
+    with lock:
+        histogramCopies = [(key, list(histogram.buckets), histogram.count, histogram.sum)
+                           for key, histogram in histograms.items()]
+        errorCopies = errors.items()
+    result = {'histograms': {}, 'errors': {}}
+    for (op, stage), buckets, count, total in histogramCopies:
+        cumulative = []
+        running = 0
+        for bound, bucketCount in zip(bucketBounds + (None,), buckets):
+            running += bucketCount
+            cumulative.append([bound, running])
+        result['histograms'].setdefault(op, {})[stage] = {'count': count, 'sum': total, 'buckets': cumulative}
+    for (op, error), count in errorCopies:
+        result['errors'].setdefault(op, {})[error] = count
+    return result
+
+
+def reset():
+    """
+    reset discards every number collected so far.
+    """
+    with lock:
+        histograms.clear()
+        errors.clear()
+
+
+def toJson():
+    """
+    toJson produces snapshot() as a JSON string.
+    """
+    return json.dumps(snapshot(), sort_keys=True)
+
+
+def prometheusLabel(value):
+    if isinstance(value, str):
+        value = value.decode('utf-8', 'replace')
+    return '"' + unicode(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+
+
+def toPrometheus():
+    """
+    toPrometheus produces snapshot() in the Prometheus text exposition format, as the histogram
+    softwareprocess_stage_seconds and the counter softwareprocess_errors_total.
+    """
+    numbers = snapshot()
+    lines = ['# HELP softwareprocess_stage_seconds Time spent in each stage of an operation.',
+             '# TYPE softwareprocess_stage_seconds histogram']
+    for op in sorted(numbers['histograms']):
+        for stage in sorted(numbers['histograms'][op]):
+            histogram = numbers['histograms'][op][stage]
+            labels = 'op=%s,stage=%s' % (prometheusLabel(op), prometheusLabel(stage))
+            for bound, count in histogram['buckets']:
+                bound = '+Inf' if bound is None else repr(bound)
+                lines.append('softwareprocess_stage_seconds_bucket{%s,le="%s"} %d' % (labels, bound, count))
+            lines.append('softwareprocess_stage_seconds_sum{%s} %r' % (labels, histogram['sum']))
+            lines.append('softwareprocess_stage_seconds_count{%s} %d' % (labels, histogram['count']))
+    lines.append('# HELP softwareprocess_errors_total Responses holding an error, by operation and error.')
+    lines.append('# TYPE softwareprocess_errors_total counter')
+    for op in sorted(numbers['errors']):
+        for error in sorted(numbers['errors'][op]):
+            lines.append('softwareprocess_errors_total{op=%s,error=%s} %d' % (
+                prometheusLabel(op), prometheusLabel(error), numbers['errors'][op][error]))
+    return '\n'.join(lines) + '\n'
@@ -7,13 +7,153 @@
 
     @author: Mitchell Price
 """
+import math
+
+import instrumentation
+import schema
+from util import degreesToDegreeString, degreesToSignedDegreeString, parseDegreeString
+
+
+def parseSightings(value):
+    """
+    parseSightings converts the sightings field of a locate request into columns, without modifying the request.
+    :param value: The raw value of the sightings field, which should be a non-empty list of dictionaries, each holding
+    the 'correctedDistance' and 'correctedAzimuth' produced by the correct operation.
+    :return: A tuple ((distances, azimuths), error), where exactly one of the two is None. distances holds each
+    corrected distance in arc minutes, and azimuths holds each corrected azimuth in degrees.
+    """
+    if not isinstance(value, list) or len(value) == 0:
+        return None, 'sightings is invalid'
+    distances = []
+    azimuths = []
+    for sighting in value:
+        if not isinstance(sighting, dict):
+            return None, 'sightings is invalid'
+        if 'correctedDistance' not in sighting:
+            return None, 'missing mandatory field correctedDistance'
+        if 'correctedAzimuth' not in sighting:
+            return None, 'missing mandatory field correctedAzimuth'
+        distance = sighting['correctedDistance']
+        if not isinstance(distance, basestring) or schema.parseInteger(distance) is None:
+            return None, 'correctedDistance is invalid'
+        azimuth = sighting['correctedAzimuth']
+        if not isinstance(azimuth, basestring):
+            return None, 'correctedAzimuth is invalid'
+        azimuth, error = parseDegreeString(azimuth, False)
+        if error is not None or azimuth < 0 or azimuth >= 360:
+            return None, 'correctedAzimuth is invalid'
+        distances.append(schema.parseInteger(distance))
+        azimuths.append(azimuth)
+    return (distances, azimuths), None
+
+
+validateSighting = schema.compileSchema(
+    schema.field('assumedLat', schema.degreeValue('assumedLat is invalid', False, -90, 90),
+                 missingError='missing mandatory field assumedLat'),
+    schema.field('assumedLong', schema.degreeValue('assumedLong is invalid', False, 0, 360, False),
+                 missingError='missing mandatory field assumedLong'),
+    schema.field('sightings', parseSightings, missingError='missing mandatory field sightings'),
+)
 
 
 def locate(sighting):
     """
-    Stub for the locate operation.
-    :param sighting: A dictionary containing data on the star sighting.
-    :return: The unmodified sighting.
+    Implementation of the locate operation. This operation combines the lines of position of several corrected
+    sightings, all taken from the same assumed position, into a single position fix.
+    :param sighting: A dictionary, containing the following fields:
+        'assumedLat' - Mandatory - degree string of the assumed latitude. '-90d0.0' < assumedLat < '90d0.0'
+        'assumedLong' - Mandatory - degree string of the assumed longitude. '0d0.0' <= assumedLong < '360d0.0'
+        'sightings' - Mandatory - a non-empty list of dictionaries, each holding the 'correctedDistance' and
+                      'correctedAzimuth' produced by the correct operation from that assumed position.
+    :return: The same dictionary, with either the following fields added:
+        'presentLat' - The latitude of the fix, as a degree string.
+        'presentLong' - The longitude of the fix, as a degree string.
+        'precision' - The root mean square distance, in nautical miles, between the fix and each line of position.
+    or, in the event of an error, an 'error' field holding a string explaining the source of the error.
     """
+    timer = instrumentation.enabled and instrumentation.StageTimer('locate')
+    parsed, error = validateSighting(sighting)
+    if timer:
+        timer.lap('validate')
+    if error is not None:
+        sighting['error'] = error
+        return sighting
+    assumedLat, assumedLon, (distances, azimuths) = parsed
+    presentLat, presentLon, precision = calculateFix(assumedLat, assumedLon, distances, azimuths)
+    if timer:
+        timer.lap('calculate')
+    if presentLat <= -90 or presentLat >= 90:
+        sighting['error'] = 'sightings do not produce a fix'
+        return sighting
+    sighting['presentLat'] = degreesToSignedDegreeString(presentLat)
+    sighting['presentLong'] = degreesToDegreeString(presentLon)
+    sighting['precision'] = str(int(round(precision)))
+    if timer:
+        timer.lap('format')
     return sighting
 
+
+def calculateFix(assumedLat, assumedLon, distances, azimuths):
+    """
+    calculateFix moves the assumed position to the point closest, in the least-squares sense, to every line of
+    position.
+    :param assumedLat: Numeric, the assumed latitude in degrees.
+    :param assumedLon: Numeric, the assumed longitude in degrees.
+    :param distances: A sequence of the corrected distances of each sighting, in arc minutes.
+    :param azimuths: A sequence of the corrected azimuths of each sighting, in degrees.
+    :return: A tuple (latitude, longitude, precision), where longitude is in [0, 360) and precision is the root
+    mean square distance, in nautical miles, from the fix to the lines of position.
+    """
+    north, east, precision = solveLinesOfPosition(distances, azimuths)
+    presentLat = assumedLat + north / 60.0
+    presentLon = assumedLon + east / (60.0 * math.cos(math.radians(assumedLat)))
+    presentLon -= 360 * math.floor(presentLon / 360.0)
+    return presentLat, presentLon, precision
+
+
+def solveLinesOfPosition(distances, azimuths):
+    """
+    solveLinesOfPosition finds the offset (north, east) minimizing the sum of squared distances to every line of
+    position. Each sighting contributes the line perpendicular to its azimuth, its corrected distance away from the
+    assumed position, so the solution solves the 2x2 normal equations accumulated in a single pass. When all
+    azimuths are parallel, the lines do not cross, and the smallest offset reaching them is used instead.
+    :param distances: A sequence of the corrected distances of each sighting, in arc minutes (nautical miles).
+    :param azimuths: A sequence of the corrected azimuths of each sighting, in degrees.
+    :return: A tuple (north, east, precision), the offset in nautical miles, and the root mean square distance
+    from the offset to the lines of position.
+    """
+    sin = math.sin
+    cos = math.cos
+    radians = math.radians
+    nn = ne = ee = dn = de = dd = 0.0
+    count = 0
+    for distance, azimuth in zip(distances, azimuths):
+        azimuthr = radians(azimuth)
+        n = cos(azimuthr)
+        e = sin(azimuthr)
+        nn += n * n
+        ne += n * e
+        ee += e * e
+        dn += distance * n
+        de += distance * e
+        dd += distance * distance
+        count += 1
+
+    determinant = nn * ee - ne * ne
+    trace = nn + ee
+    if determinant > 1e-9 * trace * trace:
+        north = (ee * dn - ne * de) / determinant
+        east = (nn * de - ne * dn) / determinant
+    else:
+        # Every line of position has the same direction (n, e), so the normal matrix is trace * (n, e)(n, e)^T.
+        n = cos(radians(azimuths[0]))
+        e = sin(radians(azimuths[0]))
+        projection = (dn * n + de * e) / trace
+        north = projection * n
+        east = projection * e
+
+    # The sum of squared residuals, expanded so that it can reuse the accumulated sums.
+    squaredError = dd - 2 * (north * dn + east * de) + \
+        north * north * nn + 2 * north * east * ne + east * east * ee
+    precision = math.sqrt(max(squaredError, 0.0) / count)
+    return north, east, precision
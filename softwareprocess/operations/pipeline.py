@@ -0,0 +1,94 @@
+"""
+    pipeline.py contains functionality for the 'pipeline' operation,
+    which fuses 'adjust', 'predict' and 'correct' into a single
+    request. Intermediate results are passed along in an
+    angle.Sighting, and degree strings are only produced for the
+    final output.
+"""
+import adjust
+import correct
+import instrumentation
+import predict
+import schema
+from angle import Angle, Sighting
+
+validateAssumedPosition = schema.compileSchema(
+    schema.field('assumedLat', schema.degreeValue('assumedLat is invalid', False, -90, 90),
+                 missingError='missing mandatory field assumedLat'),
+    schema.field('assumedLong', schema.degreeValue('assumedLong is invalid', False, 0, 360, False),
+                 missingError='missing mandatory field assumedLong'),
+)
+
+
+def pipeline(sighting):
+    """
+    Implementation of the pipeline operation, equivalent to running a sighting through adjust, then predict, then
+    correct. Since the altitude, latitude and longitude are not rounded to a tenth of an arc minute between the
+    steps, the results can differ from the three separate operations in the last digit.
+    :param sighting: A dictionary, containing the fields of both adjust ('observation', 'height', 'temperature',
+    'pressure', 'horizon') and predict ('body', 'date', 'time'), as well as:
+        'assumedLat' - Mandatory - degree string of the assumed latitude. '-90d0.0' < assumedLat < '90d0.0'
+        'assumedLong' - Mandatory - degree string of the assumed longitude. '0d0.0' <= assumedLong < '360d0.0'
+    :return: The same dictionary, with either the fields added by adjust ('altitude'), predict ('lat', 'long') and
+    correct ('correctedDistance', 'correctedAzimuth'), or an 'error' field with the first error the three operations
+    would have reported.
+    """
+    timer = instrumentation.enabled and instrumentation.StageTimer('pipeline')
+    # Validation is interleaved with the calculation, so both are timed together.
+    result, error = calculatePipeline(sighting)
+    if timer:
+        timer.lap('calculate')
+    if error is not None:
+        sighting['error'] = error
+        return sighting
+    sighting['altitude'] = str(result.altitude)
+    sighting['lat'] = str(result.lat)
+    sighting['long'] = str(result.lon)
+    sighting['correctedDistance'] = str(int(result.distance))
+    sighting['correctedAzimuth'] = str(result.azimuth)
+    if timer:
+        timer.lap('format')
+    return sighting
+
+
+def pipelineBatch(sightings):
+    """
+    Batched implementation of the pipeline operation.
+    :param sightings: A list of dictionaries, each containing the fields described in pipeline.
+    :return: The same list, with each dictionary updated exactly as pipeline would have updated it.
+    """
+    for sighting in sightings:
+        pipeline(sighting)
+    return sightings
+
+
+def calculatePipeline(sighting):
+    """
+    calculatePipeline validates a sighting and carries it through all three operations, without modifying it.
+    :param sighting: A dictionary, containing the fields described in pipeline.
+    :return: A tuple (result, error). On success, error is None and result is an angle.Sighting with every input and
+    output set. Otherwise, result is None and error is the message for the sighting's 'error' field.
+    """
+    adjustParsed, error = adjust.validateSighting(sighting)
+    if error is not None:
+        return None, error
+    predictParsed, error = predict.validateSighting(sighting)
+    if error is not None:
+        return None, error
+    assumedPosition, error = validateAssumedPosition(sighting)
+    if error is not None:
+        return None, error
+
+    observation, height, temperature, pressure, naturalHorizon = adjustParsed
+    starId, date, time = predictParsed
+    assumedLat, assumedLon = assumedPosition
+    result = Sighting(observation=Angle(observation), height=height, temperature=temperature, pressure=pressure,
+                      naturalHorizon=naturalHorizon, starId=starId, date=date, time=time,
+                      assumedLat=Angle(assumedLat), assumedLon=Angle(assumedLon))
+
+    adjust.adjustSighting(result)
+    if result.altitude.degrees <= 0 or result.altitude.degrees >= 90:
+        return None, 'altitude is invalid'
+    predict.predictSighting(result)
+    correct.correctSighting(result)
+    return result, None
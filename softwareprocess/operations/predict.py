@@ -7,10 +7,15 @@
 
     @author: Mitchell Price
 """
+import calendar
 import datetime
 import math
 
+import instrumentation
+import schema
 import util
+from angle import Angle
+from catalog import StarCatalog
 
 star_data = {
     'alpheratz': {'sha': '357d41.7', 'declination': '29d10.9'},
@@ -74,12 +79,38 @@ star_data = {
     'markab': {'sha': '13d36.7', 'declination': '15d17.6'}
 }
 
+catalog = StarCatalog.fromDict(star_data)
+
 initialAriesGHA = util.degreeStringToDegrees('100d42.6', False)
 ariesGHADecreasePerYear = util.degreeStringToDegrees('0d14.31667', False)
 earthRotationalPeriod = 86164.1
 earthClockPeriod = 86400
 dailyRotation = 360.0 * abs(1 - earthRotationalPeriod / earthClockPeriod)
 baseYear = 2001
+ariesGHAStartOfYearCache = {}
+
+
+def parseBody(value):
+    """
+    parseBody looks up the value of a sighting's body field in the catalog, without modifying the sighting.
+    :param value: The raw value of the body field.
+    :return: A tuple (starId, error), where exactly one of the two is None.
+    """
+    if not isinstance(value, basestring):
+        return None, 'invalid body'
+    starId = catalog.starId(value)
+    if starId is None:
+        return None, 'star not in catalog'
+    return starId, None
+
+
+validateSighting = schema.compileSchema(
+    schema.field('body', parseBody, missingError='mandatory information is missing'),
+    schema.field('date', schema.dateValue('invalid date', baseYear), default=datetime.date(baseYear, 01, 01)),
+    schema.field('time', schema.timeValue('invalid time'), default=datetime.time(0, 0, 0)),
+    schema.absent('lat', 'lat key cannot be passed'),
+    schema.absent('long', 'long key cannot be passed'),
+)
 
 
 def predict(sighting):
@@ -88,26 +119,47 @@ def predict(sighting):
     :param sighting: A dictionary containing data on a star sighting.
     :return: The dictionary, with the latitude and longitude of the prediction fixed.
     """
-    body = extractBody(sighting)
-    if body is None:
-        return sighting
-    date = extractDate(sighting)
-    if date is None:
-        return sighting
-    time = extractTime(sighting)
-    if time is None:
+    timer = instrumentation.enabled and instrumentation.StageTimer('predict')
+    parsed, error = validateSighting(sighting)
+    if timer:
+        timer.lap('validate')
+    if error is not None:
+        sighting['error'] = error
         return sighting
-    if 'lat' in sighting:
-        sighting['error'] = 'lat key cannot be passed'
-        return sighting
-    if 'long' in sighting:
-        sighting['error'] = 'long key cannot be passed'
-        return sighting
-    sighting['lat'] = body['declination']
-    sighting['long'] = calcStarGHA(body['sha'], date, time)
+    starId, date, time = parsed
+    gha = roundAngle(catalog.shaDegrees[starId] + calcAriesGHA(date, time))
+    if timer:
+        timer.lap('calculate')
+    sighting['lat'] = catalog.declinationStrings[starId]
+    sighting['long'] = util.degreesToDegreeString(gha)
+    if timer:
+        timer.lap('format')
     return sighting
 
 
+def predictBatch(sightings):
+    """
+    Batched implementation of the predict operation. Every sighting is validated exactly as predict would validate it,
+    then the positions of all valid sightings are calculated together.
+    :param sightings: A list of dictionaries, each containing data on a star sighting.
+    :return: The same list, with each dictionary updated exactly as predict would have updated it.
+    """
+    valid = []
+    for sighting in sightings:
+        parsed, error = validateSighting(sighting)
+        if error is not None:
+            sighting['error'] = error
+            continue
+        valid.append((sighting,) + parsed)
+
+    declinationStrings = catalog.declinationStrings
+    shaDegrees = catalog.shaDegrees
+    for sighting, starId, date, time in valid:
+        sighting['lat'] = declinationStrings[starId]
+        sighting['long'] = calcStarGHAFromDegrees(shaDegrees[starId], date, time)
+    return sightings
+
+
 def extractBody(sighting):
     """
     extractBody will attempt to extract the body field from the given sighting.
@@ -116,6 +168,20 @@ def extractBody(sighting):
     :param sighting: A dictionary containing data on a star sighting.
     :return: A dictionary mapping 'sha' to the star's SHA, and 'declination' to the start's Declination.
     """
+    starId = extractStarId(sighting)
+    if starId is None:
+        return None
+    return catalog.entry(starId)
+
+
+def extractStarId(sighting):
+    """
+    extractStarId will attempt to extract the body field from the given sighting, and look it up in the catalog.
+    In the event that there is no valid body field in the input, it will add an 'error' field
+    containing a diagnostic string.
+    :param sighting: A dictionary containing data on a star sighting.
+    :return: The id of the star in the catalog, or None.
+    """
     if not 'body' in sighting:
         sighting['error'] = 'mandatory information is missing'
         return None
@@ -123,11 +189,23 @@ def extractBody(sighting):
     if not isinstance(star, basestring):
         sighting['error'] = 'invalid body'
         return None
-    star = star.lower()
-    if star not in star_data:
+    starId = catalog.starId(star)
+    if starId is None:
         sighting['error'] = 'star not in catalog'
         return None
-    return star_data[star]
+    return starId
+
+
+def setCatalog(starCatalog):
+    """
+    setCatalog replaces the catalog used by predict, for instance with one read by catalog.loadCatalog.
+    :param starCatalog: A StarCatalog.
+    :return: The StarCatalog that was previously in use.
+    """
+    global catalog
+    previousCatalog = catalog
+    catalog = starCatalog
+    return previousCatalog
 
 
 def extractDate(sighting):
@@ -188,6 +266,18 @@ def extractTime(sighting):
         return None
 
 
+def predictSighting(sighting):
+    """
+    predictSighting is the numeric form of predict, which sets the position of the star of an angle.Sighting.
+    :param sighting: An angle.Sighting, with starId, date and time.
+    :return: The same Sighting, with lat and lon set.
+    """
+    starId = sighting.starId
+    sighting.lat = Angle(catalog.declinationDegrees[starId], catalog.declinationStrings[starId])
+    sighting.lon = Angle(roundAngle(catalog.shaDegrees[starId] + calcAriesGHA(sighting.date, sighting.time)))
+    return sighting
+
+
 def calcNumLeapYearsSinceBaseYear(year):
     """
     calcNumLeapYearsSince2001 will determine how many leap years occurred before the given year.
@@ -200,13 +290,18 @@ def calcNumLeapYearsSinceBaseYear(year):
 def calcAriesGHAStartOfYear(year):
     """
     calcAriesGHAStartOfYear will calculate Aries' GHA at the beginning of the given year.
+    Results are cached per year, since every sighting in a year shares the same value.
     :param year: The current year.
     :return: A numeric value, the GHA of Aries at the beginning of the year.
     """
+    if year in ariesGHAStartOfYearCache:
+        return ariesGHAStartOfYearCache[year]
     numYears = year - baseYear
     yearProgression = numYears * -1.0 * ariesGHADecreasePerYear
     leapYearProgression = calcNumLeapYearsSinceBaseYear(year) * dailyRotation
-    return initialAriesGHA + yearProgression + leapYearProgression
+    gha = initialAriesGHA + yearProgression + leapYearProgression
+    ariesGHAStartOfYearCache[year] = gha
+    return gha
 
 
 def calcAriesGHA(date, time):
@@ -216,14 +311,50 @@ def calcAriesGHA(date, time):
     :param time: The current time.
     :return: A numeric value, the GHA of Aries at the given date and time
     """
-    currentTime = datetime.datetime.combine(date, time)
-    secondsSinceNewYears = (currentTime - datetime.datetime(date.year, 1, 1, 0, 0, 0)).total_seconds()
+    dayOfYear = date.toordinal() - datetime.date(date.year, 1, 1).toordinal()
+    secondsSinceNewYears = dayOfYear * 86400 + time.hour * 3600 + time.minute * 60 + time.second
+    if time.microsecond:
+        secondsSinceNewYears += time.microsecond / 1e6
+    return calcAriesGHAFromSeconds(date.year, secondsSinceNewYears)
+
+
+def calcAriesGHAFromSeconds(year, secondsSinceNewYears):
+    """
+    calcAriesGHAFromSeconds will calculate Aries' GHA a number of seconds into the given year,
+    without any datetime arithmetic.
+    :param year: The current year.
+    :param secondsSinceNewYears: Numeric, the number of seconds since midnight on January 1st of the year.
+    :return: A numeric value, the GHA of Aries at the given time.
+    """
     rotations = secondsSinceNewYears / earthRotationalPeriod
     rotation = rotations - math.floor(rotations)
-    gha = rotation * 360.0 + calcAriesGHAStartOfYear(date.year)
+    gha = rotation * 360.0 + calcAriesGHAStartOfYear(year)
     return roundAngle(gha)
 
 
+def calcAriesGHAMany(epochSeconds):
+    """
+    calcAriesGHAMany will calculate Aries' GHA for many instants at once. Consecutive instants that fall
+    in the same year share the year's bounds, so fixed-interval schedules only touch the calendar once per year.
+    :param epochSeconds: A sequence of integers, each a number of seconds since 1970-01-01 00:00:00 UTC.
+    :return: A list of numeric values, the GHA of Aries at each instant.
+    """
+    floor = math.floor
+    ghas = []
+    append = ghas.append
+    yearStart = yearEnd = None
+    for epoch in epochSeconds:
+        if yearStart is None or epoch < yearStart or epoch >= yearEnd:
+            year = datetime.datetime.utcfromtimestamp(epoch).year
+            yearStart = calendar.timegm((year, 1, 1, 0, 0, 0))
+            yearEnd = calendar.timegm((year + 1, 1, 1, 0, 0, 0))
+            startGHA = calcAriesGHAStartOfYear(year)
+        rotations = (epoch - yearStart) / earthRotationalPeriod
+        gha = (rotations - floor(rotations)) * 360.0 + startGHA
+        append(gha - 360 * floor(gha / 360.0))
+    return ghas
+
+
 def calcStarGHA(starSHA, date, time):
     """
     calcStarGHA will calculate the GHA of a given star at the given date and time
@@ -232,7 +363,18 @@ def calcStarGHA(starSHA, date, time):
     :param time: The time the mesasurement was made.
     :return: A degree string representation of the GHA.
     """
-    gha = util.degreeStringToDegrees(starSHA, False) + calcAriesGHA(date, time)
+    return calcStarGHAFromDegrees(util.degreeStringToDegrees(starSHA, False), date, time)
+
+
+def calcStarGHAFromDegrees(starSHA, date, time):
+    """
+    calcStarGHAFromDegrees will calculate the GHA of a star whose SHA has already been parsed.
+    :param starSHA: Numeric, the SHA of the star in degrees.
+    :param date: The date the measurement was made.
+    :param time: The time the measurement was made.
+    :return: A degree string representation of the GHA.
+    """
+    gha = starSHA + calcAriesGHA(date, time)
     roundedGHA = roundAngle(gha)
     return util.degreesToDegreeString(roundedGHA)
 
@@ -0,0 +1,202 @@
+"""
+    schema.py contains a declarative, exception-free validator for
+    star sightings. Each operation describes its fields once, and
+    compileSchema turns that description into a single validation
+    function returning (parsedTuple, error).
+"""
+import calendar
+import datetime
+import re
+
+from util import parseDegreeString
+
+# Used as the default of a field that must be present.
+mandatory = object()
+# Returned as the value of checks that only validate, and so add nothing to the parsed tuple.
+noValue = object()
+
+integerString = re.compile(r'\s*[+-]?\d+\s*\Z')
+unicodeIntegerString = re.compile(r'\s*[+-]?\d+\s*\Z', re.UNICODE)
+floatString = re.compile(r'\s*[+-]?(?:\d+\.?\d*(?:e[+-]?\d+)?|\.\d+(?:e[+-]?\d+)?|inf|infinity|nan)\s*\Z',
+                         re.IGNORECASE)
+unicodeFloatString = re.compile(floatString.pattern, re.IGNORECASE | re.UNICODE)
+
+
+def compileSchema(*checks):
+    """
+    compileSchema combines field checks into a validator. The checks run in order, and the first error wins,
+    so the order must match the order in which the operation reports its errors.
+    :param checks: Functions built by field or absent.
+    :return: A function taking a sighting and returning a tuple (parsedTuple, error). On success, error is None and
+    parsedTuple holds the value of every field check, in order. Otherwise, parsedTuple is None and error holds the
+    message for the sighting's 'error' field. The sighting itself is never modified.
+    """
+    def validate(sighting):
+        values = []
+        for check in checks:
+            value, error = check(sighting)
+            if error is not None:
+                return None, error
+            if value is not noValue:
+                values.append(value)
+        return tuple(values), None
+    return validate
+
+
+def field(name, parse, default=mandatory, missingError=None):
+    """
+    field builds a check for a single field of a sighting.
+    :param name: The key of the field.
+    :param parse: A function taking the raw value and returning (value, error), such as those built below.
+    :param default: The value used when the field is absent, or mandatory if the field must be present.
+    :param missingError: The error for a missing mandatory field.
+    :return: A check for compileSchema.
+    """
+    def check(sighting):
+        if name not in sighting:
+            if default is mandatory:
+                return None, missingError
+            return default, None
+        return parse(sighting[name])
+    return check
+
+
+def absent(name, error):
+    """
+    absent builds a check for a field that must not be given in input.
+    :param name: The key of the field.
+    :param error: The error reported when the field is present.
+    :return: A check for compileSchema, which adds nothing to the parsed tuple.
+    """
+    def check(sighting):
+        if name in sighting:
+            return None, error
+        return noValue, None
+    return check
+
+
+def parseInteger(value):
+    """
+    parseInteger converts a string to an integer exactly as int() would, without raising.
+    :return: The integer, or None if int() would have raised.
+    """
+    if isinstance(value, unicode):
+        if unicodeIntegerString.match(value) is None:
+            return None
+    elif integerString.match(value) is None:
+        return None
+    return int(value)
+
+
+def parseFloat(value):
+    """
+    parseFloat converts a string to a float exactly as float() would, without raising.
+    :return: The float, or None if float() would have raised.
+    """
+    if isinstance(value, unicode):
+        if unicodeFloatString.match(value) is None:
+            return None
+    elif floatString.match(value) is None:
+        return None
+    return float(value)
+
+
+def floatValue(invalidError, lowBound):
+    """
+    floatValue builds a parser for a numeric string no smaller than lowBound.
+    """
+    def parse(value):
+        if not isinstance(value, basestring):
+            return None, invalidError
+        number = parseFloat(value)
+        if number is None or number < lowBound:
+            return None, invalidError
+        return number, None
+    return parse
+
+
+def integerValue(invalidError, lowBound, highBound):
+    """
+    integerValue builds a parser for an integer string between lowBound and highBound, inclusive.
+    """
+    def parse(value):
+        if not isinstance(value, basestring):
+            return None, invalidError
+        number = parseInteger(value)
+        if number is None or number < lowBound or number > highBound:
+            return None, invalidError
+        return number, None
+    return parse
+
+
+def choiceValue(invalidError, choices):
+    """
+    choiceValue builds a parser for a case-insensitive string, which must be one of the keys of choices.
+    """
+    def parse(value):
+        if not isinstance(value, basestring):
+            return None, invalidError
+        choice = value.lower()
+        if choice not in choices:
+            return None, invalidError
+        return choices[choice], None
+    return parse
+
+
+def degreeValue(invalidError, validate=True, lowBound=None, highBound=None, lowExclusive=True):
+    """
+    degreeValue builds a parser for a degree string. If validate is True, the measurement must be in (0, 90), as in
+    util.degreeStringToDegrees. If lowBound and highBound are given, the measurement must also be in
+    [lowBound, highBound), or (lowBound, highBound) if lowExclusive is True.
+    """
+    def parse(value):
+        if not isinstance(value, basestring):
+            return None, invalidError
+        measurement, error = parseDegreeString(value, validate)
+        if error is not None:
+            return None, invalidError
+        if lowBound is not None:
+            if (lowExclusive and measurement <= lowBound) or measurement < lowBound or measurement >= highBound:
+                return None, invalidError
+        return measurement, None
+    return parse
+
+
+def dateValue(invalidError, minYear):
+    """
+    dateValue builds a parser for a date string of the form yyyy-mm-dd, where yyyy is at least minYear.
+    """
+    def parse(value):
+        if not isinstance(value, basestring):
+            return None, invalidError
+        fields = value.split('-')
+        if len(fields) != 3:
+            return None, invalidError
+        year, month, day = [parseInteger(part) for part in fields]
+        if year is None or month is None or day is None:
+            return None, invalidError
+        if year < minYear or year > datetime.MAXYEAR or month < 1 or month > 12:
+            return None, invalidError
+        if day < 1 or day > calendar.monthrange(year, month)[1]:
+            return None, invalidError
+        return datetime.date(year, month, day), None
+    return parse
+
+
+def timeValue(invalidError):
+    """
+    timeValue builds a parser for a time string of the form hh:mm:ss.
+    """
+    def parse(value):
+        if not isinstance(value, basestring):
+            return None, invalidError
+        fields = value.split(':')
+        if len(fields) != 3:
+            return None, invalidError
+        hour, minute, second = [parseInteger(part) for part in fields]
+        if hour is None or minute is None or second is None:
+            return None, invalidError
+        if hour < 0 or hour > 23 or minute < 0 or minute > 59 or second < 0 or second > 59:
+            return None, invalidError
+        return datetime.time(hour, minute, second), None
+    return parse
@@ -1,4 +1,49 @@
+import array
 import math
+import re
+
+# Degree strings in canonical form, e.g. '45d30.0' or '-15d0', which can be parsed without any exception handling.
+canonicalDegreeString = re.compile(r'(-?)(\d+)d(\d+(?:\.\d*)?|\.\d+)\Z')
+smallestMeasurement = 0.1 / 60
+degreeStringCacheSize = 4096
+
+
+class BoundedCache(object):
+    """
+    BoundedCache is a memoization table that never holds more than twice maxSize entries. It approximates an LRU
+    cache with two generations of plain dictionaries: entries are written to the recent generation, lookups that hit
+    the older generation promote the entry, and when the recent generation is full it replaces the older one.
+    This keeps every operation a plain dictionary access.
+    """
+
+    def __init__(self, maxSize):
+        self.maxSize = maxSize
+        self.recent = {}
+        self.older = {}
+
+    def get(self, key, default=None):
+        value = self.recent.get(key, default)
+        if value is default:
+            value = self.older.get(key, default)
+            if value is not default:
+                self.put(key, value)
+        return value
+
+    def put(self, key, value):
+        if len(self.recent) >= self.maxSize:
+            self.older = self.recent
+            self.recent = {}
+        self.recent[key] = value
+
+    def clear(self):
+        self.recent = {}
+        self.older = {}
+
+    def __len__(self):
+        return len(self.recent) + len(self.older)
+
+
+degreeStringCache = BoundedCache(degreeStringCacheSize)
 
 
 def degreeStringToDegrees(degreeString, validate=True):
@@ -9,6 +54,70 @@ def degreeStringToDegrees(degreeString, validate=True):
     :param validate: Boolean (optional, default True). If true, will ensure that the measurement is in (0, 90)
     :return: x + (y / 60), or will raise a value error if the given string is not formatted properly.
     """
+    if not isinstance(degreeString, basestring):
+        return parseUncommonDegreeString(degreeString, validate)
+    value, error = parseDegreeString(degreeString, validate)
+    if error is not None:
+        raise ValueError(error)
+    return value
+
+
+def parseDegreeString(degreeString, validate=True):
+    """
+    Exception-free form of degreeStringToDegrees. Results are memoized, since the same measurements tend to
+    repeat across many requests.
+    :param degreeString: String, of the format described in degreeStringToDegrees.
+    :param validate: Boolean (optional, default True). If true, will ensure that the measurement is in (0, 90)
+    :return: A tuple (value, error). On success, error is None. Otherwise, value is None and error holds the message
+    degreeStringToDegrees would have raised.
+    """
+    if not isinstance(degreeString, basestring):
+        return None, "Not a degree string"
+    # Equal str and unicode strings hash alike, but do not always parse alike, so the type is part of the key.
+    key = (type(degreeString), degreeString)
+    parsed = degreeStringCache.get(key)
+    if parsed is None:
+        parsed = parseUncachedDegreeString(degreeString)
+        degreeStringCache.put(key, parsed)
+    value, error = parsed
+    if error is None and validate:
+        if value < smallestMeasurement:
+            return None, "Measurement too small"
+        elif value >= 90.0:
+            return None, "Measurement too large"
+    return parsed
+
+
+def parseUncachedDegreeString(degreeString):
+    """
+    Parses a degree string without validating its range, in a single regular expression match for canonical strings.
+    :param degreeString: String, of the format described in degreeStringToDegrees.
+    :return: A tuple (value, error), as in parseDegreeString.
+    """
+    match = canonicalDegreeString.match(degreeString)
+    if match is None:
+        try:
+            return parseUncommonDegreeString(degreeString, False), None
+        except ValueError as error:
+            return None, error.args[0]
+    sign, degrees, minutes = match.groups()
+    minutes = float(minutes)
+    if minutes >= 60.0:
+        return None, "Number of minutes too large"
+    value = int(degrees) + (minutes / 60)
+    if sign:
+        value = -value
+    return value, None
+
+
+def parseUncommonDegreeString(degreeString, validate=True):
+    """
+    The original degree string parser, kept for strings that are not in canonical form so that their
+    (occasionally surprising) results and error messages are unchanged.
+    :param degreeString: String, of the format described in degreeStringToDegrees.
+    :param validate: Boolean (optional, default True). If true, will ensure that the measurement is in (0, 90)
+    :return: The value in degrees, or will raise a value error if the given string is not formatted properly.
+    """
     if degreeString.count('d') == 0:
         raise ValueError("No 'd' delimiter")
     elif degreeString.count('d') > 1:
@@ -26,13 +135,35 @@ def degreeStringToDegrees(degreeString, validate=True):
     value = degrees + (minutes / 60)
     if degreeString[0] == '-':
         value = -value
-    if value < 0.1 / 60 and validate:
+    if value < smallestMeasurement and validate:
         raise ValueError("Measurement too small")
     elif value >= 90.0 and validate:
         raise ValueError("Measurement too large")
     return value
 
 
+def degreeStringsToDegrees(degreeStrings, validate=True):
+    """
+    Bulk form of degreeStringToDegrees, which reports errors by position instead of raising.
+    :param degreeStrings: A sequence of degree strings.
+    :param validate: Boolean (optional, default True). If true, will ensure that each measurement is in (0, 90)
+    :return: A tuple (values, errorIndices). values is an array of doubles holding each measurement, with NaN in place
+    of every invalid one, and errorIndices is a list of the positions of the invalid measurements.
+    """
+    values = array.array('d')
+    append = values.append
+    errorIndices = []
+    nan = float('nan')
+    for index, degreeString in enumerate(degreeStrings):
+        value, error = parseDegreeString(degreeString, validate)
+        if error is None:
+            append(value)
+        else:
+            append(nan)
+            errorIndices.append(index)
+    return values, errorIndices
+
+
 def degreesToDegreeString(degrees):
     """
     Takes an arc measurement and produces the corresponding degree / minute string representation,
@@ -43,3 +174,30 @@ def degreesToDegreeString(degrees):
     x = math.floor(degrees)
     y = (degrees - x) * 60
     return "%dd%0.1f" % (x, y)
+
+
+def degreesToDegreeStrings(degreesList):
+    """
+    Bulk form of degreesToDegreeString.
+    :param degreesList: A sequence (a list, tuple, array or numpy array) of arc measurements.
+    :return: A list of the string representations of each measurement, identical to degreesToDegreeString.
+    """
+    floor = math.floor
+    degreeStrings = []
+    append = degreeStrings.append
+    for degrees in degreesList:
+        x = floor(degrees)
+        append("%dd%0.1f" % (x, (degrees - x) * 60))
+    return degreeStrings
+
+
+def degreesToSignedDegreeString(degrees):
+    """
+    Takes a signed arc measurement and produces the degree / minute string representation used for latitudes,
+    where the sign applies to the whole measurement: -15.5 becomes '-15d30.0'.
+    :param degrees: Numeric, an arc measurement.
+    :return: The string representation of the degrees and minutes in the arc.
+    """
+    if degrees < 0:
+        return '-' + degreesToDegreeString(-degrees)
+    return degreesToDegreeString(degrees)
@@ -0,0 +1,154 @@
+"""
+    parallel.py contains a process pool execution mode for dispatch.
+    Requests are split into chunks which are processed by worker
+    processes, and results are returned in input order. Small inputs,
+    or a pool of a single worker, are processed in-process.
+"""
+import collections
+import itertools
+import multiprocessing
+import os
+
+import dispatch
+
+# The number of workers used when none is given. Overridden by the SOFTWAREPROCESS_WORKERS environment variable.
+defaultWorkers = 1
+defaultChunkSize = 1000
+# Inputs with fewer requests than this are not worth the cost of starting processes and pickling requests.
+defaultMinimumParallelSize = 5000
+
+
+def configuredWorkers():
+    """
+    configuredWorkers determines how many worker processes to use.
+    :return: The value of the SOFTWAREPROCESS_WORKERS environment variable, if it holds a non-negative integer,
+    where '0' stands for one worker per CPU. Otherwise, defaultWorkers.
+    """
+    try:
+        workers = int(os.environ.get('SOFTWAREPROCESS_WORKERS', defaultWorkers))
+    except ValueError:
+        return defaultWorkers
+    if workers == 0:
+        return multiprocessing.cpu_count()
+    if workers < 0:
+        return defaultWorkers
+    return workers
+
+
+def dispatchChunk(requests):
+    """
+    dispatchChunk is run by the worker processes.
+    :param requests: A list of requests.
+    :return: The results of dispatch_batch on the requests.
+    """
+    return dispatch.dispatch_batch(requests)
+
+
+class DispatchPool(object):
+    """
+    DispatchPool runs dispatch_batch over large inputs in a pool of worker processes. The worker processes are
+    started on first use and reused until close is called. DispatchPool can be used as a context manager.
+    """
+
+    def __init__(self, workers=None, chunkSize=defaultChunkSize, minimumParallelSize=defaultMinimumParallelSize):
+        """
+        :param workers: Integer .GE. 1, the number of worker processes (optional, default configuredWorkers()).
+        :param chunkSize: Integer .GE. 1, the number of requests sent to a worker at a time.
+        :param minimumParallelSize: Inputs with fewer requests than this are processed in-process.
+        """
+        functionName = "DispatchPool.__init__: "
+        if workers is None:
+            workers = configuredWorkers()
+        if not isinstance(workers, int) or workers < 1:
+            raise ValueError(functionName + "invalid workers")
+        if not isinstance(chunkSize, int) or chunkSize < 1:
+            raise ValueError(functionName + "invalid chunkSize")
+        self.workers = workers
+        self.chunkSize = chunkSize
+        self.minimumParallelSize = minimumParallelSize
+        self.pool = None
+
+    def dispatch_batch(self, valuesList=None):
+        """
+        dispatch_batch has the same behavior as dispatch.dispatch_batch, but spreads large inputs across the pool.
+        Whichever way an input is processed, every request that is a dictionary is updated in place and returned,
+        as dispatch does.
+        :param valuesList: An iterable of requests.
+        :return: A list of results, in input order.
+        """
+        if valuesList == None:
+            return []
+        valuesList = list(valuesList)
+        if self.workers == 1 or len(valuesList) < self.minimumParallelSize:
+            return dispatch.dispatch_batch(valuesList)
+        chunks = [valuesList[start:start + self.chunkSize] for start in range(0, len(valuesList), self.chunkSize)]
+        results = []
+        for chunkResults in self.mapChunks(chunks):
+            results.extend(chunkResults)
+        # Workers update copies of the requests, so their results are written back into the originals.
+        for index, values in enumerate(valuesList):
+            if isinstance(values, dict) and isinstance(results[index], dict):
+                values.clear()
+                values.update(results[index])
+                results[index] = values
+        return results
+
+    def mapChunks(self, chunks):
+        """
+        mapChunks runs dispatch_batch over every chunk, keeping at most two chunks per worker in flight so that
+        a lazily produced input is never read much further ahead than it is processed. Until the pool is started,
+        chunks are read ahead until they hold minimumParallelSize requests, and an input that ends first is
+        processed in-process.
+        :param chunks: An iterable of lists of requests.
+        :return: A generator of the result lists of each chunk, in input order.
+        """
+        inProcess = self.workers == 1
+        if not inProcess and self.pool is None:
+            chunks = iter(chunks)
+            heldBack = []
+            size = 0
+            for requests in chunks:
+                heldBack.append(requests)
+                size += len(requests)
+                if size >= self.minimumParallelSize:
+                    break
+            inProcess = size < self.minimumParallelSize
+            chunks = itertools.chain(heldBack, chunks)
+        if inProcess:
+            for requests in chunks:
+                yield dispatch.dispatch_batch(requests)
+            return
+        if self.pool is None:
+            self.pool = multiprocessing.Pool(self.workers)
+        pending = collections.deque()
+        for requests in chunks:
+            pending.append(self.pool.apply_async(dispatchChunk, (requests,)))
+            if len(pending) >= 2 * self.workers:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exceptionType, exceptionValue, traceback):
+        self.close()
+        return False
+
+
+def dispatch_parallel(valuesList=None, workers=None, chunkSize=defaultChunkSize):
+    """
+    dispatch_parallel runs dispatch over every request using a temporary DispatchPool.
+    :param valuesList: An iterable of requests.
+    :param workers: The number of worker processes (optional, default configuredWorkers()).
+    :param chunkSize: The number of requests sent to a worker at a time.
+    :return: A list holding, for each request in input order, exactly what dispatch would have returned for it.
+    """
+    with DispatchPool(workers, chunkSize) as pool:
+        return pool.dispatch_batch(valuesList)
@@ -0,0 +1,84 @@
+"""
+    querystring.py contains the tokenizer shared by lambda_handler
+    and convertString2Dictionary, which splits a querystring into
+    key-value pairs in a single pass, along with a cache of parsed
+    querystrings.
+"""
+import re
+import urllib
+
+from operations.util import BoundedCache
+
+# Both forms of pairs are found by scanning with a compiled pattern. In querystrings, keys run up to the last '=' of a
+# whitespace-delimited token, and values either run to the end of the token or are double-quoted. In strict text,
+# pairs are separated by commas, each holds exactly one '=', and whitespace around keys and values is dropped. Unicode
+# text is scanned with unicodeStrictPair, so that whitespace is dropped as unicode.strip would.
+querystringPair = re.compile(r'(\S+)=(".*?"|\S+)')
+strictPairPattern = r'\s*([^,=]*?)\s*=\s*([^,=]*?)\s*(?:,|\Z)'
+strictPair = re.compile(strictPairPattern)
+unicodeStrictPair = re.compile(strictPairPattern, re.UNICODE)
+strictPairs = re.compile(r'[^,=]*=[^,=]*(?:,[^,=]*=[^,=]*)*\Z')
+templateCacheSize = 1024
+templateCache = BoundedCache(templateCacheSize)
+encodedTemplateCache = BoundedCache(templateCacheSize)
+
+
+def splitPairs(text, strict=False):
+    """
+    splitPairs tokenizes text into key-value pairs by scanning it with a compiled pattern. By default, it finds every
+    querystringPair, skipping anything that is not a pair. If strict is True, it finds every strictPair, once the
+    text is known to consist of nothing else.
+    :param text: The string to tokenize.
+    :param strict: True to require that every comma-separated field is a pair.
+    :return: A list of (key, value) tuples in order, or None if strict is True and a field is not a pair.
+    """
+    if not strict:
+        return querystringPair.findall(text)
+    if not strictPairs.match(text):
+        return None
+    return (unicodeStrictPair if isinstance(text, unicode) else strictPair).findall(text)
+
+
+def parseQuerystring(querystring, useCache=True):
+    """
+    parseQuerystring converts a querystring of the form '{key=value, key=value}' into a dictionary.
+    :param querystring: The querystring, as passed by API Gateway.
+    :param useCache: True to reuse the pairs of a querystring already parsed.
+    :return: A new dictionary holding every key=value pair in the querystring, where later keys replace earlier ones.
+    """
+    # Equal str and unicode strings hash alike, but do not always parse alike, so the type is part of the key.
+    cacheKey = (type(querystring), querystring)
+    pairs = templateCache.get(cacheKey) if useCache else None
+    if pairs is None:
+        pairs = tuple(splitPairs(querystring.strip('{}').replace(',', ' ')))
+        if useCache:
+            templateCache.put(cacheKey, pairs)
+    return dict(pairs)
+
+
+def parseEncodedPairs(inputString, isValidKey, isValidValue, useCache=True):
+    """
+    parseEncodedPairs converts a percent-encoded string of comma separated key=value pairs into a dictionary.
+    :param inputString: The percent-encoded string.
+    :param isValidKey: function(string) -> bool, which accepts valid keys.
+    :param isValidValue: function(string) -> bool, which accepts valid values.
+    :param useCache: True to reuse the result for a string already parsed with the same isValidKey and isValidValue.
+    :return: A new dictionary holding every pair, or None if a pair is malformed or invalid, or a key is repeated.
+    """
+    cacheKey = (type(inputString), inputString, isValidKey, isValidValue)
+    pairs = encodedTemplateCache.get(cacheKey) if useCache else None
+    if pairs is None:
+        pairs = splitPairs(urllib.unquote(inputString), True)
+        if pairs is not None:
+            keys = set()
+            for key, value in pairs:
+                if key in keys or not isValidKey(key) or not isValidValue(value):
+                    pairs = None
+                    break
+                keys.add(key)
+        pairs = tuple(pairs) if pairs is not None else ()
+        if useCache:
+            encodedTemplateCache.put(cacheKey, pairs)
+    if not pairs:
+        return None
+    return dict(pairs)
@@ -0,0 +1,184 @@
+"""
+    resultCache.py contains ResultCache, an optional in-process cache
+    in front of dispatch.dispatch. Requests are keyed on their op and
+    the fields that op reads or writes, so requests differing only in
+    other fields share an entry. Entries are evicted least recently
+    used first, and expire after a time to live.
+"""
+import collections
+import threading
+import time
+
+import dispatch
+
+defaultMaxSize = 10000
+defaultTimeToLive = 300.0
+
+# The fields each cacheable op reads or writes, which together determine its response. The fields an op writes
+# are included because a request may already hold them, and the op replaces them.
+cachedFields = {
+    'adjust': ('observation', 'height', 'temperature', 'pressure', 'horizon', 'altitude', 'error'),
+    'predict': ('body', 'date', 'time', 'lat', 'long', 'error'),
+    'correct': ('lat', 'long', 'altitude', 'assumedLat', 'assumedLong', 'correctedDistance', 'correctedAzimuth',
+                'error'),
+    'pipeline': ('observation', 'height', 'temperature', 'pressure', 'horizon', 'body', 'date', 'time', 'assumedLat',
+                 'assumedLong', 'altitude', 'lat', 'long', 'correctedDistance', 'correctedAzimuth', 'error'),
+}
+
+# Stands in for a field missing from a request, as opposed to one holding None.
+missingField = object()
+
+
+class ResultCache(object):
+    """
+    ResultCache remembers, for each distinct request, the fields dispatch added to it or changed. A cached response
+    is rebuilt by applying those fields to the new request, so, as with dispatch, the request is updated and
+    returned, and callers never hold a reference into the cache. ResultCache is safe to share between threads.
+    Entries become stale when the star catalog changes, so clear should be called after predict.setCatalog.
+    """
+
+    def __init__(self, maxSize=defaultMaxSize, timeToLive=defaultTimeToLive, clock=time.time):
+        """
+        :param maxSize: Integer .GE. 1, the largest number of entries kept.
+        :param timeToLive: Numeric .GT. 0, the number of seconds an entry stays valid, or None to keep entries until
+        they are evicted.
+        :param clock: function() -> float, the current time in seconds (optional, default time.time).
+        """
+        functionName = "ResultCache.__init__: "
+        if not isinstance(maxSize, int) or maxSize < 1:
+            raise ValueError(functionName + "invalid maxSize")
+        if timeToLive is not None and (not isinstance(timeToLive, (int, float)) or timeToLive <= 0):
+            raise ValueError(functionName + "invalid timeToLive")
+        self.maxSize = maxSize
+        self.timeToLive = timeToLive
+        self.clock = clock
+        self.entries = collections.OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.uncacheable = 0
+
+    def key(self, values):
+        """
+        key canonicalizes a request.
+        :param values: A request, as passed to dispatch.
+        :return: A hashable key, or None if the request cannot be cached.
+        """
+        if not isinstance(values, dict):
+            return None
+        op = values.get('op')
+        if not isinstance(op, basestring) or op not in cachedFields:
+            return None
+        key = (op,) + tuple(values.get(name, missingField) for name in cachedFields[op])
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def lookup(self, key, values):
+        """
+        lookup answers a request from the cache, counting a hit or a miss.
+        :param key: The key of values.
+        :param values: The request, which is updated on a hit.
+        :return: True on a hit.
+        """
+        now = self.clock()
+        with self.lock:
+            entry = self.entries.pop(key, None)
+            if entry is not None:
+                expiry, changes = entry
+                if expiry is None or now < expiry:
+                    self.entries[key] = entry
+                    self.hits += 1
+                    values.update(changes)
+                    return True
+                self.expirations += 1
+            self.misses += 1
+        return False
+
+    def store(self, key, before, result):
+        """
+        store caches the fields dispatch added to or changed in a request.
+        :param key: The key of the request.
+        :param before: A copy of the request, taken before dispatch.
+        :param result: The response of dispatch.
+        :return: None
+        """
+        changes = dict((name, value) for name, value in result.iteritems()
+                       if name not in before or before[name] != value)
+        expiry = None if self.timeToLive is None else self.clock() + self.timeToLive
+        with self.lock:
+            self.entries.pop(key, None)
+            self.entries[key] = (expiry, changes)
+            while len(self.entries) > self.maxSize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def dispatch(self, values=None):
+        """
+        dispatch returns exactly what dispatch.dispatch would, reusing the response to an identical request if one is
+        cached.
+        :param values: A request, as passed to dispatch.dispatch.
+        :return: The response.
+        """
+        key = self.key(values)
+        if key is None:
+            with self.lock:
+                self.uncacheable += 1
+            return dispatch.dispatch(values)
+        if self.lookup(key, values):
+            return values
+        before = dict(values)
+        result = dispatch.dispatch(values)
+        self.store(key, before, result)
+        return result
+
+    def dispatch_batch(self, valuesList=None):
+        """
+        dispatch_batch returns exactly what dispatch.dispatch_batch would. Requests are answered from the cache where
+        possible, and all others are run through dispatch.dispatch_batch together.
+        :param valuesList: An iterable of requests, as passed to dispatch.dispatch_batch.
+        :return: A list of responses, in input order.
+        """
+        if valuesList is None:
+            return []
+        valuesList = list(valuesList)
+        results = list(valuesList)
+        pending = []
+        for index, values in enumerate(valuesList):
+            key = self.key(values)
+            if key is None:
+                with self.lock:
+                    self.uncacheable += 1
+                pending.append((index, None, None))
+            elif not self.lookup(key, values):
+                pending.append((index, key, dict(values)))
+
+        batchResults = dispatch.dispatch_batch([valuesList[index] for index, key, before in pending])
+        for (index, key, before), result in zip(pending, batchResults):
+            if key is not None:
+                self.store(key, before, result)
+            results[index] = result
+        return results
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        """
+        stats reports how the cache has been used.
+        :return: A dictionary holding 'size', 'hits', 'misses', 'hitRate', 'evictions' (entries dropped for size),
+        'expirations' (entries dropped for age) and 'uncacheable' (requests passed straight to dispatch).
+        """
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {'size': len(self.entries), 'hits': self.hits, 'misses': self.misses,
+                    'hitRate': float(self.hits) / lookups if lookups else 0.0, 'evictions': self.evictions,
+                    'expirations': self.expirations, 'uncacheable': self.uncacheable}
+
+    def __len__(self):
+        return len(self.entries)
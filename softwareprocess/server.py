@@ -0,0 +1,271 @@
+"""
+    server.py contains a local HTTP service for dispatch, so that
+    sightings can be served without API Gateway. Run it as
+
+        python -m softwareprocess.server [--host HOST] [--port N]
+                                         [--cache-size N] [--cache-ttl SECONDS]
+                                         [--coalesce-delay MS] [--coalesce-size N]
+
+    Routes:
+        GET  /dispatch?key=value&...  one request, from the URL query.
+        POST /dispatch                one request, as a querystring of the
+                                      form '{key=value, key=value}' (as
+                                      lambda_handler accepts) or a JSON
+                                      object, or a JSON array of requests,
+                                      which is run through dispatch_batch.
+                                      A request in the array that raises is
+                                      answered with an 'error' field alone.
+        GET  /health                  {"status": "ok"}.
+        GET  /metrics                 instrumentation, and cache and
+                                      coalescer statistics, in the
+                                      Prometheus text format.
+
+    Connections are kept alive (HTTP/1.1), and every connection is
+    served by its own thread. With --coalesce-delay, single requests
+    from every connection are gathered into batches by a
+    coalescer.Coalescer.
+"""
+import argparse
+import BaseHTTPServer
+import json
+import SocketServer
+import sys
+import urlparse
+
+import coalescer
+import dispatch
+import operations.instrumentation as instrumentation
+import resultCache
+from querystring import parseQuerystring
+
+defaultHost = '127.0.0.1'
+defaultPort = 8080
+# Bodies larger than this are refused, rather than read into memory.
+maximumBodySize = 16 * 1024 * 1024
+jsonType = 'application/json'
+prometheusType = 'text/plain; version=0.0.4'
+
+
+def parseBody(body, contentType=None):
+    """
+    parseBody converts the body of a POST /dispatch into requests.
+    :param body: The body, as a string.
+    :param contentType: The Content-Type header (optional). Bodies sent as application/json must be JSON. Otherwise,
+    a body starting with '[', or with '{' followed by '"' or '}' (ignoring whitespace), is read as JSON, and anything
+    else as a querystring, whose keys are never quoted.
+    :return: A tuple (requests, isBatch, error), where requests is a single request, or a list of them if isBatch is
+    True, and error is None, or a message if the body could not be parsed.
+    """
+    text = body.strip()
+    isJson = contentType is not None and contentType.split(';')[0].strip().lower() == jsonType
+    if isJson or text.startswith('[') or (text.startswith('{') and text[1:].lstrip()[:1] in ('"', '}')):
+        try:
+            requests = json.loads(text)
+        except ValueError:
+            return None, False, 'invalid json'
+        if isinstance(requests, list):
+            return requests, True, None
+        if isinstance(requests, dict):
+            return requests, False, None
+        return None, False, 'body is not an object or array'
+    return parseQuerystring(text), False, None
+
+
+def statsMetrics(prefix, stats, metrics):
+    """
+    statsMetrics produces statistics in the Prometheus text format.
+    :param prefix: The prefix of every metric name, such as 'softwareprocess_cache_'.
+    :param stats: A dictionary of statistics, such as the output of ResultCache.stats.
+    :param metrics: A list of (name, kind) tuples, naming the statistics to produce and their Prometheus type.
+    :return: A string of lines.
+    """
+    lines = []
+    for name, kind in metrics:
+        metric = prefix + name + ('_total' if kind == 'counter' else '')
+        lines.append('# TYPE %s %s' % (metric, kind))
+        lines.append('%s %d' % (metric, stats[name]))
+    return '\n'.join(lines) + '\n'
+
+
+def engineMetrics(engine):
+    """
+    engineMetrics produces the statistics of a resultCache.ResultCache or coalescer.Coalescer engine, and of the
+    engine it wraps, in the Prometheus text format.
+    :param engine: The engine passed to handle.
+    :return: A string of lines, which is empty for other engines.
+    """
+    if isinstance(engine, resultCache.ResultCache):
+        return statsMetrics('softwareprocess_cache_', engine.stats(), [
+            ('size', 'gauge'), ('hits', 'counter'), ('misses', 'counter'), ('evictions', 'counter'),
+            ('expirations', 'counter'), ('uncacheable', 'counter')])
+    if isinstance(engine, coalescer.Coalescer):
+        return statsMetrics('softwareprocess_coalescer_', engine.stats(), [
+            ('batches', 'counter'), ('requests', 'counter')]) + engineMetrics(engine.engine)
+    return ''
+
+
+def dispatchBatch(engine, valuesList):
+    """
+    dispatchBatch runs a batch through the engine. If the batch raises, every request is run on its own, so that only
+    the requests that raise are answered with an error.
+    :param engine: Anything with dispatch and dispatch_batch functions.
+    :param valuesList: A list of requests.
+    :return: A list of responses, in input order. A request that raises is answered with a copy of itself holding
+    'error': 'internal error', or with {'error': 'internal error'} if it is not a dictionary.
+    """
+    originals = [dict(values) if isinstance(values, dict) else values for values in valuesList]
+    try:
+        return engine.dispatch_batch(valuesList)
+    except Exception:
+        pass
+    results = []
+    for values in originals:
+        try:
+            results.append(engine.dispatch(dict(values) if isinstance(values, dict) else values))
+        except Exception:
+            result = dict(values) if isinstance(values, dict) else {}
+            result['error'] = 'internal error'
+            results.append(result)
+    return results
+
+
+def handle(engine, method, path, body=None, contentType=None):
+    """
+    handle answers one HTTP request. It is independent of the connection, and never raises.
+    :param engine: Anything with dispatch and dispatch_batch functions, such as the dispatch module, a
+    resultCache.ResultCache or a coalescer.Coalescer.
+    :param method: The HTTP method, such as 'GET'.
+    :param path: The request path, including any query.
+    :param body: The request body, for POST.
+    :param contentType: The Content-Type header of the request.
+    :return: A tuple (status, contentType, body) of the response.
+    """
+    route = urlparse.urlsplit(path)
+    try:
+        if route.path == '/dispatch' and method in ('GET', 'POST'):
+            timer = instrumentation.enabled and instrumentation.StageTimer('http')
+            if method == 'GET':
+                requests, isBatch, error = dict(urlparse.parse_qsl(route.query)), False, None
+            else:
+                requests, isBatch, error = parseBody(body or '', contentType)
+            if timer:
+                timer.lap('parse')
+            if error is not None:
+                return 400, jsonType, json.dumps({'error': error})
+            if isBatch:
+                result = dispatchBatch(engine, requests)
+            else:
+                result = engine.dispatch(requests)
+            return 200, jsonType, json.dumps(result)
+        if route.path == '/health' and method == 'GET':
+            return 200, jsonType, json.dumps({'status': 'ok'})
+        if route.path == '/metrics' and method == 'GET':
+            return 200, prometheusType, instrumentation.toPrometheus() + engineMetrics(engine)
+        if route.path in ('/dispatch', '/health', '/metrics'):
+            return 405, jsonType, json.dumps({'error': 'method not allowed'})
+        return 404, jsonType, json.dumps({'error': 'not found'})
+    except Exception:
+        return 500, jsonType, json.dumps({'error': 'internal error'})
+
+
+class DispatchHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """
+    DispatchHandler serves one connection, passing every request on it to handle.
+    """
+    protocol_version = 'HTTP/1.1'
+    # Responses are written in one piece, rather than a write per header, and sent without waiting for more data.
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    def respond(self, method):
+        body = None
+        if method == 'POST':
+            length = self.headers.getheader('Content-Length')
+            if length is None or not length.isdigit():
+                return self.reply(411, jsonType, json.dumps({'error': 'length required'}), close=True)
+            if int(length) > maximumBodySize:
+                return self.reply(413, jsonType, json.dumps({'error': 'body too large'}), close=True)
+            body = self.rfile.read(int(length))
+        self.reply(*handle(self.server.engine, method, self.path, body, self.headers.getheader('Content-Type')))
+
+    def reply(self, status, contentType, body, close=False):
+        if isinstance(body, unicode):
+            body = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', contentType)
+        self.send_header('Content-Length', str(len(body)))
+        if close:
+            self.send_header('Connection', 'close')
+            self.close_connection = 1
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self.respond('GET')
+
+    def do_POST(self):
+        self.respond('POST')
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            BaseHTTPServer.BaseHTTPRequestHandler.log_message(self, format, *args)
+
+
+class DispatchServer(SocketServer.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    """
+    DispatchServer is the HTTP server. Every connection is served by its own daemon thread.
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 128
+
+    def __init__(self, address, engine=dispatch, verbose=False):
+        """
+        :param address: A tuple (host, port). Port 0 picks a free port, which is then found in server_address.
+        :param engine: Anything with dispatch and dispatch_batch functions (optional, default the dispatch module).
+        :param verbose: True to log every request to standard error.
+        """
+        BaseHTTPServer.HTTPServer.__init__(self, address, DispatchHandler)
+        self.engine = engine
+        self.verbose = verbose
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m softwareprocess.server',
+                                     description='Serve dispatch over HTTP.')
+    parser.add_argument('--host', default=defaultHost, help='address to listen on (default: %(default)s)')
+    parser.add_argument('--port', type=int, default=defaultPort, help='port to listen on (default: %(default)s)')
+    parser.add_argument('--cache-size', type=int, default=0,
+                        help='number of responses to cache, or 0 for no cache (default: %(default)s)')
+    parser.add_argument('--cache-ttl', type=float, default=resultCache.defaultTimeToLive,
+                        help='seconds a cached response stays valid (default: %(default)s)')
+    parser.add_argument('--coalesce-delay', type=float, default=None,
+                        help='milliseconds a single request may wait to be batched with others (default: no batching)')
+    parser.add_argument('--coalesce-size', type=int, default=coalescer.defaultMaxBatch,
+                        help='largest number of single requests batched together (default: %(default)s)')
+    parser.add_argument('--verbose', action='store_true', help='log every request to standard error')
+    arguments = parser.parse_args(argv)
+    if arguments.cache_size < 0 or arguments.cache_ttl <= 0:
+        parser.error('--cache-size must not be negative, and --cache-ttl must be positive')
+    if (arguments.coalesce_delay is not None and arguments.coalesce_delay < 0) or arguments.coalesce_size < 1:
+        parser.error('--coalesce-delay must not be negative, and --coalesce-size must be at least 1')
+
+    engine = dispatch
+    if arguments.cache_size > 0:
+        engine = resultCache.ResultCache(arguments.cache_size, arguments.cache_ttl)
+    if arguments.coalesce_delay is not None:
+        engine = coalescer.Coalescer(engine, arguments.coalesce_delay / 1000.0, arguments.coalesce_size)
+    server = DispatchServer((arguments.host, arguments.port), engine, arguments.verbose)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if isinstance(engine, coalescer.Coalescer):
+            engine.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""
+    stream.py contains a command line entry point which runs sightings
+    from newline-delimited files through dispatch, writing one JSON
+    result per line. Input is read lazily, in chunks, so memory use
+    does not grow with the size of the input.
+
+    usage: python -m softwareprocess.stream [-h] [--chunk-size N]
+                                            [--format {auto,json,querystring}]
+                                            [--workers N]
+                                            [--output OUTPUT] [FILE [FILE ...]]
+"""
+import argparse
+import itertools
+import json
+import sys
+
+import dispatch
+import parallel
+from querystring import parseQuerystring
+
+defaultChunkSize = 1000
+
+
+def readLines(paths):
+    """
+    readLines lazily yields every line of the given files, in order. A path of '-' stands for standard input.
+    :param paths: A list of file paths. If empty, standard input is read.
+    :return: A generator of lines.
+    """
+    if not paths:
+        paths = ['-']
+    for path in paths:
+        if path == '-':
+            for line in sys.stdin:
+                yield line
+        else:
+            with open(path, 'r') as inputFile:
+                for line in inputFile:
+                    yield line
+
+
+def parseLine(line, lineFormat='auto'):
+    """
+    parseLine converts one line of input into a request for dispatch.
+    :param line: A single line, holding either a JSON object or a querystring of the form 'key=value, key=value'.
+    :param lineFormat: One of 'json', 'querystring', or 'auto' (default), which treats lines that are valid JSON
+    as JSON and everything else as a querystring.
+    :return: The request. A line that is not valid JSON in 'json' format becomes {'error': 'invalid json'}.
+    """
+    if lineFormat != 'querystring':
+        try:
+            return json.loads(line)
+        except ValueError:
+            if lineFormat == 'json':
+                return {'error': 'invalid json'}
+    return parseQuerystring(line.strip())
+
+
+def chunk(iterable, chunkSize):
+    """
+    chunk groups an iterable into lists of at most chunkSize items, without reading ahead any further.
+    :param iterable: Any iterable.
+    :param chunkSize: Integer .GE. 1, the largest number of items in a chunk.
+    :return: A generator of lists.
+    """
+    iterator = iter(iterable)
+    while True:
+        items = list(itertools.islice(iterator, chunkSize))
+        if not items:
+            return
+        yield items
+
+
+def runChunk(engine, requests):
+    """
+    runChunk runs a chunk of requests through an engine. If the engine raises, every request is restored and run on
+    its own, so that one failing line does not end the stream.
+    :param engine: A function taking a list of requests and returning a list of results in the same order.
+    :param requests: A list of requests.
+    :return: A list of results, in input order. A request that raises is answered with a copy of itself holding
+    'error': dispatch.failedError, or with {'error': dispatch.failedError} if it is not a dictionary.
+    """
+    originals = [dict(values) if isinstance(values, dict) else values for values in requests]
+    try:
+        return engine(requests)
+    except Exception:
+        pass
+    results = []
+    for values in originals:
+        try:
+            results.extend(engine([dict(values) if isinstance(values, dict) else values]))
+        except Exception:
+            result = dict(values) if isinstance(values, dict) else {}
+            result['error'] = dispatch.failedError
+            results.append(result)
+    return results
+
+
+def processLines(lines, chunkSize=defaultChunkSize, lineFormat='auto', engine=None, workers=1):
+    """
+    processLines is the streaming pipeline: lines are parsed, grouped into chunks, and every chunk is run through
+    the engine. Blank lines are skipped, and a line whose request raises is answered with an error result rather
+    than ending the stream.
+    :param lines: An iterable of input lines.
+    :param chunkSize: The number of requests handed to the engine at once.
+    :param lineFormat: The format of each line, as in parseLine.
+    :param engine: A function taking a list of requests and returning a list of results in the same order.
+    Defaults to dispatch.dispatch_batch.
+    :param workers: The number of worker processes (optional, default 1). With more than one worker, chunks are
+    run through dispatch_batch in a parallel.DispatchPool, and engine is not used. Inputs of fewer than
+    parallel.defaultMinimumParallelSize requests are still run in-process.
+    :return: A generator of results, in input order.
+    """
+    requests = (parseLine(line, lineFormat) for line in lines if line.strip())
+    chunks = chunk(requests, chunkSize)
+    if workers > 1:
+        with parallel.DispatchPool(workers, chunkSize) as pool:
+            for results in pool.mapChunks(chunks):
+                for result in results:
+                    yield result
+        return
+    if engine is None:
+        # dispatch_batch already answers a raising request with an error result.
+        for requestChunk in chunks:
+            for result in dispatch.dispatch_batch(requestChunk):
+                yield result
+        return
+    for requestChunk in chunks:
+        for result in runChunk(engine, requestChunk):
+            yield result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m softwareprocess.stream',
+                                     description='Run newline-delimited sightings through dispatch.')
+    parser.add_argument('files', metavar='FILE', nargs='*', help="input files (default: standard input, or '-')")
+    parser.add_argument('--chunk-size', type=int, default=defaultChunkSize,
+                        help='number of sightings processed together (default: %(default)s)')
+    parser.add_argument('--format', choices=['auto', 'json', 'querystring'], default='auto',
+                        help='format of each input line (default: %(default)s)')
+    parser.add_argument('--output', default='-', help="output file (default: standard output, or '-')")
+    parser.add_argument('--workers', type=int, default=None,
+                        help='number of worker processes (default: $SOFTWAREPROCESS_WORKERS, or 1)')
+    arguments = parser.parse_args(argv)
+    if arguments.chunk_size < 1:
+        parser.error('--chunk-size must be at least 1')
+    if arguments.workers is None:
+        arguments.workers = parallel.configuredWorkers()
+    if arguments.workers < 1:
+        parser.error('--workers must be at least 1')
+
+    if arguments.output == '-':
+        outputFile = sys.stdout
+    else:
+        outputFile = open(arguments.output, 'w')
+    try:
+        for result in processLines(readLines(arguments.files), arguments.chunk_size, arguments.format,
+                                   workers=arguments.workers):
+            outputFile.write(json.dumps(result, sort_keys=True))
+            outputFile.write('\n')
+    finally:
+        if outputFile is not sys.stdout:
+            outputFile.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
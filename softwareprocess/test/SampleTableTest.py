@@ -0,0 +1,127 @@
+"""
+    SampleTableTest.py contains tests for the precomputed t-distribution
+    table in SampleTable.py
+"""
+
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+
+import softwareprocess.Sample as SM
+import softwareprocess.SampleTable as ST
+
+
+class SampleTableTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'table.bin')
+
+    def tearDown(self):
+        table = ST.openTables.pop(self.path, None)
+        if table is not None:
+            table.close()
+        shutil.rmtree(self.directory)
+
+# 100 loadTable
+#    Happy path
+#        missing file       builds the table, of the expected size
+#        existing file      maps the same table
+#        default path       in the user's cache directory
+#    Sad path
+#        invalid file       raises ValueError
+#        other parameters   raises ValueError
+#        altered contents   raises ValueError
+    def test100_010_ShouldBuildMissingTable(self):
+        table = ST.loadTable(self.path)
+        self.assertTrue(os.path.exists(self.path))
+        self.assertEquals(table.points, ST.points)
+        self.assertEquals(os.path.getsize(self.path), table.valuesOffset + 8 * (ST.highN - ST.lowN) * ST.points)
+        self.assertIs(ST.loadTable(self.path), table)
+
+    def test100_020_ShouldDefaultToCacheDirectory(self):
+        originals = dict((name, os.environ.pop(name, None)) for name in ['SOFTWAREPROCESS_SAMPLE_TABLE',
+                                                                         'XDG_CACHE_HOME'])
+        try:
+            os.environ['XDG_CACHE_HOME'] = self.directory
+            self.assertEquals(ST.configuredPath(), os.path.join(self.directory, 'softwareprocess', ST.tableName))
+            os.environ['SOFTWAREPROCESS_SAMPLE_TABLE'] = self.path
+            self.assertEquals(ST.configuredPath(), self.path)
+        finally:
+            for name, value in originals.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+
+    def test100_910_ShouldRaiseExceptionOnInvalidTable(self):
+        expectedString = "SampleTable.__init__:"
+        with open(self.path, 'wb') as tableFile:
+            tableFile.write('not a table')
+        with self.assertRaises(ValueError) as context:
+            ST.SampleTable(self.path)
+        self.assertEquals(expectedString, context.exception.args[0][0:len(expectedString)])
+
+    def test100_920_ShouldRaiseExceptionOnOtherParameters(self):
+        expectedString = "SampleTable.__init__:"
+        ST.buildTable(self.path)
+        with open(self.path, 'rb') as tableFile:
+            contents = tableFile.read()
+        with open(self.path, 'wb') as tableFile:
+            tableFile.write(contents[:4] + struct.pack('<i', ST.lowN + 1) + contents[8:])
+        with self.assertRaises(ValueError) as context:
+            ST.SampleTable(self.path)
+        self.assertEquals(expectedString, context.exception.args[0][0:len(expectedString)])
+
+    def test100_930_ShouldRaiseExceptionOnAlteredContents(self):
+        expectedString = "SampleTable.__init__:"
+        ST.buildTable(self.path)
+        with open(self.path, 'r+b') as tableFile:
+            tableFile.seek(-8, os.SEEK_END)
+            tableFile.write(struct.pack('<d', 0.5))
+        with self.assertRaises(ValueError) as context:
+            ST.SampleTable(self.path)
+        self.assertEquals(expectedString, context.exception.args[0][0:len(expectedString)])
+
+# 200 area
+#    Happy path
+#        every n, t on and between grid points, within errorBound of the beta engine, and within 4 places of simpson
+#        t beyond the table      returns None
+    def test200_010_ShouldInterpolateWithinBound(self):
+        table = ST.loadTable(self.path)
+        for n in range(2, 30):
+            mySample = SM.Sample(n)
+            constant = 2 * mySample.getConstant()
+            slope = lambda u: constant * mySample.f(u, n)
+            bound = table.errorBound(n)
+            self.assertTrue(bound < 1e-6)
+            for t in [0.0, 0.01, 0.2767, 1.0, 1.8946, 2.8453, 5.8409, 31.99, 32.0]:
+                actual = table.area(n, t, slope)
+                self.assertTrue(abs(actual - mySample.integrateBeta(t, n)) <= bound)
+                if(t > 0.0):
+                    self.assertAlmostEquals(0.5 * actual, mySample.calculateConstant(n) *
+                                            mySample.integrate(0, t, n, mySample.f), 4)
+
+    def test200_020_ShouldReturnNoneBeyondTable(self):
+        table = ST.loadTable(self.path)
+        self.assertIsNone(table.area(7, 32.5, lambda u: 0.0))
+
+# 300 Sample.p with the table engine
+#    Happy path
+#        nominal case, matches the table values
+#        t beyond the table, matches the beta engine
+    def test300_010_ShouldCalculateNominalCase(self):
+        original = os.environ.get('SOFTWAREPROCESS_SAMPLE_TABLE')
+        os.environ['SOFTWAREPROCESS_SAMPLE_TABLE'] = self.path
+        try:
+            mySample = SM.Sample(7)
+            self.assertAlmostEquals(mySample.p(1.8946, 1, 'table'), .950, 3)
+            self.assertAlmostEquals(mySample.p(1.8946, 2, 'table'), .900, 3)
+            self.assertEquals(mySample.p(40.0, 2, 'table'), mySample.p(40.0, 2, 'beta'))
+        finally:
+            if original is None:
+                del os.environ['SOFTWAREPROCESS_SAMPLE_TABLE']
+            else:
+                os.environ['SOFTWAREPROCESS_SAMPLE_TABLE'] = original
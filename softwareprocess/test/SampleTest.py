@@ -10,11 +10,33 @@
 
 import unittest
 import softwareprocess.Sample as SM
+import softwareprocess.SampleTable as ST
 import math
+import os
+import shutil
+import tempfile
 
 
 class SampleTest(unittest.TestCase):
 
+    @classmethod
+    def setUpClass(cls):
+        # The 'table' engine builds its table in a directory of the test's own.
+        cls.directory = tempfile.mkdtemp()
+        cls.originalTablePath = os.environ.get('SOFTWAREPROCESS_SAMPLE_TABLE')
+        os.environ['SOFTWAREPROCESS_SAMPLE_TABLE'] = os.path.join(cls.directory, 'table.bin')
+
+    @classmethod
+    def tearDownClass(cls):
+        table = ST.openTables.pop(os.environ['SOFTWAREPROCESS_SAMPLE_TABLE'], None)
+        if table is not None:
+            table.close()
+        if cls.originalTablePath is None:
+            del os.environ['SOFTWAREPROCESS_SAMPLE_TABLE']
+        else:
+            os.environ['SOFTWAREPROCESS_SAMPLE_TABLE'] = cls.originalTablePath
+        shutil.rmtree(cls.directory)
+
     def nominalF(self, u, n):
         return u * n
 
@@ -370,3 +392,200 @@ class SampleTest(unittest.TestCase):
     def test600_040_ShouldCalculateSimpson8PartitionCase(self):
         mySample = SM.Sample(self.nominalN)
         self.assertAlmostEquals(mySample.calculateSimpson(0, 24, 5, self.nominalF, 8), 1440, 4)
+
+# 700 p with the beta engine
+# Analysis
+#     inputs
+#        engine -> string, one of 'simpson' or 'beta', optional, defaults to 'simpson'
+#     outputs
+#        float .GT. 0 .LE. 1.0, the same as the simpson engine to within its tolerance
+#
+#     Happy path
+#        every n, t from 0.1 to 8.0, 1 and 2 tails, matches simpson
+#        nominal case, matches the table values
+#        boundary case    t = 0.0
+#     Sad path
+#        invalid engine   engine = 'trapezoid'
+
+    def test700_010_ShouldMatchSimpson(self):
+        for n in range(2, 30):
+            mySample = SM.Sample(n)
+            for t in [0.1, 0.2767, 1.0, 1.8946, 2.8453, 5.8409, 8.0]:
+                for tails in [1, 2]:
+                    self.assertAlmostEquals(mySample.p(t, tails, engine='beta'), mySample.p(t, tails), 4)
+
+    def test700_020_ShouldCalculateNominalCase(self):
+        mySample = SM.Sample(7)
+        self.assertAlmostEquals(mySample.p(1.8946, 1, 'beta'), .950, 3)
+        self.assertAlmostEquals(mySample.p(1.8946, 2, 'beta'), .900, 3)
+
+    def test700_030_ShouldCalculateZeroT(self):
+        mySample = SM.Sample(self.nominalN)
+        self.assertEquals(mySample.p(0.0, 1, 'beta'), 0.5)
+        self.assertEquals(mySample.p(0.0, 2, 'beta'), 0.0)
+
+    def test700_910_ShouldRaiseExceptionOnInvalidEngine(self):
+        expectedString = "Sample.p:"
+        mySample = SM.Sample(self.nominalN)
+        with self.assertRaises(ValueError) as context:
+            mySample.p(self.nominalT, engine='trapezoid')
+        self.assertEquals(expectedString, context.exception.args[0][0:len(expectedString)])
+
+# 800 integrateIncremental
+# Analysis
+#     inputs
+#        the same as integrate
+#     outputs
+#        float, the same integral as integrate, with about half of the evaluations of f
+#
+#     Happy path
+#        nominal case      f(u, n) = u * n, 0 to 24
+#        every n, t from 0.1 to 8.0, matches integrate
+#        evaluations       counted for both integrate and integrateIncremental
+#        p                 engine = 'incremental' matches the default engine
+#        large t           t = 31.9 and 32.0 round to at most 1.0, with either engine and either tails
+
+    def test800_010_ShouldIntegrateNominalF(self):
+        mySample = SM.Sample(self.nominalN)
+        self.assertAlmostEquals(mySample.integrateIncremental(0, 24, 5, self.nominalF), 1440, 4)
+
+    def test800_020_ShouldMatchIntegrate(self):
+        for n in range(2, 30):
+            mySample = SM.Sample(n)
+            for t in [0.1, 0.2767, 1.0, 1.8946, 2.8453, 5.8409, 8.0]:
+                self.assertAlmostEquals(mySample.integrateIncremental(0, t, n, mySample.f),
+                                        mySample.integrate(0, t, n, mySample.f), 10)
+
+    def test800_030_ShouldCountFewerEvaluations(self):
+        mySample = SM.Sample(self.nominalN)
+        self.assertEquals(mySample.getEvaluations(), 0)
+        mySample.integrate(0, 24, 5, self.nominalF)
+        simpsonEvaluations = mySample.getEvaluations()
+        # Simpson on 4 then 8 partitions.
+        self.assertEquals(simpsonEvaluations, 5 + 9)
+        mySample.integrateIncremental(0, 24, 5, self.nominalF)
+        self.assertEquals(mySample.getEvaluations() - simpsonEvaluations, 9)
+
+    def test800_040_ShouldCalculatePWithIncrementalEngine(self):
+        mySample = SM.Sample(7)
+        self.assertAlmostEquals(mySample.p(1.8946, 1, 'incremental'), mySample.p(1.8946, 1), 10)
+        self.assertAlmostEquals(mySample.p(1.8946, 2, 'incremental'), mySample.p(1.8946, 2), 10)
+
+    def test800_050_ShouldClampLargeT(self):
+        for n in [21, 23, 24, 25, 26]:
+            mySample = SM.Sample(n)
+            for engine in ['simpson', 'incremental']:
+                for tails in [1, 2]:
+                    for result in [mySample.p(31.9, tails, engine), mySample.p(32.0, tails, engine)] + \
+                            mySample.p_many([31.9, 32.0], tails, engine):
+                        self.assertLessEqual(result, 1.0)
+                        self.assertAlmostEquals(result, 1.0, 10)
+
+# 900 constant caching
+# Analysis
+#     inputs
+#        n -> numeric  mandatory validated
+#     outputs
+#        float, the same constant as calculateConstant
+#
+#     Happy path
+#        getConstant         matches calculateConstant, and is kept by the sample
+#        shared table        every n in [2, 30) is kept in SM.constants
+#        gamma               non-half x, x=1.25, uses math.gamma
+#        gamma               large x, x=29.5, does not recurse
+
+    def test900_010_ShouldCacheConstantPerSample(self):
+        mySample = SM.Sample(5)
+        self.assertAlmostEquals(mySample.getConstant(), 0.37960669, 4)
+        self.assertEquals(mySample.constant, mySample.getConstant())
+
+    def test900_020_ShouldCacheConstantPerN(self):
+        for n in range(2, 30):
+            expected = SM.Sample(n).calculateConstant(n)
+            self.assertEquals(SM.constants[n], expected)
+            self.assertEquals(SM.Sample(n).getConstant(), expected)
+
+    def test900_030_ShouldCalculateGammaOfOtherX(self):
+        mySample = SM.Sample(self.nominalN)
+        self.assertAlmostEquals(mySample.gamma(1.25), math.gamma(1.25), 12)
+
+    def test900_040_ShouldCalculateGammaOfLargeX(self):
+        mySample = SM.Sample(self.nominalN)
+        self.assertAlmostEquals(mySample.gamma(29.5) / math.gamma(29.5), 1.0, 12)
+
+# 1000 p_many
+# Analysis
+#     inputs
+#        ts -> sequence of float .GE. 0.0, mandatory, unvalidated
+#        tails -> integer, 1 or 2, optional, defaults to 1
+#        engine -> string, one of SM.engines, optional, defaults to 'simpson'
+#     outputs
+#        list of float .GE. 0 .LE. 1.0, in the order of ts
+#
+#     Happy path
+#        unsorted ts with duplicates and 0.0, every engine and tails, matches p
+#        empty ts
+#        array-like ts, which compares elementwise as NumPy arrays do
+#     Sad path
+#        missing ts
+#        negative t
+#        non-float t
+#        invalid tails
+
+    def test1000_010_ShouldMatchP(self):
+        ts = [2.8453, 0.2767, 0.0, 1.8946, 0.2767, 5.8409]
+        for n in [2, 7, 29]:
+            mySample = SM.Sample(n)
+            for engine in SM.engines:
+                for tails in [1, 2]:
+                    actual = mySample.p_many(ts, tails, engine)
+                    self.assertEquals(len(actual), len(ts))
+                    for t, result in zip(ts, actual):
+                        if(t > 0.0):
+                            self.assertAlmostEquals(result, mySample.p(t, tails, engine), 4)
+                        else:
+                            self.assertAlmostEquals(result, (2 - tails) * 0.5, 10)
+
+    def test1000_020_ShouldHandleEmptyTs(self):
+        mySample = SM.Sample(self.nominalN)
+        self.assertEquals(mySample.p_many([]), [])
+
+    def test1000_030_ShouldAcceptArrayLikeTs(self):
+        class ArrayLike(list):
+            def __eq__(self, other):
+                return ArrayLike(item == other for item in self)
+
+            def __nonzero__(self):
+                raise ValueError("The truth value of an array with more than one element is ambiguous.")
+
+        mySample = SM.Sample(self.nominalN)
+        self.assertEquals(mySample.p_many(ArrayLike([1.0, 2.0])), mySample.p_many([1.0, 2.0]))
+
+# Sad path
+    def test1000_910_ShouldRaiseExceptionOnMissingTs(self):
+        expectedString = "Sample.p_many:"
+        mySample = SM.Sample(self.nominalN)
+        with self.assertRaises(ValueError) as context:
+            mySample.p_many()
+        self.assertEquals(expectedString, context.exception.args[0][0:len(expectedString)])
+
+    def test1000_920_ShouldRaiseExceptionOnNegativeT(self):
+        expectedString = "Sample.p_many:"
+        mySample = SM.Sample(self.nominalN)
+        with self.assertRaises(ValueError) as context:
+            mySample.p_many([1.0, -1.0])
+        self.assertEquals(expectedString, context.exception.args[0][0:len(expectedString)])
+
+    def test1000_930_ShouldRaiseExceptionOnNonNumericT(self):
+        expectedString = "Sample.p_many:"
+        mySample = SM.Sample(self.nominalN)
+        with self.assertRaises(ValueError) as context:
+            mySample.p_many([1.0, "abc"])
+        self.assertEquals(expectedString, context.exception.args[0][0:len(expectedString)])
+
+    def test1000_940_ShouldRaiseExceptionOnInvalidTails(self):
+        expectedString = "Sample.p_many:"
+        mySample = SM.Sample(self.nominalN)
+        with self.assertRaises(ValueError) as context:
+            mySample.p_many([1.0], tails=3)
+        self.assertEquals(expectedString, context.exception.args[0][0:len(expectedString)])
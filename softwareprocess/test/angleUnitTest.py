@@ -0,0 +1,80 @@
+import unittest
+import datetime
+
+import softwareprocess.operations.adjust as adjust
+import softwareprocess.operations.correct as correct
+import softwareprocess.operations.predict as predict
+from softwareprocess.operations.angle import Angle, Sighting
+
+
+class angleUnitTest(unittest.TestCase):
+
+    # 100 Angle
+    #
+    # HappyPath
+    #   parsed angles reproduce their input string.
+    #   computed angles are formatted, with the sign applying to the whole measurement.
+    #   radians, float and equality use the degrees.
+    # SadPath
+    #   invalid degree string
+    #   angles have no instance dictionary
+    def test_100_010_shouldKeepParsedString(self):
+        angle = Angle.fromDegreeString('-57d09.7', False)
+        self.assertAlmostEqual(angle.degrees, -(57 + 9.7 / 60), 9)
+        self.assertEqual(str(angle), '-57d09.7')
+
+    def test_100_020_shouldFormatComputedAngle(self):
+        self.assertEqual(str(Angle(15.5)), '15d30.0')
+        self.assertEqual(str(Angle(-15.5)), '-15d30.0')
+
+    def test_100_030_shouldConvertDegrees(self):
+        angle = Angle(90.0)
+        self.assertAlmostEqual(angle.radians, 1.5707963267948966, 12)
+        self.assertEqual(float(angle), 90.0)
+        self.assertEqual(angle, Angle(90.0, '90d0.0'))
+        self.assertNotEqual(angle, Angle(45.0))
+
+    # SadPath
+    def test_100_710_shouldRejectInvalidString(self):
+        self.assertRaises(ValueError, Angle.fromDegreeString, '10x5.0')
+
+    def test_100_720_shouldHaveNoInstanceDictionary(self):
+        self.assertRaises(AttributeError, setattr, Angle(1.0), 'minutes', 60)
+
+    # 200 Sighting
+    #
+    # HappyPath
+    #   unset fields are None.
+    #   adjustSighting, predictSighting and correctSighting match adjust, predict and correct.
+    # SadPath
+    #   unknown field
+    def test_200_010_shouldDefaultToNone(self):
+        sighting = Sighting(height=6.0)
+        self.assertEqual(sighting.height, 6.0)
+        self.assertIsNone(sighting.altitude)
+
+    def test_200_020_shouldMatchStringOperations(self):
+        sighting = Sighting(observation=Angle.fromDegreeString('45d15.2'), height=6.0, temperature=72,
+                            pressure=1010, naturalHorizon=True, starId=predict.catalog.starId('sirius'),
+                            date=datetime.date(2017, 4, 14), time=datetime.time(0, 0, 0),
+                            assumedLat=Angle.fromDegreeString('10d0.0', False),
+                            assumedLon=Angle.fromDegreeString('200d0.0', False))
+        adjust.adjustSighting(sighting)
+        predict.predictSighting(sighting)
+        adjusted = adjust.adjust({'observation': '45d15.2', 'height': '6'})
+        predicted = predict.predict({'body': 'Sirius', 'date': '2017-04-14'})
+        self.assertEqual(str(sighting.altitude), adjusted['altitude'])
+        self.assertEqual(str(sighting.lat), predicted['lat'])
+        self.assertEqual(str(sighting.lon), predicted['long'])
+
+        sighting.altitude = Angle.fromDegreeString(adjusted['altitude'])
+        correct.correctSighting(sighting)
+        corrected = correct.correct({'lat': predicted['lat'], 'long': predicted['long'],
+                                     'altitude': adjusted['altitude'], 'assumedLat': '10d0.0',
+                                     'assumedLong': '200d0.0'})
+        self.assertEqual(str(int(sighting.distance)), corrected['correctedDistance'])
+        self.assertEqual(str(sighting.azimuth), corrected['correctedAzimuth'])
+
+    # SadPath
+    def test_200_710_shouldRejectUnknownField(self):
+        self.assertRaises(TypeError, Sighting, body='sirius')
@@ -0,0 +1,84 @@
+import unittest
+import json
+import os
+import shutil
+import StringIO
+import sys
+import tempfile
+
+import softwareprocess.benchmark as benchmark
+
+
+class benchmarkTest(unittest.TestCase):
+
+    # 100 runBenchmarks
+    #   Happy Path
+    #       every benchmark reports throughput, latency percentiles and allocations.
+    #       the synthetic mix is reproducible, and includes invalid requests.
+    #       running a benchmark leaves its inputs unchanged.
+    def test100_010_ShouldReportEveryBenchmark(self):
+        results = benchmark.runBenchmarks(iterations=40, batchSize=10)
+        names = set(results['results'])
+        for name in ['adjust.scalar', 'adjust.batch', 'predict.scalar', 'predict.batch', 'correct.scalar',
+                     'correct.batch', 'convertString2Dictionary.scalar', 'Sample.p.simpson', 'Sample.p_many.simpson']:
+            self.assertIn(name, names)
+        for result in results['results'].values():
+            self.assertGreater(result['throughput'], 0)
+            self.assertLessEqual(result['latency']['p50'], result['latency']['max'])
+            self.assertIn('allocations', result)
+
+    def test100_020_ShouldGenerateReproducibleMix(self):
+        first = benchmark.benchmarks(50, 10, 7)
+        second = benchmark.benchmarks(50, 10, 7)
+        adjustRequests = first[0][2]
+        self.assertEqual(adjustRequests, second[0][2])
+        self.assertTrue(any('invalid' in request.values() for request in adjustRequests))
+
+    def test100_030_ShouldNotChangeInputs(self):
+        name, function, arguments, operationsPerCall = benchmark.benchmarks(20, 10, 7)[0]
+        before = [dict(request) for request in arguments]
+        benchmark.runCalls(function, benchmark.freshCopy(arguments))
+        self.assertEqual(arguments, before)
+
+    # 200 compareResults
+    #   Happy Path
+    #       throughput within tolerance is not a regression.
+    #   Sad Path
+    #       throughput below tolerance is a regression.
+    #       main exits with 1 on a regression.
+    def test200_010_ShouldAcceptWithinTolerance(self):
+        baseline = {'results': {'a': {'throughput': 100.0}, 'b': {'throughput': 100.0}}}
+        current = {'results': {'a': {'throughput': 85.0}, 'c': {'throughput': 1.0}}}
+        self.assertEqual(benchmark.compareResults(current, baseline, 0.2), [])
+
+    # Sad Path
+    def test200_910_ShouldReportRegression(self):
+        baseline = {'results': {'a': {'throughput': 100.0}}}
+        current = {'results': {'a': {'throughput': 70.0}}}
+        self.assertEqual(benchmark.compareResults(current, baseline, 0.2), [('a', 100.0, 70.0)])
+
+    def test200_920_ShouldExitOnRegression(self):
+        directory = tempfile.mkdtemp()
+        try:
+            baselinePath = os.path.join(directory, 'baseline.json')
+            results = benchmark.runBenchmarks(iterations=20, batchSize=10)
+            for result in results['results'].values():
+                result['throughput'] *= 1000
+            with open(baselinePath, 'w') as baselineFile:
+                json.dump(results, baselineFile)
+            outputPath = os.path.join(directory, 'output.json')
+            originalStdout = sys.stdout
+            sys.stdout = StringIO.StringIO()
+            try:
+                status = benchmark.main(['--iterations', '20', '--batch-size', '10', '--output', outputPath,
+                                         '--baseline', baselinePath])
+                printed = sys.stdout.getvalue()
+            finally:
+                sys.stdout = originalStdout
+            self.assertEqual(status, 1)
+            self.assertIn('adjust.scalar', printed)
+            self.assertIn('REGRESSION adjust.scalar:', printed)
+            with open(outputPath, 'r') as outputFile:
+                self.assertIn('adjust.scalar', json.load(outputFile)['results'])
+        finally:
+            shutil.rmtree(directory)
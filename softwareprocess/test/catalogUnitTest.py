@@ -0,0 +1,111 @@
+import unittest
+import json
+import os
+import shutil
+import tempfile
+
+import softwareprocess.operations.catalog as catalog
+import softwareprocess.operations.predict as predict
+
+
+class catalogUnitTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def writeFile(self, name, contents):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w') as catalogFile:
+            catalogFile.write(contents)
+        return path
+
+    # 010 StarCatalog
+    #
+    # HappyPath
+    #   built from star_data, with preparsed columns indexed by star id.
+    #   case-insensitive lookup.
+    # SadPath
+    #   unknown star
+    #   modifying the catalog
+    #   duplicate or invalid entries
+    def test_010_010_shouldPreparseStarData(self):
+        starCatalog = catalog.StarCatalog.fromDict(predict.star_data)
+        self.assertEqual(len(starCatalog), len(predict.star_data))
+        starId = starCatalog.starId('BeTeLGeUsE')
+        self.assertEqual(starCatalog.names[starId], 'betelgeuse')
+        self.assertEqual(starCatalog.entry(starId), {'sha': '270d59.1', 'declination': '7d24.3'})
+        self.assertAlmostEqual(starCatalog.shaDegrees[starId], 270.985, 5)
+        self.assertAlmostEqual(starCatalog.declinationDegrees[starId], 7.405, 5)
+        self.assertAlmostEqual(starCatalog.declinationRadians[starId], 0.129242, 5)
+        self.assertTrue('Betelgeuse' in starCatalog)
+
+    def test_010_710_shouldHandleUnknownStar(self):
+        starCatalog = catalog.StarCatalog.fromDict(predict.star_data)
+        self.assertIsNone(starCatalog.starId('unknown'))
+        self.assertFalse(7 in starCatalog)
+
+    def test_010_720_shouldBeImmutable(self):
+        starCatalog = catalog.StarCatalog([('vega', '80d38.2', '38d48.1')])
+        with self.assertRaises(AttributeError):
+            starCatalog.names = ()
+        with self.assertRaises(TypeError):
+            starCatalog.shaDegrees[0] = 0.0
+
+    def test_010_730_shouldRejectInvalidEntries(self):
+        with self.assertRaises(ValueError):
+            catalog.StarCatalog([('vega', '80d38.2', '38d48.1'), ('VEGA', '80d38.2', '38d48.1')])
+        with self.assertRaises(ValueError):
+            catalog.StarCatalog([('vega', '80.5', '38d48.1')])
+
+    # 020 loadCatalog
+    #
+    # HappyPath
+    #   csv catalog
+    #   json object catalog
+    #   json list catalog
+    # SadPath
+    #   unknown extension
+    #   missing column
+    def test_020_010_shouldLoadCsv(self):
+        path = self.writeFile('stars.csv', 'name,sha,declination\nVega,80d38.2,38d48.1\nnewstar,1d0.0,-2d30.0\n')
+        starCatalog = catalog.loadCatalog(path)
+        self.assertEqual(starCatalog.names, ('vega', 'newstar'))
+        self.assertAlmostEqual(starCatalog.declinationDegrees[1], -2.5, 5)
+
+    def test_020_020_shouldLoadJsonObject(self):
+        path = self.writeFile('stars.json', json.dumps(predict.star_data))
+        starCatalog = catalog.loadCatalog(path)
+        self.assertEqual(starCatalog.shaStrings, predict.catalog.shaStrings)
+
+    def test_020_030_shouldLoadJsonList(self):
+        path = self.writeFile('stars.json', json.dumps([{'name': 'vega', 'sha': '80d38.2', 'declination': '38d48.1'}]))
+        starCatalog = catalog.loadCatalog(path)
+        self.assertEqual(starCatalog.entry(0), {'sha': '80d38.2', 'declination': '38d48.1'})
+
+    def test_020_910_shouldRejectUnknownFormat(self):
+        path = self.writeFile('stars.txt', '')
+        with self.assertRaises(ValueError):
+            catalog.loadCatalog(path)
+
+    def test_020_920_shouldRejectMissingColumn(self):
+        path = self.writeFile('stars.csv', 'name,sha\nvega,80d38.2\n')
+        with self.assertRaises(ValueError):
+            catalog.loadCatalog(path)
+
+    # 030 setCatalog
+    #
+    # HappyPath
+    #   predict uses a replaced catalog.
+    def test_030_010_shouldPredictFromReplacedCatalog(self):
+        previous = predict.setCatalog(catalog.StarCatalog([('newstar', '270d59.1', '7d24.3')]))
+        try:
+            actual = predict.predict({'body': 'NewStar', 'date': '2016-01-17', 'time': '03:15:42'})
+            self.assertEqual(actual['long'], '75d53.6')
+            self.assertEqual(actual['lat'], '7d24.3')
+            actual = predict.predict({'body': 'Betelgeuse'})
+            self.assertEqual(actual['error'], 'star not in catalog')
+        finally:
+            predict.setCatalog(previous)
@@ -0,0 +1,155 @@
+import unittest
+import threading
+
+import softwareprocess.coalescer as coalescer
+import softwareprocess.dispatch as dispatch
+import softwareprocess.resultCache as resultCache
+
+
+class RecordingEngine(object):
+    """
+    RecordingEngine records the size of every batch it is given, and can be held back until released.
+    """
+
+    def __init__(self):
+        self.sizes = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def dispatch_batch(self, valuesList):
+        self.release.wait()
+        self.sizes.append(len(valuesList))
+        for values in valuesList:
+            if isinstance(values, dict) and 'raise' in values:
+                raise ValueError('math domain error')
+        return dispatch.dispatch_batch(valuesList)
+
+
+class coalescerTest(unittest.TestCase):
+
+    def dispatchConcurrently(self, instance, requests):
+        results = [None] * len(requests)
+
+        def run(index):
+            results[index] = instance.dispatch(requests[index])
+
+        threads = [threading.Thread(target=run, args=(index,)) for index in range(len(requests))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    # 100 dispatch
+    #   Happy Path
+    #       a single request matches dispatch.
+    #       concurrent requests are batched, and each caller gets its own response.
+    #       batches hold at most maxBatch requests.
+    #       requests wait for no one when maxDelay is 0.
+    #       works in front of a ResultCache.
+    #   Sad Path
+    #       an engine that raises on every batch raises in the caller.
+    #       a request raising in a batch fails only its own caller.
+    def test100_010_ShouldMatchDispatch(self):
+        with coalescer.Coalescer() as instance:
+            for request in [{'op': 'adjust', 'observation': '42d0.0'}, {'op': 'unknown'}, None]:
+                expected = dispatch.dispatch(dict(request) if request is not None else None)
+                self.assertEqual(instance.dispatch(request), expected)
+
+    def test100_020_ShouldBatchConcurrentRequests(self):
+        engine = RecordingEngine()
+        requests = [{'op': 'adjust', 'observation': '%dd0.0' % degrees} for degrees in range(10, 30)]
+        expected = dispatch.dispatch_batch([dict(request) for request in requests])
+        with coalescer.Coalescer(engine, maxDelay=1.0, maxBatch=len(requests)) as instance:
+            self.assertEqual(self.dispatchConcurrently(instance, requests), expected)
+        self.assertEqual(engine.sizes, [len(requests)])
+        self.assertEqual(instance.stats(), {'batches': 1, 'requests': 20, 'meanBatchSize': 20.0})
+
+    def test100_030_ShouldLimitBatchSize(self):
+        engine = RecordingEngine()
+        engine.release.clear()
+        requests = [{'op': 'adjust', 'observation': '42d0.0'} for _ in range(7)]
+        with coalescer.Coalescer(engine, maxDelay=0.05, maxBatch=3) as instance:
+            threading.Timer(0.1, engine.release.set).start()
+            self.dispatchConcurrently(instance, requests)
+        self.assertEqual(sum(engine.sizes), 7)
+        self.assertLessEqual(max(engine.sizes), 3)
+
+    def test100_040_ShouldNotWaitWithoutDelay(self):
+        engine = RecordingEngine()
+        with coalescer.Coalescer(engine, maxDelay=0) as instance:
+            instance.dispatch({'op': 'adjust', 'observation': '42d0.0'})
+            instance.dispatch({'op': 'adjust', 'observation': '42d0.0'})
+        self.assertEqual(engine.sizes, [1, 1])
+
+    def test100_050_ShouldWrapResultCache(self):
+        cache = resultCache.ResultCache()
+        with coalescer.Coalescer(cache) as instance:
+            instance.dispatch({'op': 'adjust', 'observation': '42d0.0'})
+            self.assertEqual(instance.dispatch({'op': 'adjust', 'observation': '42d0.0'})['altitude'], '41d59.0')
+        self.assertEqual(cache.stats()['hits'], 1)
+
+    def test100_910_ShouldRaiseEngineErrors(self):
+        class BrokenEngine(object):
+            def dispatch_batch(self, valuesList):
+                raise RuntimeError('broken')
+
+        with coalescer.Coalescer(BrokenEngine()) as instance:
+            self.assertRaises(RuntimeError, instance.dispatch, {'op': 'adjust'})
+
+    def test100_920_ShouldIsolateRaisingRequests(self):
+        poisoned = {'op': 'adjust', 'observation': '42d0.0', 'raise': '1'}
+        good = [{'op': 'adjust', 'observation': '%dd0.0' % degrees} for degrees in range(10, 13)]
+        requests = [good[0], poisoned, good[1], good[2]]
+        expected = dispatch.dispatch_batch([dict(request) for request in good])
+        engine = RecordingEngine()
+        outcomes = [None] * len(requests)
+
+        def run(index):
+            try:
+                outcomes[index] = instance.dispatch(requests[index])
+            except ValueError as error:
+                outcomes[index] = error
+
+        with coalescer.Coalescer(engine, maxDelay=1.0, maxBatch=len(requests)) as instance:
+            threads = [threading.Thread(target=run, args=(index,)) for index in range(len(requests))]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(engine.sizes[0], len(requests))
+        self.assertIsInstance(outcomes[1], ValueError)
+        self.assertEqual([outcomes[0], outcomes[2], outcomes[3]], expected)
+        self.assertIs(outcomes[0], requests[0])
+
+    # 200 close
+    #   Happy Path
+    #       stops the batching thread, which is restarted on next use.
+    #   Sad Path
+    #       invalid maxDelay and maxBatch.
+    def test200_010_ShouldRestartAfterClose(self):
+        instance = coalescer.Coalescer()
+        instance.dispatch({'op': 'adjust', 'observation': '42d0.0'})
+        thread = instance.thread
+        instance.close()
+        self.assertFalse(thread.is_alive())
+        self.assertIsNone(instance.thread)
+        self.assertEqual(instance.dispatch({'op': 'adjust', 'observation': '42d0.0'})['altitude'], '41d59.0')
+        instance.close()
+
+    def test200_910_ShouldRejectInvalidSettings(self):
+        self.assertRaises(ValueError, coalescer.Coalescer, dispatch, -1)
+        self.assertRaises(ValueError, coalescer.Coalescer, dispatch, 'fast')
+        self.assertRaises(ValueError, coalescer.Coalescer, dispatch, 0.001, 0)
+
+    # 300 dispatch_batch
+    #   Happy Path
+    #       batches pass straight to the engine.
+    def test300_010_ShouldPassBatchesThrough(self):
+        engine = RecordingEngine()
+        instance = coalescer.Coalescer(engine)
+        requests = [{'op': 'adjust', 'observation': '42d0.0'}, {'op': 'unknown'}]
+        expected = dispatch.dispatch_batch([dict(request) for request in requests])
+        self.assertEqual(instance.dispatch_batch(requests), expected)
+        self.assertEqual(engine.sizes, [2])
+        self.assertIsNone(instance.thread)
@@ -358,3 +358,57 @@ class correctUnitTest(unittest.TestCase):
         inAssumedLon = util.degreeStringToDegrees('74d35.3', False)
         actual = correct.calculateCorrectedAzimuth(inLat, inAssumedLat, inLon, inAssumedLon)
         self.assertEqual(expected, actual)
+
+    # 100 correct_many
+    #
+    # HappyPath
+    #   columns of valid measurements match correct per row.
+    # SadPath
+    #   invalid and missing measurements produce the same error messages as extractMeasurement.
+    #   a row whose correction cannot be calculated is reported without affecting the others.
+    def test_100_010_shouldCorrectManyMatchingScalar(self):
+        rows = [
+            ('16d32.3', '95d41.6', '13d42.3', '-53d38.4', '74d35.3'),
+            ('-20d15.5', '0d0.0', '45d0.0', '30d10.1', '359d59.9'),
+            ('45d0.0', '180d0.0', '0d0.1', '10d0.0', '90d0.0'),
+        ]
+        distances, azimuths, errors = correct.correct_many(*zip(*rows))
+        self.assertEqual(errors, [None, None, None])
+        for row, distance, azimuth in zip(rows, distances, azimuths):
+            expected = correct.correct(dict(zip(correct.measurementNames, row)))
+            self.assertEqual(str(int(distance)), expected['correctedDistance'])
+            self.assertEqual(util.degreesToDegreeString(azimuth), expected['correctedAzimuth'])
+
+    def test_100_910_shouldReportErrorsPerRow(self):
+        rows = [
+            ('90d0.0', '95d41.6', '13d42.3', '-53d38.4', '74d35.3'),
+            ('16d32.3', 95, '13d42.3', '-53d38.4', '74d35.3'),
+            ('16d32.3', '95d41.6', correct.missingValue, '-53d38.4', '74d35.3'),
+            ('16d32.3', '95d41.6', '13d42.3', '-53d38.4', '74d35.3'),
+            ('16d32.3', '95d41.6', '13d42.3', '-53d38.4', '360d0.0'),
+        ]
+        distances, azimuths, errors = correct.correct_many(*zip(*rows))
+        self.assertEqual(errors, ['lat is invalid', 'long is invalid', 'missing mandatory field altitude',
+                                  None, 'assumedLong is invalid'])
+        self.assertEqual(distances[3], 3950)
+        self.assertEqual(util.degreesToDegreeString(azimuths[3]), '164d42.9')
+        self.assertEqual([distances[index] for index in (0, 1, 2, 4)], [None] * 4)
+
+    def test_100_930_shouldReportUndefinedCorrection(self):
+        rows = [
+            ('16d32.3', '95d41.6', '13d42.3', '-53d38.4', '74d35.3'),
+            ('8d0.0', '0d0.0', '13d42.3', '8d0.0', '0d0.0'),
+            ('16d32.3', '95d41.6', '13d42.3', '-53d38.4', '74d35.3'),
+        ]
+        distances, azimuths, errors = correct.correct_many(*zip(*rows))
+        self.assertEqual(errors, [None, correct.undefinedError, None])
+        self.assertEqual(distances, [3950, None, 3950])
+
+    def test_100_920_shouldBatchLikeCorrect(self):
+        sightings = [
+            {'lat': '16d32.3', 'long': '95d41.6', 'altitude': '13d42.3', 'assumedLat': '-53d38.4',
+             'assumedLong': '74d35.3'},
+            {'long': '95d41.6'},
+        ]
+        expected = [correct.correct(dict(sighting)) for sighting in sightings]
+        self.assertEqual(correct.correctBatch(sightings), expected)
@@ -0,0 +1,103 @@
+import unittest
+
+import softwareprocess.dispatch as dispatch
+import softwareprocess.operations.correct as correct
+
+
+class dispatchTest(unittest.TestCase):
+
+    def tearDown(self):
+        dispatch.unregister('echo')
+
+    # 100 register
+    #   Happy Path
+    #       a registered op is dispatched, singly and in batches.
+    #       a batched implementation is used by dispatch_batch.
+    #       a registered op replaces a built-in one, and can be removed.
+    #   Sad Path
+    #       op is not a string
+    #       implementation is not callable
+    #       missing scalar implementation
+    #       requests raising in dispatch_batch are answered with failedError, without affecting the others.
+    def test100_010_ShouldDispatchRegisteredOp(self):
+        dispatch.register('echo', lambda values: dict(values, echoed='true'))
+        self.assertEqual(dispatch.dispatch({'op': 'echo'}), {'op': 'echo', 'echoed': 'true'})
+        self.assertEqual(dispatch.dispatch_batch([{'op': 'echo'}, {'op': 'unknown'}]),
+                         [{'op': 'echo', 'echoed': 'true'}, {'op': 'unknown', 'error': 'op is not a legal operation'}])
+
+    def test100_020_ShouldUseBatchImplementation(self):
+        calls = []
+
+        def echoBatch(valuesList):
+            calls.append(len(valuesList))
+            return [dict(values, echoed='batch') for values in valuesList]
+        dispatch.register('echo', lambda values: dict(values, echoed='true'), echoBatch)
+        self.assertEqual(dispatch.dispatch_batch([{'op': 'echo'}, {'op': 'echo', 'n': '1'}]),
+                         [{'op': 'echo', 'echoed': 'batch'}, {'op': 'echo', 'n': '1', 'echoed': 'batch'}])
+        self.assertEqual(calls, [2])
+
+    def test100_030_ShouldReplaceAndRemoveOp(self):
+        dispatch.register('echo', 'correct', module='operations.correct')
+        self.assertIs(dispatch.implementation('echo'), correct.correct)
+        self.assertTrue(dispatch.unregister('echo'))
+        self.assertFalse(dispatch.unregister('echo'))
+        self.assertEqual(dispatch.dispatch({'op': 'echo'}), {'op': 'echo', 'error': 'op is not a legal operation'})
+
+    # Sad Path
+    def test100_910_ShouldRejectNonStringOp(self):
+        self.assertRaises(ValueError, dispatch.register, 7, lambda values: values)
+
+    def test100_920_ShouldRejectNonCallableImplementation(self):
+        self.assertRaises(ValueError, dispatch.register, 'echo', 'echo')
+        self.assertRaises(ValueError, dispatch.register, 'echo', lambda values: values, module='operations.correct')
+
+    def test100_930_ShouldRejectMissingScalar(self):
+        self.assertRaises(ValueError, dispatch.register, 'echo', None)
+
+    def test100_940_ShouldIsolateRaisingRequests(self):
+        def echo(values):
+            if 'raise' in values:
+                raise ValueError('math domain error')
+            values['echoed'] = 'true'
+            return values
+
+        def echoBatch(valuesList):
+            for values in valuesList:
+                values['partial'] = 'true'
+            return [echo(values) for values in valuesList]
+
+        for batch in [None, echoBatch]:
+            dispatch.register('echo', echo, batch)
+            requests = [{'op': 'echo'}, {'op': 'echo', 'raise': '1'}, {'op': 'adjust', 'observation': '42d0.0'},
+                        {'op': 'correct', 'lat': '8d0.0', 'long': '0d0.0', 'altitude': '13d42.3',
+                         'assumedLat': '8d0.0', 'assumedLong': '0d0.0'}]
+            results = dispatch.dispatch_batch(requests)
+            self.assertEqual(results[0], {'op': 'echo', 'echoed': 'true'})
+            self.assertEqual(results[1], {'op': 'echo', 'raise': '1', 'error': dispatch.failedError})
+            self.assertEqual(results[2]['altitude'], '41d59.0')
+            self.assertEqual(results[3]['error'], correct.undefinedError)
+            for request, result in zip(requests, results):
+                self.assertIs(result, request)
+
+    # 200 implementation
+    #   Happy Path
+    #       built-in ops resolve to their module's functions, including vectorized implementations.
+    #       module names are resolved lazily.
+    #   Sad Path
+    #       unknown op, unhashable op, or missing implementation
+    def test200_010_ShouldResolveBuiltInOps(self):
+        self.assertIs(dispatch.implementation('correct'), correct.correct)
+        self.assertIs(dispatch.implementation('correct', 'batch'), correct.correctBatch)
+        self.assertIs(dispatch.implementation('correct', 'vector'), correct.correct_many)
+
+    def test200_020_ShouldResolveLazily(self):
+        dispatch.register('echo', 'missingFunction', module='operations.correct')
+        self.assertRaises(AttributeError, dispatch.implementation, 'echo')
+
+    # Sad Path
+    def test200_910_ShouldHandleUnknownOps(self):
+        self.assertIsNone(dispatch.implementation('unknown'))
+        self.assertIsNone(dispatch.implementation(['adjust']))
+        self.assertIsNone(dispatch.implementation('locate', 'batch'))
+        self.assertEqual(dispatch.dispatch({'op': ['adjust']}),
+                         {'op': ['adjust'], 'error': 'op is not a legal operation'})
@@ -0,0 +1,119 @@
+import unittest
+
+import softwareprocess.dispatch as dispatch
+import softwareprocess.lambda_function as lambda_function
+import softwareprocess.operations.instrumentation as instrumentation
+
+
+class instrumentationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.wasEnabled = instrumentation.enabled
+        instrumentation.reset()
+        instrumentation.enable()
+
+    def tearDown(self):
+        instrumentation.enabled = self.wasEnabled
+        instrumentation.reset()
+
+    # 100 dispatch
+    #   Happy Path
+    #       every stage of an op is timed, along with its total.
+    #       batches are timed, and their errors counted.
+    #       the querystring parse of lambda_handler is timed.
+    #       nothing is collected while disabled.
+    #   Sad Path
+    #       errors are counted by op and message, and illegal ops under 'unknown'.
+    #       errors a request arrives with are not counted, alone or in a batch.
+    #       requests of a batch that raises are counted once.
+    def test100_010_ShouldTimeStages(self):
+        dispatch.dispatch({'op': 'adjust', 'observation': '42d0.0'})
+        histograms = instrumentation.snapshot()['histograms']
+        self.assertEqual(sorted(histograms['adjust']), ['calculate', 'format', 'total', 'validate'])
+        for stage in histograms['adjust'].values():
+            self.assertEqual(stage['count'], 1)
+            self.assertEqual(stage['buckets'][-1], [None, 1])
+            self.assertGreaterEqual(stage['sum'], 0.0)
+
+    def test100_020_ShouldTimeBatches(self):
+        dispatch.dispatch_batch([{'op': 'predict', 'body': 'Sirius'}, {'op': 'predict', 'body': 'unknown'}])
+        numbers = instrumentation.snapshot()
+        self.assertEqual(numbers['histograms']['predict']['batch']['count'], 1)
+        self.assertEqual(numbers['errors'], {'predict': {'star not in catalog': 1}})
+
+    def test100_030_ShouldTimeQuerystringParse(self):
+        lambda_function.lambda_handler({'querystring': '{op=correct}'}, None)
+        numbers = instrumentation.snapshot()
+        self.assertEqual(numbers['histograms']['querystring']['parse']['count'], 1)
+        self.assertEqual(numbers['errors'], {'correct': {'missing mandatory field lat': 1}})
+
+    def test100_040_ShouldCollectNothingWhileDisabled(self):
+        instrumentation.disable()
+        dispatch.dispatch({'op': 'locate'})
+        dispatch.dispatch_batch([{'op': 'adjust'}])
+        self.assertEqual(instrumentation.snapshot(), {'histograms': {}, 'errors': {}})
+
+    # Sad Path
+    def test100_910_ShouldCountErrors(self):
+        dispatch.dispatch({'op': 'adjust'})
+        dispatch.dispatch({'op': 'adjust'})
+        dispatch.dispatch({'op': 'unknown'})
+        self.assertEqual(instrumentation.snapshot()['errors'],
+                         {'adjust': {'mandatory information is missing': 2},
+                          'unknown': {'op is not a legal operation': 1}})
+
+    def test100_920_ShouldNotCountErrorsOfRequests(self):
+        dispatch.dispatch({'op': 'adjust', 'observation': '42d0.0', 'error': 'caf\xc3\xa9'})
+        dispatch.dispatch_batch([{'op': 'predict', 'body': 'Sirius', 'error': 'caf\xe9'},
+                                 {'op': 'predict', 'body': 'unknown', 'error': 'x'}])
+        self.assertEqual(instrumentation.snapshot()['errors'], {'predict': {'star not in catalog': 1}})
+
+    def test100_930_ShouldCountRaisingBatchOnce(self):
+        def raisingBatch(valuesList):
+            raise ValueError('math domain error')
+
+        dispatch.register('raising', lambda values: dict(values, error='scalar error'), raisingBatch)
+        try:
+            dispatch.dispatch_batch([{'op': 'raising'}, {'op': 'raising'}])
+        finally:
+            dispatch.unregister('raising')
+        self.assertEqual(instrumentation.snapshot()['errors'], {'raising': {'scalar error': 2}})
+
+    # 200 snapshot, reset and output
+    #   Happy Path
+    #       bucket counts are cumulative.
+    #       reset discards everything.
+    #       JSON and Prometheus text.
+    #       byte string labels that are not UTF-8.
+    def test200_010_ShouldAccumulateBuckets(self):
+        instrumentation.record('op', 'stage', 0.0)
+        instrumentation.record('op', 'stage', 3e-6)
+        instrumentation.record('op', 'stage', 10.0)
+        buckets = instrumentation.snapshot()['histograms']['op']['stage']['buckets']
+        self.assertEqual(buckets[0], [1e-6, 1])
+        self.assertEqual(buckets[2], [5e-6, 2])
+        self.assertEqual(buckets[-2], [1.0, 2])
+        self.assertEqual(buckets[-1], [None, 3])
+
+    def test200_020_ShouldReset(self):
+        instrumentation.record('op', 'stage', 1.0)
+        instrumentation.countError('op', 'error')
+        instrumentation.reset()
+        self.assertEqual(instrumentation.snapshot(), {'histograms': {}, 'errors': {}})
+
+    def test200_030_ShouldFormatOutput(self):
+        instrumentation.record('op', 'stage', 0.5)
+        instrumentation.countError('op', 'a "quoted" error')
+        self.assertIn('"op": {"stage": {"buckets": [[1e-06, 0]', instrumentation.toJson())
+        text = instrumentation.toPrometheus()
+        self.assertIn('softwareprocess_stage_seconds_bucket{op="op",stage="stage",le="0.5"} 1\n', text)
+        self.assertIn('softwareprocess_stage_seconds_bucket{op="op",stage="stage",le="+Inf"} 1\n', text)
+        self.assertIn('softwareprocess_stage_seconds_count{op="op",stage="stage"} 1\n', text)
+        self.assertIn('softwareprocess_errors_total{op="op",error="a \\"quoted\\" error"} 1\n', text)
+
+    def test200_040_ShouldFormatByteStringLabels(self):
+        instrumentation.countError('op', 'caf\xe9')
+        instrumentation.countError('op', 'caf\xc3\xa9')
+        text = instrumentation.toPrometheus()
+        self.assertIn(u'softwareprocess_errors_total{op="op",error="caf\ufffd"} 1\n', text)
+        self.assertIn(u'softwareprocess_errors_total{op="op",error="caf\xe9"} 1\n', text)
@@ -0,0 +1,30 @@
+import unittest
+
+import softwareprocess.lambda_function as lambda_function
+
+
+class lambdaFunctionTest(unittest.TestCase):
+
+    # 100 lambda_handler
+    #   Happy Path
+    #       querystring with an op is dispatched.
+    #   Sad Path
+    #       event without a querystring.
+    def test100_010_ShouldDispatchQuerystring(self):
+        event = {'querystring': '{op=adjust, observation=42d0.0}'}
+        expected = {'op': 'adjust', 'observation': '42d0.0', 'altitude': '41d59.0'}
+        self.assertEqual(lambda_function.lambda_handler(event, None), expected)
+
+    def test100_910_ShouldHandleMissingQuerystring(self):
+        self.assertEqual(lambda_function.lambda_handler({}, None), u"None\n")
+
+    # 200 getMetrics
+    #   Happy Path
+    #       cold start time is recorded once, invocations are counted.
+    def test200_010_ShouldReportMetrics(self):
+        before = lambda_function.getMetrics()
+        lambda_function.lambda_handler({}, None)
+        after = lambda_function.getMetrics()
+        self.assertGreaterEqual(after['coldStartSeconds'], 0.0)
+        self.assertEqual(after['coldStartSeconds'], before['coldStartSeconds'])
+        self.assertEqual(after['invocations'], before['invocations'] + 1)
@@ -0,0 +1,104 @@
+import unittest
+import copy
+import math
+
+import softwareprocess.operations.correct as correct
+import softwareprocess.operations.locate as locate
+import softwareprocess.operations.util as util
+
+
+class locateUnitTest(unittest.TestCase):
+
+    # 100 solveLinesOfPosition
+    #
+    # HappyPath
+    #   two perpendicular lines of position cross at their intercepts.
+    #   many consistent lines of position have zero precision.
+    #   parallel lines of position use the smallest offset.
+    def test_100_010_shouldSolvePerpendicularLines(self):
+        north, east, precision = locate.solveLinesOfPosition([10, 20], [0.0, 90.0])
+        self.assertAlmostEqual(north, 10.0, 9)
+        self.assertAlmostEqual(east, 20.0, 9)
+        self.assertAlmostEqual(precision, 0.0, 6)
+
+    def test_100_020_shouldSolveManyConsistentLines(self):
+        north, east = -12.0, 7.5
+        azimuths = [index * 360.0 / 500 for index in range(500)]
+        distances = [north * math.cos(math.radians(azimuth)) + east * math.sin(math.radians(azimuth))
+                     for azimuth in azimuths]
+        actualNorth, actualEast, precision = locate.solveLinesOfPosition(distances, azimuths)
+        self.assertAlmostEqual(actualNorth, north, 9)
+        self.assertAlmostEqual(actualEast, east, 9)
+        self.assertAlmostEqual(precision, 0.0, 5)
+
+    def test_100_030_shouldHandleParallelLines(self):
+        north, east, precision = locate.solveLinesOfPosition([10, -4], [90.0, 270.0])
+        self.assertAlmostEqual(north, 0.0, 9)
+        self.assertAlmostEqual(east, 7.0, 9)
+        self.assertAlmostEqual(precision, 3.0, 9)
+
+    # 200 locate
+    #
+    # HappyPath
+    #   corrected sightings produce a fix.
+    #   sightings around the assumed position of a fix computed by correct lead back to it.
+    # SadPath
+    #   missing assumed position, missing or invalid sightings.
+    def test_200_010_shouldLocate(self):
+        test_input = {
+            'op': 'locate',
+            'assumedLat': '-53d38.4',
+            'assumedLong': '74d35.3',
+            'sightings': [
+                {'correctedDistance': '60', 'correctedAzimuth': '0d0.0'},
+                {'correctedDistance': '-30', 'correctedAzimuth': '90d0.0'},
+            ]
+        }
+        expected = copy.deepcopy(test_input)
+        expected['presentLat'] = '-52d38.4'
+        expected['presentLong'] = util.degreesToDegreeString(
+            util.degreeStringToDegrees('74d35.3', False) - 0.5 / math.cos(math.radians(-53.64)))
+        expected['precision'] = '0'
+        actual = locate.locate(test_input)
+        self.assertEqual(actual, expected)
+
+    def test_200_020_shouldLocateFromCorrectedSightings(self):
+        assumedLat, assumedLong = '-53d38.4', '74d35.3'
+        trueLat, trueLong = -53.64 + 10 / 60.0, 74.588 + 15 / 60.0
+        sightings = []
+        # correct reports azimuths in [0, 180], so every star is chosen to the east of the observer.
+        for starLat, starLong in [(-60.0, 280.0), (-20.0, 250.0), (10.0, 230.0), (-30.0, 200.0), (-75.0, 190.0)]:
+            intermediate = math.sin(math.radians(starLat)) * math.sin(math.radians(trueLat)) + \
+                math.cos(math.radians(starLat)) * math.cos(math.radians(trueLat)) * \
+                math.cos(math.radians(starLong + trueLong))
+            altitude = util.degreesToDegreeString(math.degrees(math.asin(intermediate)))
+            sightings.append(correct.correct({
+                'lat': util.degreesToSignedDegreeString(starLat), 'long': util.degreesToDegreeString(starLong),
+                'altitude': altitude, 'assumedLat': assumedLat, 'assumedLong': assumedLong}))
+        actual = locate.locate({'assumedLat': assumedLat, 'assumedLong': assumedLong, 'sightings': sightings})
+        self.assertNotIn('error', actual)
+        self.assertAlmostEqual(util.degreeStringToDegrees(actual['presentLat'], False), trueLat, 1)
+        self.assertAlmostEqual(util.degreeStringToDegrees(actual['presentLong'], False), trueLong, 1)
+
+    # Sad Path
+    def test_200_910_shouldHandleInvalidInput(self):
+        sightings = [{'correctedDistance': '60', 'correctedAzimuth': '0d0.0'}]
+        cases = [
+            ({}, 'missing mandatory field assumedLat'),
+            ({'assumedLat': '-90d0.0'}, 'assumedLat is invalid'),
+            ({'assumedLat': '10d0.0'}, 'missing mandatory field assumedLong'),
+            ({'assumedLat': '10d0.0', 'assumedLong': '10d0.0'}, 'missing mandatory field sightings'),
+            ({'assumedLat': '10d0.0', 'assumedLong': '10d0.0', 'sightings': []}, 'sightings is invalid'),
+            ({'assumedLat': '10d0.0', 'assumedLong': '10d0.0', 'sightings': ['a']}, 'sightings is invalid'),
+            ({'assumedLat': '10d0.0', 'assumedLong': '10d0.0', 'sightings': [{'correctedAzimuth': '0d0.0'}]},
+             'missing mandatory field correctedDistance'),
+            ({'assumedLat': '10d0.0', 'assumedLong': '10d0.0',
+              'sightings': sightings + [{'correctedDistance': '1.5', 'correctedAzimuth': '0d0.0'}]},
+             'correctedDistance is invalid'),
+            ({'assumedLat': '10d0.0', 'assumedLong': '10d0.0',
+              'sightings': [{'correctedDistance': '1', 'correctedAzimuth': '360d0.0'}]},
+             'correctedAzimuth is invalid'),
+        ]
+        for test_input, error in cases:
+            actual = locate.locate(test_input)
+            self.assertEqual(actual['error'], error)
@@ -688,6 +688,7 @@ class operationsTest(unittest.TestCase):
             'op': 'locate'
         }
         expected = copy.deepcopy(input)
+        expected['error'] = 'missing mandatory field assumedLat'
         actual = dispatch.dispatch(input)
         self.assertEqual(actual, expected)
 
@@ -715,3 +716,144 @@ class operationsTest(unittest.TestCase):
         input = {'op': 'not a real op'}
         expected = {'op': 'not a real op', 'error': 'op is not a legal operation'}
         self.assertEqual(dispatch.dispatch(input), expected)
+
+    # 600 dispatch_batch
+    #   Desired level of confidence:    boundary value analysis
+    #   Input-output Analysis:
+    #       inputs:     valuesList: iterable of requests, unvalidated.
+    #       outputs:    list of results, in input order, matching dispatch for each request.
+    #   Happy Path
+    #       mixed ops, including an op without a batched implementation
+    #       empty input
+    #   Sad Path
+    #       missing input
+    #       invalid requests mixed with valid requests
+    #
+    # Happy Path
+    def test600_010_ShouldMatchDispatchForMixedOps(self):
+        requests = [
+            {'op': 'adjust', 'observation': '42d0.0'},
+            {'op': 'predict', 'body': 'Betelgeuse', 'date': '2016-01-17', 'time': '03:15:42'},
+            {'op': 'locate'},
+            {'op': 'correct', 'lat': '16d32.3', 'long': '95d41.6', 'altitude': '13d42.3',
+             'assumedLat': '-53d38.4', 'assumedLong': '74d35.3'},
+            {'op': 'adjust', 'observation': '30d1.5', 'height': '19.0', 'pressure': '1000',
+             'horizon': 'artificial', 'temperature': '85'},
+        ]
+        expected = [dispatch.dispatch(request) for request in copy.deepcopy(requests)]
+        actual = dispatch.dispatch_batch(iter(requests))
+        self.assertEqual(actual, expected)
+
+    def test600_020_ShouldHandleEmptyInput(self):
+        self.assertEqual(dispatch.dispatch_batch([]), [])
+
+    # Sad Path
+    def test600_910_ShouldHandleNoInput(self):
+        self.assertEqual(dispatch.dispatch_batch(), [])
+
+    def test600_920_ShouldKeepErrorsInOrder(self):
+        requests = [
+            {'op': 'adjust', 'observation': '0d0.0'},
+            None,
+            {'op': 'adjust', 'observation': '42d0.0'},
+            1,
+            {},
+            {'op': 'not a real op'},
+            {'op': 'predict', 'body': 'unknown'},
+            {'op': 'correct', 'lat': '90d0.0'},
+            {'op': 'adjust', 'observation': '45d11.2', 'altitude': '5d11.2'},
+        ]
+        expected = [dispatch.dispatch(request) for request in copy.deepcopy(requests)]
+        actual = dispatch.dispatch_batch(requests)
+        self.assertEqual(actual, expected)
+        self.assertEqual(actual[0]['error'], 'observation is invalid')
+        self.assertEqual(actual[2]['altitude'], '41d59.0')
+
+    # 700 calculateAltitudes
+    #   Desired level of confidence:    boundary value analysis
+    #   Input-output Analysis:
+    #       inputs:     columns of validated observations, heights, temperatures, pressures and horizons.
+    #       outputs:    list of altitudes, identical to calculateAltitude on each row.
+    #   Happy Path
+    #       natural and artificial horizons, default and boundary values
+    #       empty columns
+    #
+    # Happy Path
+    def test700_010_ShouldMatchScalarCalculation(self):
+        rows = [
+            (30.025, 19.0, 85, 1000, False),
+            (45.25333, 6.0, 71, 1010, True),
+            (42.0, 0.0, 72, 1010, True),
+            (0.1 / 60, 999999.9, -20, 100, True),
+            (89.99833, 0.0, 120, 1100, False),
+        ]
+        expected = [adjust.calculateAltitude(*row) for row in rows]
+        actual = adjust.calculateAltitudes(*zip(*rows))
+        self.assertEqual(actual, expected)
+        self.assertEqual(softwareprocess.operations.util.degreesToDegreeStrings(actual),
+                         [softwareprocess.operations.util.degreesToDegreeString(altitude) for altitude in expected])
+
+    def test700_020_ShouldHandleEmptyColumns(self):
+        self.assertEqual(adjust.calculateAltitudes([], [], [], [], []), [])
+        self.assertEqual(softwareprocess.operations.util.degreesToDegreeStrings([]), [])
+
+    # 530 parseDegreeString
+    #   Desired level of confidence:    boundary value analysis
+    #   Input-output Analysis:
+    #       inputs:     degreeString: unvalidated string of the form '<x>d<y>'.
+    #       outputs:    (value, None) on success, (None, message) on failure, never raising.
+    #   Happy Path
+    #       canonical string, repeated lookups are memoized
+    #       non-canonical string handled like degreeStringToDegrees
+    #   Sad Path
+    #       messages match degreeStringToDegrees
+    #       non-string input
+    #       str and unicode strings that parse differently are memoized apart
+    # Happy Path
+    def test530_010ShouldParseAndMemoize(self):
+        util = softwareprocess.operations.util
+        util.degreeStringCache.clear()
+        self.assertEqual(util.parseDegreeString('45d30.0'), (45.5, None))
+        self.assertEqual(len(util.degreeStringCache), 1)
+        self.assertEqual(util.parseDegreeString('45d30.0'), (45.5, None))
+        self.assertEqual(len(util.degreeStringCache), 1)
+
+    def test530_020ShouldParseNonCanonicalString(self):
+        util = softwareprocess.operations.util
+        self.assertEqual(util.parseDegreeString(' 5d+30', False), (util.parseUncommonDegreeString(' 5d+30', False), None))
+
+    # Sad Path
+    def test530_910ShouldMatchErrorMessages(self):
+        util = softwareprocess.operations.util
+        for degreeString in ['85', '45dd30.0', '-15d30.0', '45d-15.0', '45d60.0', '0d0.0', '90d0.0', '45.0d0.0']:
+            with self.assertRaises(ValueError) as context:
+                util.parseUncommonDegreeString(degreeString)
+            self.assertEqual(util.parseDegreeString(degreeString), (None, context.exception.args[0]))
+
+    def test530_920ShouldHandleNonString(self):
+        self.assertEqual(softwareprocess.operations.util.parseDegreeString(45), (None, "Not a degree string"))
+
+    def test530_930ShouldMemoizeStrAndUnicodeApart(self):
+        util = softwareprocess.operations.util
+        for first, second in [('4\x1cd30.0', u'4\x1cd30.0'), (u'4\x1cd30.0', '4\x1cd30.0')]:
+            util.degreeStringCache.clear()
+            self.assertEqual(util.parseDegreeString(first, False)[0] is None, isinstance(first, str))
+            self.assertEqual(util.parseDegreeString(second, False)[0] is None, isinstance(second, str))
+
+    # 540 degreeStringsToDegrees
+    #   Desired level of confidence:    boundary value analysis
+    #   Input-output Analysis:
+    #       inputs:     degreeStrings: sequence of unvalidated degree strings.
+    #       outputs:    array of values, NaN at invalid positions, and a list of those positions.
+    # Happy Path
+    def test540_010ShouldParseInBulk(self):
+        values, errorIndices = softwareprocess.operations.util.degreeStringsToDegrees(
+            ['45d30.0', '85', '-15d30.0', 7], False)
+        self.assertEqual(list(values[:1]) + list(values[2:3]), [45.5, -15.5])
+        self.assertTrue(values[1] != values[1])
+        self.assertEqual(errorIndices, [1, 3])
+
+    def test540_020ShouldValidateInBulk(self):
+        values, errorIndices = softwareprocess.operations.util.degreeStringsToDegrees(['45d30.0', '-15d30.0'])
+        self.assertEqual(errorIndices, [1])
+        self.assertEqual(values[0], 45.5)
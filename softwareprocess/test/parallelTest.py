@@ -0,0 +1,97 @@
+import unittest
+import copy
+import os
+
+import softwareprocess.dispatch as dispatch
+import softwareprocess.parallel as parallel
+import softwareprocess.stream as stream
+
+
+class parallelTest(unittest.TestCase):
+
+    def setUp(self):
+        self.requests = []
+        for index in range(50):
+            self.requests.append({'op': 'adjust', 'observation': '%dd%d.0' % (index % 89 + 1, index % 60)})
+            self.requests.append({'op': 'predict', 'body': 'Betelgeuse', 'time': '00:00:%02d' % (index % 60)})
+            self.requests.append({'op': 'adjust', 'observation': '0d0.0'})
+            self.requests.append(None)
+        self.expected = [dispatch.dispatch(request) for request in copy.deepcopy(self.requests)]
+
+    # 100 configuredWorkers
+    #   Happy Path
+    #       environment variable, including 0 for one worker per CPU
+    #   Sad Path
+    #       unset, invalid or negative environment variable
+    def test100_010_ShouldReadEnvironment(self):
+        original = os.environ.get('SOFTWAREPROCESS_WORKERS')
+        try:
+            os.environ['SOFTWAREPROCESS_WORKERS'] = '3'
+            self.assertEqual(parallel.configuredWorkers(), 3)
+            os.environ['SOFTWAREPROCESS_WORKERS'] = '0'
+            self.assertGreaterEqual(parallel.configuredWorkers(), 1)
+            os.environ['SOFTWAREPROCESS_WORKERS'] = 'many'
+            self.assertEqual(parallel.configuredWorkers(), parallel.defaultWorkers)
+            os.environ['SOFTWAREPROCESS_WORKERS'] = '-2'
+            self.assertEqual(parallel.configuredWorkers(), parallel.defaultWorkers)
+            del os.environ['SOFTWAREPROCESS_WORKERS']
+            self.assertEqual(parallel.configuredWorkers(), parallel.defaultWorkers)
+        finally:
+            if original is None:
+                os.environ.pop('SOFTWAREPROCESS_WORKERS', None)
+            else:
+                os.environ['SOFTWAREPROCESS_WORKERS'] = original
+
+    # 200 DispatchPool
+    #   Happy Path
+    #       parallel results match dispatch, in order
+    #       small inputs fall back to in-process execution
+    #       requests are updated in place, in parallel or not
+    #       mapChunks starts the pool only once the chunks hold minimumParallelSize requests
+    #   Sad Path
+    #       invalid workers or chunk size
+    def test200_010_ShouldMatchDispatchInParallel(self):
+        with parallel.DispatchPool(workers=2, chunkSize=7, minimumParallelSize=1) as pool:
+            self.assertEqual(pool.dispatch_batch(self.requests), self.expected)
+            self.assertIsNotNone(pool.pool)
+
+    def test200_020_ShouldFallBackForSmallInputs(self):
+        with parallel.DispatchPool(workers=2) as pool:
+            self.assertEqual(pool.dispatch_batch(self.requests), self.expected)
+            self.assertIsNone(pool.pool)
+
+    def test200_030_ShouldDispatchParallel(self):
+        self.assertEqual(parallel.dispatch_parallel(self.requests, workers=1), self.expected)
+        self.assertEqual(parallel.dispatch_parallel(), [])
+
+    def test200_040_ShouldUpdateRequestsInPlace(self):
+        for minimumParallelSize in [1, len(self.requests) + 1]:
+            requests = copy.deepcopy(self.requests)
+            with parallel.DispatchPool(workers=2, chunkSize=7, minimumParallelSize=minimumParallelSize) as pool:
+                results = pool.dispatch_batch(requests)
+            self.assertEqual(requests[0], self.expected[0])
+            for request, result in zip(requests, results):
+                if request is not None:
+                    self.assertIs(result, request)
+
+    def test200_050_ShouldMapSmallChunksInProcess(self):
+        chunks = [self.requests[start:start + 7] for start in range(0, len(self.requests), 7)]
+        expected = [dispatch.dispatch_batch(copy.deepcopy(requests)) for requests in chunks]
+        for minimumParallelSize, started in [(len(self.requests) + 1, False), (len(self.requests), True), (1, True)]:
+            with parallel.DispatchPool(workers=2, chunkSize=7, minimumParallelSize=minimumParallelSize) as pool:
+                self.assertEqual(list(pool.mapChunks(iter(copy.deepcopy(chunks)))), expected)
+                self.assertEqual(pool.pool is not None, started)
+
+    def test200_910_ShouldRejectInvalidConfiguration(self):
+        with self.assertRaises(ValueError):
+            parallel.DispatchPool(workers=0)
+        with self.assertRaises(ValueError):
+            parallel.DispatchPool(workers=2, chunkSize=0)
+
+    # 300 stream with workers
+    #   Happy Path
+    #       results match in-process streaming, in order
+    def test300_010_ShouldStreamInParallel(self):
+        lines = ['op=adjust, observation=%dd0.0' % degrees for degrees in range(1, 40)]
+        expected = list(stream.processLines(lines, chunkSize=4))
+        self.assertEqual(list(stream.processLines(lines, chunkSize=4, workers=2)), expected)
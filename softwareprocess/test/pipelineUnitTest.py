@@ -0,0 +1,73 @@
+import unittest
+import copy
+
+import softwareprocess.dispatch as dispatch
+import softwareprocess.operations.adjust as adjust
+import softwareprocess.operations.correct as correct
+import softwareprocess.operations.pipeline as pipeline
+import softwareprocess.operations.predict as predict
+import softwareprocess.operations.util as util
+
+
+class pipelineUnitTest(unittest.TestCase):
+
+    def threeOperations(self, sighting):
+        adjusted = adjust.adjust({key: sighting[key] for key in ('observation', 'height', 'temperature', 'pressure',
+                                                                 'horizon') if key in sighting})
+        predicted = predict.predict({key: sighting[key] for key in ('body', 'date', 'time') if key in sighting})
+        return adjusted, predicted, correct.correct({
+            'lat': predicted['lat'], 'long': predicted['long'], 'altitude': adjusted['altitude'],
+            'assumedLat': sighting['assumedLat'], 'assumedLong': sighting['assumedLong']})
+
+    # 100 pipeline
+    #
+    # HappyPath
+    #   matches adjust, predict and correct run separately, up to rounding of the intermediate strings.
+    #   dispatched, singly and in batches.
+    # SadPath
+    #   errors from each of the three operations, in order.
+    def test_100_010_shouldMatchSeparateOperations(self):
+        sightings = [
+            {'observation': '30d1.5', 'height': '19.0', 'pressure': '1000', 'horizon': 'artificial',
+             'temperature': '85', 'body': 'Betelgeuse', 'date': '2016-01-17', 'time': '03:15:42',
+             'assumedLat': '-53d38.4', 'assumedLong': '74d35.3'},
+            {'observation': '45d15.2', 'height': '6', 'body': 'Sirius', 'date': '2017-04-14',
+             'assumedLat': '10d0.0', 'assumedLong': '200d0.0'},
+        ]
+        for sighting in sightings:
+            adjusted, predicted, corrected = self.threeOperations(sighting)
+            actual = pipeline.pipeline(copy.deepcopy(sighting))
+            self.assertEqual(actual['altitude'], adjusted['altitude'])
+            self.assertEqual(actual['lat'], predicted['lat'])
+            self.assertEqual(actual['long'], predicted['long'])
+            self.assertAlmostEqual(int(actual['correctedDistance']), int(corrected['correctedDistance']), delta=1)
+            self.assertAlmostEqual(util.degreeStringToDegrees(actual['correctedAzimuth'], False),
+                                   util.degreeStringToDegrees(corrected['correctedAzimuth'], False), delta=0.01)
+
+    def test_100_020_shouldDispatch(self):
+        sighting = {'op': 'pipeline', 'observation': '42d0.0', 'body': 'Vega', 'assumedLat': '30d0.0',
+                    'assumedLong': '10d0.0'}
+        expected = pipeline.pipeline(copy.deepcopy(sighting))
+        self.assertIn('correctedAzimuth', expected)
+        self.assertEqual(dispatch.dispatch(copy.deepcopy(sighting)), expected)
+        self.assertEqual(dispatch.dispatch_batch([copy.deepcopy(sighting), {'op': 'pipeline'}]),
+                         [expected, {'op': 'pipeline', 'error': 'mandatory information is missing'}])
+
+    # Sad Path
+    def test_100_910_shouldReportErrorsInOrder(self):
+        valid = {'observation': '42d0.0', 'body': 'Vega', 'assumedLat': '30d0.0', 'assumedLong': '10d0.0'}
+        cases = [
+            ({'altitude': '1d0.0'}, 'altitude cannot be given in input'),
+            ({'height': '-1'}, 'height is invalid'),
+            ({'body': 'unknown'}, 'star not in catalog'),
+            ({'lat': '1d0.0'}, 'lat key cannot be passed'),
+            ({'assumedLat': '90d0.0'}, 'assumedLat is invalid'),
+            ({'assumedLong': 5}, 'assumedLong is invalid'),
+            ({'observation': '0d0.1'}, 'altitude is invalid'),
+        ]
+        for changes, error in cases:
+            sighting = dict(valid)
+            sighting.update(changes)
+            expected = dict(sighting)
+            expected['error'] = error
+            self.assertEqual(pipeline.pipeline(sighting), expected)
@@ -1,4 +1,5 @@
 import unittest
+import calendar
 import datetime
 
 import softwareprocess.operations.predict as predict
@@ -239,3 +240,27 @@ class predictUnitTest(unittest.TestCase):
         expected = '75d53.6'
         actual = predict.calcStarGHA(input_sha, input_date, input_time)
         self.assertEqual(actual, expected)
+
+    # 080 calcAriesGHAFromSeconds
+    #   Start of 2001 -> 100d42.6
+    #   03:15:42 on 2016-01-17 -> matches calcAriesGHA
+    def test_080_010_ShouldCalcAriesGHAFromSecondsStart(self):
+        expected = util.degreeStringToDegrees('100d42.6', False)
+        actual = predict.calcAriesGHAFromSeconds(2001, 0)
+        self.assertAlmostEqual(actual, expected, 2)
+
+    def test_080_020_ShouldCalcAriesGHAFromSecondsNominal(self):
+        expected = predict.calcAriesGHA(datetime.date(2016, 1, 17), datetime.time(3, 15, 42))
+        actual = predict.calcAriesGHAFromSeconds(2016, 16 * 86400 + 3 * 3600 + 15 * 60 + 42)
+        self.assertEqual(actual, expected)
+
+    # 090 calcAriesGHAMany
+    #   epoch seconds across a year boundary match calcAriesGHA for the same instants.
+    def test_090_010_ShouldCalcAriesGHAManyAcrossYears(self):
+        start = datetime.datetime(2016, 12, 31, 23, 59, 30)
+        instants = [start + datetime.timedelta(seconds=10 * step) for step in range(6)]
+        epochs = [calendar.timegm(instant.timetuple()) for instant in instants]
+        expected = [predict.calcAriesGHA(instant.date(), instant.time()) for instant in instants]
+        actual = predict.calcAriesGHAMany(epochs)
+        for actualGHA, expectedGHA in zip(actual, expected):
+            self.assertAlmostEqual(actualGHA, expectedGHA, 9)
@@ -0,0 +1,101 @@
+import unittest
+
+import softwareprocess.querystring as querystring
+from softwareprocess.convertString2Dictionary import isValidKey, isValidValue
+
+
+class querystringTest(unittest.TestCase):
+
+    def setUp(self):
+        querystring.templateCache.clear()
+        querystring.encodedTemplateCache.clear()
+
+    # 100 splitPairs
+    #   Happy Path
+    #       space separated pairs.
+    #       keys run up to the last '=' of a token.
+    #       quoted values may hold whitespace, and may end inside a token.
+    #       strict pairs are comma separated and stripped.
+    #       strict unicode pairs are stripped of unicode whitespace, as unicode.strip would.
+    #   Sad Path
+    #       tokens without a key or value are skipped.
+    #       strict fields without exactly one '='.
+    def test100_010_ShouldSplitSpacedPairs(self):
+        self.assertEqual(querystring.splitPairs('op=adjust  observation=42d0.0'),
+                         [('op', 'adjust'), ('observation', '42d0.0')])
+
+    def test100_020_ShouldSplitOnLastEquals(self):
+        self.assertEqual(querystring.splitPairs('a=b=c'), [('a=b', 'c')])
+
+    def test100_030_ShouldSplitQuotedValues(self):
+        self.assertEqual(querystring.splitPairs('a="x y"z=1\tb=2'), [('a', '"x y"'), ('z', '1'), ('b', '2')])
+
+    def test100_050_ShouldSplitStrictPairs(self):
+        self.assertEqual(querystring.splitPairs(' a = 1 ,b=2', True), [('a', '1'), ('b', '2')])
+
+    def test100_060_ShouldStripUnicodeWhitespace(self):
+        self.assertEqual(querystring.splitPairs(u'a=b\xa0', True), [(u'a', u'b')])
+        self.assertEqual(querystring.splitPairs(u'a=b,\u3000c=d', True), [(u'a', u'b'), (u'c', u'd')])
+        self.assertEqual(querystring.splitPairs(u'a=b\x85', True), [(u'a', u'b')])
+        self.assertEqual(querystring.splitPairs('a=b\xa0', True), [('a', 'b\xa0')])
+
+    # Sad Path
+    def test100_910_ShouldSkipIncompletePairs(self):
+        self.assertEqual(querystring.splitPairs('a= =b c=d'), [('c', 'd')])
+
+    def test100_920_ShouldRejectMalformedStrictPairs(self):
+        self.assertIsNone(querystring.splitPairs('a=1,b', True))
+        self.assertIsNone(querystring.splitPairs('a=1=2', True))
+        self.assertIsNone(querystring.splitPairs('a=1,', True))
+
+    # 200 parseQuerystring
+    #   Happy Path
+    #       braces and commas are ignored.
+    #       cached querystrings produce equal, independent dictionaries.
+    #       equal str and unicode querystrings are cached apart.
+    def test200_010_ShouldParseQuerystring(self):
+        self.assertEqual(querystring.parseQuerystring('{op=adjust, observation=42d0.0}'),
+                         {'op': 'adjust', 'observation': '42d0.0'})
+
+    def test200_020_ShouldCacheQuerystring(self):
+        first = querystring.parseQuerystring('{op=predict, body=Sirius}')
+        first['error'] = 'changed'
+        self.assertEqual(len(querystring.templateCache), 1)
+        self.assertEqual(querystring.parseQuerystring('{op=predict, body=Sirius}'), {'op': 'predict', 'body': 'Sirius'})
+        self.assertEqual(querystring.parseQuerystring('{op=predict, body=Sirius}', False),
+                         {'op': 'predict', 'body': 'Sirius'})
+
+    def test200_030_ShouldCacheStrAndUnicodeApart(self):
+        self.assertIsInstance(querystring.parseQuerystring('{op=adjust}')['op'], str)
+        self.assertIsInstance(querystring.parseQuerystring(u'{op=adjust}')['op'], unicode)
+
+    # 300 parseEncodedPairs
+    #   Happy Path
+    #       percent-encoded pairs, cached.
+    #       results are cached separately for each pair of validators.
+    #       results are cached separately for equal str and unicode strings.
+    #   Sad Path
+    #       duplicate keys, cached.
+    #       invalid values.
+    def test300_010_ShouldParseEncodedPairs(self):
+        for useCache in [True, True, False]:
+            self.assertEqual(querystring.parseEncodedPairs('a%3D1%2C%20b%20%3D2', isValidKey, isValidValue, useCache),
+                             {'a': '1', 'b': '2'})
+
+    def test300_020_ShouldCachePerValidator(self):
+        acceptAll = lambda text: True
+        self.assertIsNone(querystring.parseEncodedPairs('a%3D1_2', isValidKey, isValidValue))
+        self.assertEqual(querystring.parseEncodedPairs('a%3D1_2', acceptAll, acceptAll), {'a': '1_2'})
+        self.assertIsNone(querystring.parseEncodedPairs('a%3D1_2', isValidKey, isValidValue))
+
+    def test300_030_ShouldCacheStrAndUnicodeApart(self):
+        self.assertEqual(querystring.parseEncodedPairs(u'a=%E9', isValidKey, isValidValue), {u'a': u'\xe9'})
+        self.assertIsNone(querystring.parseEncodedPairs('a=%E9', isValidKey, isValidValue))
+
+    # Sad Path
+    def test300_910_ShouldRejectDuplicateKeys(self):
+        for useCache in [True, True, False]:
+            self.assertIsNone(querystring.parseEncodedPairs('a%3D1%2Ca%3D2', isValidKey, isValidValue, useCache))
+
+    def test300_920_ShouldRejectInvalidValues(self):
+        self.assertIsNone(querystring.parseEncodedPairs('a%3D1_2', isValidKey, isValidValue))
@@ -0,0 +1,88 @@
+import unittest
+
+import softwareprocess.dispatch as dispatch
+import softwareprocess.resultCache as resultCache
+
+
+class resultCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 1000.0
+        self.cache = resultCache.ResultCache(maxSize=2, timeToLive=10, clock=lambda: self.now)
+
+    # 100 dispatch
+    #   Happy Path
+    #       a repeated request is answered from the cache, matching dispatch.
+    #       fields the op does not read are kept, and do not split entries.
+    #       cached entries cannot be changed through a response.
+    #       the least recently used entry is evicted.
+    #       entries expire after their time to live.
+    #       requests that cannot be cached are dispatched.
+    #   Sad Path
+    #       errors are cached.
+    #       invalid maxSize and timeToLive.
+    def test100_010_ShouldAnswerRepeatedRequest(self):
+        request = {'op': 'predict', 'body': 'Sirius', 'date': '2016-01-17', 'time': '03:15:42'}
+        expected = dispatch.dispatch(dict(request))
+        self.assertEqual(self.cache.dispatch(dict(request)), expected)
+        self.assertEqual(self.cache.dispatch(dict(request)), expected)
+        self.assertEqual(self.cache.stats()['hits'], 1)
+        self.assertEqual(self.cache.stats()['misses'], 1)
+
+    def test100_020_ShouldIgnoreOtherFields(self):
+        self.cache.dispatch({'op': 'adjust', 'observation': '42d0.0', 'id': '1'})
+        actual = self.cache.dispatch({'op': 'adjust', 'observation': '42d0.0', 'id': '2'})
+        self.assertEqual(actual, {'op': 'adjust', 'observation': '42d0.0', 'id': '2', 'altitude': '41d59.0'})
+        self.assertEqual(len(self.cache), 1)
+
+    def test100_030_ShouldProtectCachedEntries(self):
+        first = self.cache.dispatch({'op': 'adjust', 'observation': '42d0.0'})
+        first['altitude'] = 'corrupted'
+        second = self.cache.dispatch({'op': 'adjust', 'observation': '42d0.0'})
+        second['altitude'] = 'corrupted'
+        self.assertEqual(self.cache.dispatch({'op': 'adjust', 'observation': '42d0.0'})['altitude'], '41d59.0')
+
+    def test100_040_ShouldEvictLeastRecentlyUsed(self):
+        for observation in ['10d0.0', '20d0.0', '10d0.0', '30d0.0']:
+            self.cache.dispatch({'op': 'adjust', 'observation': observation})
+        self.cache.dispatch({'op': 'adjust', 'observation': '10d0.0'})
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['evictions'], stats['size']), (2, 1, 2))
+
+    def test100_050_ShouldExpireEntries(self):
+        self.cache.dispatch({'op': 'adjust', 'observation': '42d0.0'})
+        self.now += 10
+        self.assertEqual(self.cache.dispatch({'op': 'adjust', 'observation': '42d0.0'})['altitude'], '41d59.0')
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['expirations']), (0, 2, 1))
+
+    def test100_060_ShouldDispatchUncacheableRequests(self):
+        self.assertEqual(self.cache.dispatch(None), {'error': 'parameter is missing'})
+        self.assertEqual(self.cache.dispatch({'op': 'locate', 'sightings': []})['error'], 'missing mandatory field assumedLat')
+        self.assertEqual(self.cache.dispatch({'op': 'adjust', 'observation': ['42d0.0']})['error'],
+                         'observation is invalid')
+        self.assertEqual(self.cache.stats()['uncacheable'], 3)
+        self.assertEqual(len(self.cache), 0)
+
+    # Sad Path
+    def test100_910_ShouldCacheErrors(self):
+        self.cache.dispatch({'op': 'correct', 'lat': '1d0.0'})
+        self.assertEqual(self.cache.dispatch({'op': 'correct', 'lat': '1d0.0'}),
+                         {'op': 'correct', 'lat': '1d0.0', 'error': 'missing mandatory field long'})
+        self.assertEqual(self.cache.stats()['hits'], 1)
+
+    def test100_920_ShouldRejectInvalidSettings(self):
+        self.assertRaises(ValueError, resultCache.ResultCache, 0)
+        self.assertRaises(ValueError, resultCache.ResultCache, 10, -1)
+
+    # 200 dispatch_batch
+    #   Happy Path
+    #       matches dispatch_batch, answering repeated requests from the cache.
+    def test200_010_ShouldMatchDispatchBatch(self):
+        requests = [{'op': 'adjust', 'observation': '42d0.0'}, {'op': 'unknown'},
+                    {'op': 'predict', 'body': 'Vega'}, {'op': 'adjust', 'observation': '42d0.0'}]
+        expected = dispatch.dispatch_batch([dict(request) for request in requests])
+        self.assertEqual(self.cache.dispatch_batch([dict(request) for request in requests]), expected)
+        self.assertEqual(self.cache.dispatch_batch([dict(request) for request in requests]), expected)
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['uncacheable']), (3, 3, 2))
@@ -0,0 +1,97 @@
+import unittest
+import datetime
+
+import softwareprocess.operations.adjust as adjust
+import softwareprocess.operations.correct as correct
+import softwareprocess.operations.predict as predict
+import softwareprocess.operations.schema as schema
+
+
+class schemaUnitTest(unittest.TestCase):
+
+    # 010 compileSchema
+    #
+    # HappyPath
+    #   parsed tuple in field order, defaults applied, absent fields add nothing.
+    # SadPath
+    #   first error wins.
+    #   sighting is never modified.
+    def test_010_010_shouldParseInFieldOrder(self):
+        validate = schema.compileSchema(
+            schema.absent('altitude', 'altitude given'),
+            schema.field('pressure', schema.integerValue('pressure is invalid', 100, 1100), missingError='missing'),
+            schema.field('height', schema.floatValue('height is invalid', 0), default=0.0),
+        )
+        self.assertEqual(validate({'pressure': ' 1000 '}), ((1000, 0.0), None))
+
+    def test_010_910_shouldReportFirstError(self):
+        validate = schema.compileSchema(
+            schema.field('pressure', schema.integerValue('pressure is invalid', 100, 1100), missingError='missing'),
+            schema.field('height', schema.floatValue('height is invalid', 0), default=0.0),
+        )
+        sighting = {'height': 'abc'}
+        self.assertEqual(validate(sighting), (None, 'missing'))
+        self.assertEqual(sighting, {'height': 'abc'})
+        self.assertEqual(validate({'pressure': '100', 'height': 'abc'}), (None, 'height is invalid'))
+
+    # 020 parseInteger / parseFloat
+    #
+    # HappyPath
+    #   everything int() and float() accept.
+    # SadPath
+    #   everything int() and float() reject, without raising.
+    def test_020_010_shouldMatchBuiltinConversions(self):
+        for value in ['0', '-1', ' +7 ', '12.5', '1e2', '.5', '5.', 'nan', '-Infinity', 'abc', '', '0x1', '1 2']:
+            try:
+                expected = int(value)
+            except ValueError:
+                expected = None
+            self.assertEqual(schema.parseInteger(value), expected)
+            try:
+                expected = float(value)
+            except ValueError:
+                expected = None
+            actual = schema.parseFloat(value)
+            if expected == expected:
+                self.assertEqual(actual, expected)
+            else:
+                self.assertNotEqual(actual, actual)
+
+    # 030 operation schemas
+    #
+    # HappyPath
+    #   adjust, predict and correct parse their fields.
+    # SadPath
+    #   error strings match the extract functions.
+    def test_030_010_shouldValidateAdjust(self):
+        parsed, error = adjust.validateSighting({'observation': '45d30.0', 'horizon': 'Artificial'})
+        self.assertIsNone(error)
+        self.assertEqual(parsed, (45.5, 0.0, 72, 1010, False))
+
+    def test_030_020_shouldValidatePredict(self):
+        parsed, error = predict.validateSighting({'body': 'Betelgeuse', 'date': '2016-01-17', 'time': '03:15:42'})
+        self.assertIsNone(error)
+        self.assertEqual(parsed, (predict.catalog.starId('betelgeuse'), datetime.date(2016, 1, 17),
+                                  datetime.time(3, 15, 42)))
+
+    def test_030_030_shouldValidateCorrect(self):
+        parsed, error = correct.validateSighting({'lat': '16d30.0', 'long': '95d0.0', 'altitude': '13d42.0',
+                                                  'assumedLat': '-53d30.0', 'assumedLong': '74d0.0'})
+        self.assertIsNone(error)
+        self.assertEqual(parsed, (16.5, 95.0, 13.7, -53.5, 74.0))
+
+    def test_030_910_shouldMatchExtractErrors(self):
+        cases = [
+            (adjust.validateSighting, {'observation': '45d30.0', 'altitude': '1d0.0'},
+             'altitude cannot be given in input'),
+            (adjust.validateSighting, {}, 'mandatory information is missing'),
+            (adjust.validateSighting, {'observation': '45d30.0', 'temperature': '20.0'}, 'temperature is invalid'),
+            (predict.validateSighting, {'body': 'unknown'}, 'star not in catalog'),
+            (predict.validateSighting, {'body': 'Vega', 'date': '2016-02-30'}, 'invalid date'),
+            (predict.validateSighting, {'body': 'Vega', 'time': '24:00:00'}, 'invalid time'),
+            (predict.validateSighting, {'body': 'Vega', 'long': '1d0.0'}, 'long key cannot be passed'),
+            (correct.validateSighting, {'lat': '16d30.0'}, 'missing mandatory field long'),
+            (correct.validateSighting, {'lat': '-90d0.0'}, 'lat is invalid'),
+        ]
+        for validate, sighting, expected in cases:
+            self.assertEqual(validate(sighting), (None, expected))
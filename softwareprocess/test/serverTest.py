@@ -0,0 +1,171 @@
+import unittest
+import httplib
+import json
+import threading
+
+import softwareprocess.coalescer as coalescer
+import softwareprocess.dispatch as dispatch
+import softwareprocess.operations.instrumentation as instrumentation
+import softwareprocess.resultCache as resultCache
+import softwareprocess.server as server
+
+
+class serverTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = None
+
+    def tearDown(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+
+    # 100 parseBody
+    #   Happy Path
+    #       querystring, with and without braces.
+    #       json object, and json array as a batch.
+    #       pretty-printed json, without a content type.
+    #   Sad Path
+    #       invalid json.
+    #       json that is neither an object nor an array.
+    def test100_010_ShouldParseQuerystring(self):
+        expected = ({'op': 'adjust', 'observation': '42d0.0'}, False, None)
+        self.assertEqual(server.parseBody('{op=adjust, observation=42d0.0}'), expected)
+        self.assertEqual(server.parseBody('op=adjust, observation=42d0.0\n', 'text/plain'), expected)
+
+    def test100_020_ShouldParseJson(self):
+        self.assertEqual(server.parseBody('{"op": "adjust"}'), ({'op': 'adjust'}, False, None))
+        self.assertEqual(server.parseBody('[{"op": "adjust"}, {}]', 'application/json; charset=utf-8'),
+                         ([{'op': 'adjust'}, {}], True, None))
+
+    def test100_030_ShouldParseSpacedJson(self):
+        self.assertEqual(server.parseBody('{ "op": "adjust"}'), ({'op': 'adjust'}, False, None))
+        self.assertEqual(server.parseBody('\n{\n  "op": "adjust"\n}\n'), ({'op': 'adjust'}, False, None))
+        self.assertEqual(server.parseBody(' [\n  {"op": "adjust"}\n]'), ([{'op': 'adjust'}], True, None))
+        self.assertEqual(server.parseBody('{ }'), ({}, False, None))
+
+    def test100_910_ShouldRejectInvalidJson(self):
+        self.assertEqual(server.parseBody('op=adjust', 'application/json'), (None, False, 'invalid json'))
+
+    def test100_920_ShouldRejectJsonScalars(self):
+        self.assertEqual(server.parseBody('42', 'application/json'),
+                         (None, False, 'body is not an object or array'))
+
+    # 200 handle
+    #   Happy Path
+    #       GET /dispatch reads the URL query.
+    #       POST /dispatch of a batch matches dispatch_batch.
+    #       /health and /metrics, including cache statistics.
+    #   Sad Path
+    #       invalid body, unknown path, wrong method.
+    #       exceptions in the engine.
+    #       a request raising in a batch is answered with an error alone.
+    def test200_010_ShouldDispatchQuery(self):
+        status, contentType, body = server.handle(dispatch, 'GET', '/dispatch?op=adjust&observation=42d0.0')
+        self.assertEqual((status, contentType), (200, 'application/json'))
+        self.assertEqual(json.loads(body), {'op': 'adjust', 'observation': '42d0.0', 'altitude': '41d59.0'})
+
+    def test200_020_ShouldDispatchBatch(self):
+        requests = [{'op': 'adjust', 'observation': '42d0.0'}, {'op': 'unknown'}, 'invalid']
+        status, contentType, body = server.handle(dispatch, 'POST', '/dispatch', json.dumps(requests))
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body), dispatch.dispatch_batch(requests))
+
+    def test200_030_ShouldReportHealthAndMetrics(self):
+        self.assertEqual(server.handle(dispatch, 'GET', '/health'), (200, 'application/json', '{"status": "ok"}'))
+        status, contentType, body = server.handle(dispatch, 'GET', '/metrics')
+        self.assertEqual((status, contentType), (200, 'text/plain; version=0.0.4'))
+        self.assertIn('# TYPE softwareprocess_stage_seconds histogram', body)
+        self.assertNotIn('softwareprocess_cache_', body)
+        cache = resultCache.ResultCache()
+        server.handle(cache, 'POST', '/dispatch', 'op=adjust, observation=42d0.0')
+        server.handle(cache, 'POST', '/dispatch', 'op=adjust, observation=42d0.0')
+        body = server.handle(cache, 'GET', '/metrics')[2]
+        self.assertIn('softwareprocess_cache_hits_total 1\n', body)
+        self.assertIn('softwareprocess_cache_size 1\n', body)
+        with coalescer.Coalescer(cache) as instance:
+            self.assertEqual(json.loads(server.handle(instance, 'GET', '/dispatch?op=adjust&observation=42d0.0')[2]),
+                             {'op': 'adjust', 'observation': '42d0.0', 'altitude': '41d59.0'})
+            body = server.handle(instance, 'GET', '/metrics')[2]
+        self.assertIn('softwareprocess_coalescer_requests_total 1\n', body)
+        self.assertIn('softwareprocess_cache_hits_total 2\n', body)
+
+    def test200_040_ShouldRecordParseStage(self):
+        instrumentation.reset()
+        instrumentation.enable()
+        try:
+            server.handle(dispatch, 'POST', '/dispatch', 'op=adjust, observation=42d0.0')
+        finally:
+            instrumentation.disable()
+        self.assertEqual(instrumentation.snapshot()['histograms']['http']['parse']['count'], 1)
+        instrumentation.reset()
+
+    def test200_910_ShouldRejectInvalidRequests(self):
+        self.assertEqual(server.handle(dispatch, 'POST', '/dispatch', '[', 'application/json')[:2],
+                         (400, 'application/json'))
+        self.assertEqual(server.handle(dispatch, 'GET', '/unknown')[0], 404)
+        self.assertEqual(server.handle(dispatch, 'POST', '/health', '')[0], 405)
+
+    def test200_920_ShouldHandleEngineErrors(self):
+        class BrokenEngine(object):
+            def dispatch(self, values):
+                raise RuntimeError()
+
+        self.assertEqual(server.handle(BrokenEngine(), 'GET', '/dispatch?op=adjust'),
+                         (500, 'application/json', '{"error": "internal error"}'))
+
+    def test200_930_ShouldIsolateBatchErrors(self):
+        class RaisingEngine(object):
+            def dispatch(self, values):
+                if 'raise' in values:
+                    raise ValueError('math domain error')
+                return dispatch.dispatch(values)
+
+            def dispatch_batch(self, valuesList):
+                return [self.dispatch(values) for values in valuesList]
+
+        poisoned = {'op': 'adjust', 'observation': '42d0.0', 'raise': '1'}
+        good = {'op': 'adjust', 'observation': '42d0.0'}
+        status, contentType, body = server.handle(RaisingEngine(), 'POST', '/dispatch',
+                                                  json.dumps([good, poisoned, good]))
+        self.assertEqual(status, 200)
+        expectedError = dict(poisoned)
+        expectedError['error'] = 'internal error'
+        expectedGood = dispatch.dispatch(dict(good))
+        self.assertEqual(json.loads(body), [expectedGood, expectedError, expectedGood])
+
+    # 300 DispatchServer
+    #   Happy Path
+    #       several requests are served over one kept-alive connection.
+    #   Sad Path
+    #       POST without a Content-Length.
+    def startServer(self):
+        self.server = server.DispatchServer(('127.0.0.1', 0))
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        return httplib.HTTPConnection(*self.server.server_address)
+
+    def test300_010_ShouldKeepConnectionsAlive(self):
+        connection = self.startServer()
+        connection.request('POST', '/dispatch', '{op=adjust, observation=42d0.0}')
+        response = connection.getresponse()
+        self.assertEqual(response.status, 200)
+        self.assertEqual(json.loads(response.read())['altitude'], '41d59.0')
+        connection.request('POST', '/dispatch', '[{"op": "adjust", "observation": "42d0.0"}]',
+                           {'Content-Type': 'application/json'})
+        response = connection.getresponse()
+        self.assertEqual(json.loads(response.read())[0]['altitude'], '41d59.0')
+        self.assertFalse(response.will_close)
+        connection.request('GET', '/health')
+        self.assertEqual(json.loads(connection.getresponse().read()), {'status': 'ok'})
+        connection.close()
+
+    def test300_910_ShouldRequireLength(self):
+        connection = self.startServer()
+        connection.putrequest('POST', '/dispatch')
+        connection.endheaders()
+        response = connection.getresponse()
+        self.assertEqual(response.status, 411)
+        self.assertTrue(response.will_close)
+        connection.close()
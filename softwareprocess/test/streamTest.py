@@ -0,0 +1,104 @@
+import unittest
+import json
+import os
+import shutil
+import tempfile
+
+import softwareprocess.stream as stream
+
+
+class streamTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    # 100 parseLine
+    #   Happy Path
+    #       json line
+    #       querystring line, with and without braces
+    #   Sad Path
+    #       invalid json in json format
+    def test100_010_ShouldParseJson(self):
+        self.assertEqual(stream.parseLine('{"op": "adjust", "observation": "42d0.0"}\n'),
+                         {'op': 'adjust', 'observation': '42d0.0'})
+
+    def test100_020_ShouldParseQuerystring(self):
+        expected = {'op': 'adjust', 'observation': '42d0.0'}
+        self.assertEqual(stream.parseLine('op=adjust, observation=42d0.0\n'), expected)
+        self.assertEqual(stream.parseLine('{op=adjust, observation=42d0.0}\n'), expected)
+
+    def test100_910_ShouldHandleInvalidJson(self):
+        self.assertEqual(stream.parseLine('op=adjust', 'json'), {'error': 'invalid json'})
+
+    # 200 chunk
+    #   Happy Path
+    #       last chunk is short
+    #       empty input
+    def test200_010_ShouldChunk(self):
+        self.assertEqual(list(stream.chunk(range(5), 2)), [[0, 1], [2, 3], [4]])
+        self.assertEqual(list(stream.chunk([], 2)), [])
+
+    # 300 processLines
+    #   Happy Path
+    #       results are in input order across chunks, blank lines skipped
+    #       input is consumed lazily
+    #   Sad Path
+    #       a line whose correction is undefined is answered with an error, and the stream goes on
+    #       a line raising in a custom engine is answered with an error, and the stream goes on
+    def test300_010_ShouldProcessInOrder(self):
+        lines = ['{"op": "adjust", "observation": "42d0.0"}', '', 'op=locate', '{"op": "adjust"}']
+        actual = list(stream.processLines(lines, chunkSize=2))
+        self.assertEqual(actual, [{'op': 'adjust', 'observation': '42d0.0', 'altitude': '41d59.0'},
+                                  {'op': 'locate', 'error': 'missing mandatory field assumedLat'},
+                                  {'op': 'adjust', 'error': 'mandatory information is missing'}])
+
+    def test300_020_ShouldReadLazily(self):
+        consumed = []
+
+        def lines():
+            for index in range(10):
+                consumed.append(index)
+                yield 'op=locate'
+
+        results = stream.processLines(lines(), chunkSize=3)
+        next(results)
+        self.assertEqual(consumed, [0, 1, 2])
+
+    def test300_910_ShouldContinuePastUndefinedCorrection(self):
+        poisoned = 'op=correct, lat=8d0.0, long=0d0.0, altitude=13d42.3, assumedLat=8d0.0, assumedLong=0d0.0'
+        lines = ['{"op": "adjust", "observation": "42d0.0"}', poisoned, '{"op": "adjust", "observation": "42d0.0"}']
+        for workers in [1, 2]:
+            actual = list(stream.processLines(lines, chunkSize=2, workers=workers))
+            self.assertEqual(len(actual), 3)
+            self.assertEqual(actual[1]['error'], 'correction is undefined')
+            self.assertEqual(actual[0]['altitude'], '41d59.0')
+            self.assertEqual(actual[2]['altitude'], '41d59.0')
+
+    def test300_920_ShouldContinuePastRaisingEngine(self):
+        def engine(requests):
+            if any('raise' in request for request in requests):
+                raise ValueError('math domain error')
+            return [dict(request, seen='1') for request in requests]
+
+        lines = ['op=adjust', 'op=adjust, raise=1', 'op=locate']
+        actual = list(stream.processLines(lines, chunkSize=3, engine=engine))
+        self.assertEqual(actual, [{'op': 'adjust', 'seen': '1'},
+                                  {'op': 'adjust', 'raise': '1', 'error': 'internal error'},
+                                  {'op': 'locate', 'seen': '1'}])
+
+    # 400 main
+    #   Happy Path
+    #       files in, JSONL out
+    def test400_010_ShouldWriteJsonLines(self):
+        inputPath = os.path.join(self.directory, 'input.jsonl')
+        outputPath = os.path.join(self.directory, 'output.jsonl')
+        with open(inputPath, 'w') as inputFile:
+            inputFile.write('{"op": "adjust", "observation": "42d0.0"}\nop=nothing\n')
+        self.assertEqual(stream.main([inputPath, '--output', outputPath, '--chunk-size', '1']), 0)
+        with open(outputPath) as outputFile:
+            actual = [json.loads(line) for line in outputFile]
+        self.assertEqual(actual, [{'op': 'adjust', 'observation': '42d0.0', 'altitude': '41d59.0'},
+                                  {'op': 'nothing', 'error': 'op is not a legal operation'}])